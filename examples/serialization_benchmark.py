@@ -0,0 +1,95 @@
+"""
+Benchmark: serializing a 1M-sample ephemeris result.
+
+Compares FastMCP's generic tool-result path (indented JSON text plus a
+pydantic-validated structured copy, both sent in the CallToolResult) with
+`stk_logic.serialization.encode_response` (one compact encoding, optionally
+gzip/zstd-compressed). No STK is needed.
+
+    PYTHONPATH=src python examples/serialization_benchmark.py [samples] [format]
+
+`format` is the `get_lla_ephemeris` output format: "columns" (default),
+"binary" or "records".
+"""
+
+import sys
+import time
+
+import numpy as np
+from mcp.server.fastmcp.utilities.func_metadata import func_metadata
+from mcp.types import CallToolResult, TextContent
+
+from stk_mcp.stk_logic.encoding import encode_columns
+from stk_mcp.stk_logic.serialization import decode_response, encode_response, encoder_name
+
+
+def ephemeris(samples: int, fmt: str) -> dict:
+    """A page shaped like `get_lla_ephemeris` output (LEO-like values)."""
+    t = np.arange(samples, dtype=np.float64) * 10.0
+    phase = t * 2.0 * np.pi / 5400.0
+    page = {
+        "satellite": "*/Satellite/Bench",
+        "step_sec": 10.0,
+        "start": "20 Jan 2020 17:00:00.000",
+        "stop": "2 Apr 2020 14:46:30.000",
+        "next_cursor": None,
+        "truncated": False,
+        "epoch": "20 Jan 2020 17:00:00.000",
+    }
+    page.update(encode_columns({
+        "time": t,
+        "lat_deg": 51.6 * np.sin(phase),
+        "lon_deg": (np.degrees(phase) * 0.93) % 360.0 - 180.0,
+        "alt_km": 420.0 + 5.0 * np.cos(phase),
+    }, fmt))
+    return page
+
+
+async def _tool(ctx: object) -> dict | str:  # signature of the existing bulk tools
+    return {}
+
+
+def generic_path(result: dict) -> str:
+    meta = func_metadata(_tool)
+    unstructured, structured = meta.convert_result(result)
+    return CallToolResult(content=list(unstructured), structuredContent=structured).model_dump_json(
+        by_alias=True, exclude_none=True,
+    )
+
+
+def fast_path(result: dict, compression: str) -> str:
+    text = encode_response(result, compression=compression, min_bytes=0)
+    return CallToolResult(content=[TextContent(type="text", text=text)]).model_dump_json(
+        by_alias=True, exclude_none=True,
+    )
+
+
+def timed(label: str, fn, *args) -> str:
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    print(f"{label:<34} {best:8.3f} s  {len(out) / 1e6:9.1f} MB on the wire")
+    return out
+
+
+def main() -> None:
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fmt = sys.argv[2] if len(sys.argv) > 2 else "columns"
+    result = ephemeris(samples, fmt)
+    print(f"{samples:,} samples, format={fmt}, encoder={encoder_name()}")
+
+    timed("FastMCP generic (text + structured)", generic_path, result)
+    for codec in ("none", "gzip", "zstd"):
+        try:
+            wire = timed(f"encode_response ({codec})", fast_path, result, codec)
+        except RuntimeError as e:
+            print(f"encode_response ({codec}): skipped ({e})")
+            continue
+        text = CallToolResult.model_validate_json(wire).content[0].text
+        assert decode_response(text)["length"] == samples
+
+
+if __name__ == "__main__":
+    main()
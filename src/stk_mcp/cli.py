@@ -1,30 +1,16 @@
 import os
-import sys
-import logging
-import uvicorn
 import typer
 from rich.console import Console
 from rich.table import Table
 
-# --- Check for STK installation early ---
-stk_installed = False
-try:
-    from agi.stk12.stkengine import STKEngine  # noqa: F401
-    from agi.stk12.stkdesktop import STKDesktop  # noqa: F401
-    stk_installed = True
-except ImportError:
-    print(
-        "Warning: Ansys/AGI STK Python API not found. Please install it to use this application.",
-        file=sys.stderr,
-    )
-    # Allow Typer to still show help, but commands will fail.
-
-# --- Local imports (safe regardless of STK availability) ---
-from stk_mcp.app import mcp_server
-from stk_mcp.stk_logic.core import create_stk_lifespan, StkMode  # type: ignore
+# --- Local imports (cheap; neither the STK API nor the MCP server is loaded) ---
+# `stk_available` only locates the STK API; it is imported when the engine
+# starts. The server and its tools are imported by the commands that need them.
+from stk_mcp.stk_logic.core import create_stk_lifespan, StkMode, stk_available  # type: ignore
 from stk_mcp.stk_logic.config import get_config
 from stk_mcp.stk_logic.logging_config import configure_logging
-import anyio
+
+stk_installed = stk_available
 
 
 # --- Typer Application Setup ---
@@ -50,18 +36,27 @@ def run(
         StkMode.ENGINE if os.name != "nt" else StkMode.DESKTOP,
         "--mode", "-m",
         case_sensitive=False,
-        help="STK execution mode. 'desktop' is only available on Windows.",
+        help="STK execution mode. 'desktop' is only available on Windows; 'simulated' needs no STK.",
         callback=_validate_desktop_mode,
     ),
     log_level: str = typer.Option(
         "info",
         help="Log level: critical, error, warning, info, debug",
     ),
+    workers: int = typer.Option(
+        None,
+        "--workers", "-w",
+        min=1,
+        help="Number of STK Engine worker processes (engine/simulated mode only). Defaults to STK_MCP_ENGINE_WORKERS.",
+    ),
 ):
     """
     Run the STK-MCP server.
+
+    The HTTP listener starts immediately; STK starts and warms up in the
+    background (see STK_MCP_ENGINE_BACKGROUND_START / STK_MCP_ENGINE_WARMUP).
     """
-    if not stk_installed:
+    if not stk_installed and mode != StkMode.SIMULATED:
         console.print("[bold red]Error:[/] Cannot run server. STK Python API is not installed.")
         raise typer.Exit(code=1)
         
@@ -73,13 +68,22 @@ def run(
     # Resolve host/port from config if not provided
     host = host or cfg.default_host
     port = int(port or cfg.default_port)
+    workers = workers or cfg.engine_workers
+    if workers > 1 and mode == StkMode.DESKTOP:
+        console.print("[bold red]Error:[/] --workers is not supported in desktop mode.")
+        raise typer.Exit(code=1)
 
     console.print(
         f"[green]Starting STK-MCP server in[/] [bold cyan]{mode.value}[/] [green]mode on {host}:{port}...[/]"
     )
+    if workers > 1:
+        console.print(f"[green]Using a pool of[/] [bold cyan]{workers}[/] [green]STK Engine workers.[/]")
+
+    import uvicorn
+    from stk_mcp.app import mcp_server
 
     # Dynamically create the lifespan based on the selected mode
-    stk_lifespan_manager = create_stk_lifespan(mode)
+    stk_lifespan_manager = create_stk_lifespan(mode, workers=workers)
 
     # Attach the lifespan to the server instance
     mcp_server.lifespan = stk_lifespan_manager
@@ -95,11 +99,15 @@ def run(
 def list_tools():
     """
     List all available MCP tools and their descriptions.
+
+    Tool metadata comes from the registered handlers; STK is not loaded.
     """
+    import anyio
+    from stk_mcp.app import mcp_server
+
     if not stk_installed:
-        console.print("[bold red]Error:[/] Cannot list tools. STK Python API is not installed.")
-        raise typer.Exit(code=1)
-        
+        console.print("[yellow]Note:[/] STK Python API not found; the server cannot run these tools here.")
+
     table = Table(title="[bold blue]STK-MCP Available Tools[/bold blue]")
     table.add_column("Tool Name", style="cyan", no_wrap=True)
     table.add_column("Description", style="magenta")
@@ -0,0 +1,135 @@
+"""
+Access intervals kept per object pair for incremental recomputation.
+
+For each (from, to) pair the engine keeps the spans of time it has already
+computed access over and the intervals found there (one store per engine,
+like the object registry). When the scenario interval is extended, or a
+narrower window is requested, only the uncovered parts are passed to
+`ComputeAccess`; intervals that meet at a boundary are joined back together.
+Only spans STK actually computed are stored, so every entry is exact whatever
+screening or elevation mask the request that computed it used.
+
+Times are stored as seconds from the store's own reference epoch, so they
+stay valid when the scenario start (and with it STK's "EpSec" epoch) moves.
+Pairs are dropped when either object changes, and everything is dropped
+when the scenario is closed, created or loaded.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import threading
+from collections import OrderedDict
+
+from .config import get_config
+
+Span = tuple[float, float]
+# Spans closer than this are treated as touching (seconds)
+_TOUCH_SEC = 1e-6
+
+
+def merge_spans(spans: list[Span]) -> list[Span]:
+    """Sort and join overlapping or touching spans."""
+    out: list[Span] = []
+    for a, b in sorted(spans):
+        if out and a - out[-1][1] <= _TOUCH_SEC:
+            out[-1] = (out[-1][0], max(b, out[-1][1]))
+        else:
+            out.append((a, b))
+    return out
+
+
+def subtract_spans(spans: list[Span], covered: list[Span]) -> list[Span]:
+    """Parts of `spans` not inside any of the (merged) `covered` spans."""
+    out: list[Span] = []
+    for a, b in spans:
+        for c, d in covered:
+            if d <= a or c >= b:
+                continue
+            if c - a > _TOUCH_SEC:
+                out.append((a, c))
+            a = max(a, d)
+            if a >= b:
+                break
+        if b - a > _TOUCH_SEC:
+            out.append((a, b))
+    return out
+
+
+def clip_spans(spans: list[Span], t0: float, t1: float) -> list[Span]:
+    """Restrict spans to [t0, t1], dropping those outside."""
+    return [(max(a, t0), min(b, t1)) for a, b in spans if b > t0 and a < t1]
+
+
+class AccessStore:
+    """Covered spans and access intervals per (from, to) pair, least recently used first."""
+
+    def __init__(self, max_pairs: int) -> None:
+        self.max_pairs = max_pairs
+        self._lock = threading.Lock()
+        self._pairs: OrderedDict[tuple[str, str], tuple[list[Span], list[Span]]] = OrderedDict()
+        self._epoch: dt.datetime | None = None
+
+    def clear(self) -> None:
+        """Forget everything (new, loaded or closed scenario)."""
+        with self._lock:
+            self._pairs.clear()
+            self._epoch = None
+
+    def discard(self, path: str) -> None:
+        """Forget the pairs involving `path` or objects below it (it changed)."""
+        prefix = path + "/"
+        with self._lock:
+            for key in [k for k in self._pairs if any(p == path or p.startswith(prefix) for p in k)]:
+                del self._pairs[key]
+
+    def offset(self, epoch: dt.datetime) -> float:
+        """Seconds to add to "EpSec" times of a scenario with `epoch` to get store times."""
+        with self._lock:
+            if self._epoch is None:
+                self._epoch = epoch
+            return (epoch - self._epoch).total_seconds()
+
+    def get(self, src: str, dst: str, offset: float) -> tuple[list[Span], list[Span]]:
+        """(covered, intervals) of a pair, in "EpSec" of the scenario with `offset`."""
+        with self._lock:
+            entry = self._pairs.get((src, dst))
+            if entry is None:
+                return [], []
+            self._pairs.move_to_end((src, dst))
+            covered, intervals = entry
+        return [(a - offset, b - offset) for a, b in covered], [(a - offset, b - offset) for a, b in intervals]
+
+    def update(self, src: str, dst: str, offset: float, covered: list[Span], intervals: list[Span]) -> None:
+        """Add newly computed `covered` spans and the `intervals` found in them ("EpSec").
+
+        `covered` must only hold spans passed to `ComputeAccess`, never ones
+        ruled out by screening.
+        """
+        if self.max_pairs <= 0 or not covered:
+            return
+        covered = [(a + offset, b + offset) for a, b in covered]
+        intervals = [(a + offset, b + offset) for a, b in intervals]
+        with self._lock:
+            old_covered, old_intervals = self._pairs.pop((src, dst), ([], []))
+            self._pairs[(src, dst)] = (merge_spans(old_covered + covered), merge_spans(old_intervals + intervals))
+            while len(self._pairs) > self.max_pairs:
+                self._pairs.popitem(last=False)
+
+    def snapshot(self) -> dict:
+        """{epoch, pairs}; a copy that `restore` takes back (e.g. for a parked scenario)."""
+        with self._lock:
+            return {"epoch": self._epoch, "pairs": list(self._pairs.items())}
+
+    def restore(self, snapshot: dict | None) -> None:
+        """Replace the contents with a `snapshot()`."""
+        snapshot = snapshot or {}
+        with self._lock:
+            self._epoch = snapshot.get("epoch")
+            self._pairs = OrderedDict(snapshot.get("pairs") or ())
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+
+ACCESSES = AccessStore(get_config().access_store_max_pairs)
@@ -1,15 +1,28 @@
 from __future__ import annotations
 
 import logging
+import math
+import time
+from collections.abc import Callable
 from typing import Any
 
+import numpy as np
+
+from .accesses import ACCESSES, Span, clip_spans, merge_spans, subtract_spans
+from .cancellation import CancelToken, OperationCancelled, OperationTimeout, current_token
+from .config import get_config
 from .core import IAgStkObjectRoot
-from .utils import timed_operation
+from .dataproviders import DP_HANDLES, split_provider_path
+from .encoding import encode_columns, validate_format
+from .objects import list_objects_internal
+from .screening import AccessCost, merge_windows, screen_access
+from .twobody import parse_utcg
+from .utils import date_unit, timed_operation
 
 logger = logging.getLogger(__name__)
 
 
-def _normalize_path(path: str) -> str:
+def normalize_path(path: str) -> str:
     p = (path or "").strip()
     if not p:
         raise ValueError("Object path must be non-empty.")
@@ -21,32 +34,162 @@ def _normalize_path(path: str) -> str:
     return f"*/{p}"
 
 
+def _chunked_access(
+    access: Any,
+    t0: float,
+    t1: float,
+    token: CancelToken,
+    chunk_sec: float,
+    allow_partial: bool = False,
+) -> tuple[list[tuple[float, float]], float, bool]:
+    """Compute `access` over [t0, t1] (EpSec) in sub-windows of `chunk_sec`.
+
+    The token is checked before each sub-window. Intervals that touch at a
+    sub-window boundary are merged. Must be called with the date unit set to
+    "EpSec". `chunk_sec` <= 0 computes [t0, t1] in one call.
+
+    Returns:
+        (intervals, computed_until, truncated): if the token stops the job and
+        `allow_partial` is set, the intervals found up to `computed_until` are
+        returned with `truncated` True; otherwise the token's error is raised.
+    """
+    chunk = chunk_sec if chunk_sec > 0 else max(t1 - t0, 1.0)
+    spans: list[tuple[float, float]] = []
+    a = t0
+    while True:
+        if token.stopped:
+            if not allow_partial:
+                token.check()
+            return spans, a, True
+        b = min(a + chunk, t1)
+        access.SpecifyAccessTimePeriod(a, b)
+        access.ComputeAccess()
+        intervals = access.AccessIntervals
+        for n in range(intervals.Count):
+            ivl = intervals.Item(n)
+            start, stop = float(ivl.StartTime), float(ivl.StopTime)
+            if spans and start - spans[-1][1] <= 1e-6:
+                spans[-1] = (spans[-1][0], max(stop, spans[-1][1]))
+            else:
+                spans.append((start, stop))
+        a = b
+        if a >= t1:
+            return spans, a, False
+
+
+def _epoch_offset(stk_root: IAgStkObjectRoot) -> float:
+    """Offset of this scenario's "EpSec" times in the access store (see `accesses`)."""
+    return ACCESSES.offset(parse_utcg(stk_root.ConversionUtility.ConvertDate("EpSec", "UTCG", "0")))
+
+
+def _pair_access(
+    get_access: Callable[[], Any],
+    src: str,
+    dst: str,
+    t0: float,
+    t1: float,
+    token: CancelToken,
+    allow_partial: bool,
+    offset: float,
+    chunk_sec: float,
+    windows: list[Span] | None = None,
+    cost: AccessCost | None = None,
+) -> tuple[list[Span], float, bool, float]:
+    """Access of one pair over [t0, t1] (EpSec), computing only what the store lacks.
+
+    Spans already covered by the access store are reused; the missing ones
+    are computed with `_chunked_access` and recorded, and intervals meeting at
+    a boundary are joined. `windows` (from screening) restricts the
+    computation to where access is possible; the rest of [t0, t1] is treated
+    as having none for this result only. Screening can miss access and
+    applies its own elevation mask, so only the spans passed to STK are
+    recorded as covered. `get_access` is only called if something must be
+    computed.
+
+    Returns:
+        (intervals, computed_until, truncated, computed_sec), where
+        `computed_sec` is the length of the spans passed to STK.
+    """
+    covered, known = ACCESSES.get(src, dst, offset)
+    todo = subtract_spans(windows if windows is not None else [(t0, t1)], covered)
+    access = None
+    new_covered: list[Span] = []
+    found: list[Span] = []
+    reached, cut, computed = t1, False, 0.0
+    for a, b in merge_windows(todo, cost.max_gap_sec if cost is not None else 0.0):
+        if access is None:
+            access = get_access()
+        started = time.perf_counter()
+        spans, until, cut = _chunked_access(access, a, b, token, chunk_sec, allow_partial)
+        if cost is not None:
+            cost.record(_access_calls(a, until, chunk_sec), until - a, time.perf_counter() - started)
+        found.extend(spans)
+        new_covered.append((a, until))
+        computed += until - a
+        if cut:
+            reached = until
+            break
+    ACCESSES.update(src, dst, offset, new_covered, found)
+    return clip_spans(merge_spans(known + found), t0, reached), reached, cut, computed
+
+
 @timed_operation
 def compute_access_intervals_internal(
     stk_root: IAgStkObjectRoot,
     object1_path: str,
     object2_path: str,
+    allow_partial: bool = False,
+    start_time: str | None = None,
+    stop_time: str | None = None,
 ) -> dict[str, Any]:
     """Compute access intervals between two STK objects using the Object Model.
 
-    Returns a dictionary with input paths and a list of {start, stop} intervals.
+    The window defaults to the scenario interval; `start_time`/`stop_time` are
+    UTCG strings. Only the parts of the window not already computed for this
+    pair are passed to STK (see `_pair_access`), so extending the scenario or
+    asking for a narrower window reuses earlier results.
+
+    The window is computed in sub-windows so a cancelled or timed out request
+    stops early (see `_chunked_access`); with `allow_partial` the intervals
+    found so far are returned with `truncated` set.
+
+    Returns a dictionary with input paths, a list of {start, stop} intervals,
+    `computed_sec` (seconds of the window passed to STK) and `truncated`
+    (plus `computed_until` when truncated).
     """
-    p1 = _normalize_path(object1_path)
-    p2 = _normalize_path(object2_path)
+    p1 = normalize_path(object1_path)
+    p2 = normalize_path(object2_path)
+
+    scenario = stk_root.CurrentScenario
+    if scenario is None:
+        raise RuntimeError("No active scenario.")
 
     from_obj = stk_root.GetObjectFromPath(p1)
     to_obj = stk_root.GetObjectFromPath(p2)
 
-    access = from_obj.GetAccessToObject(to_obj)
-    access.ComputeAccess()
-
-    intervals = access.AccessIntervals
-    out: list[dict[str, str]] = []
-    for i in range(intervals.Count):
-        ivl = intervals.Item(i)
-        out.append({"start": ivl.StartTime, "stop": ivl.StopTime})
+    conv = stk_root.ConversionUtility
+    with date_unit(stk_root, "EpSec"):
+        t0 = float(conv.ConvertDate("UTCG", "EpSec", start_time)) if start_time else float(scenario.StartTime)
+        t1 = float(conv.ConvertDate("UTCG", "EpSec", stop_time)) if stop_time else float(scenario.StopTime)
+        if t1 < t0:
+            raise ValueError("stop_time must not be before start_time.")
+        spans, until, truncated, computed = _pair_access(
+            lambda: from_obj.GetAccessToObject(to_obj), p1, p2, t0, t1,
+            current_token(), allow_partial, _epoch_offset(stk_root), get_config().access_chunk_sec,
+        )
 
-    return {"from": p1, "to": p2, "intervals": out}
+    # Report times in the root's current date unit (UTCG by default)
+    unit = stk_root.UnitPreferences.GetCurrentUnitAbbrv("DateFormat")
+    out = [
+        {"start": conv.ConvertDate("EpSec", unit, str(a)), "stop": conv.ConvertDate("EpSec", unit, str(b))}
+        for a, b in spans
+    ]
+    result: dict[str, Any] = {
+        "from": p1, "to": p2, "intervals": out, "computed_sec": round(computed, 3), "truncated": truncated,
+    }
+    if truncated:
+        result["computed_until"] = conv.ConvertDate("EpSec", unit, str(until))
+    return result
 
 
 @timed_operation
@@ -54,41 +197,498 @@ def get_lla_ephemeris_internal(
     stk_root: IAgStkObjectRoot,
     satellite_path: str,
     step_sec: float = 60.0,
+    start_time: str | None = None,
+    stop_time: str | None = None,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    fmt: str = "records",
+    dtype: str = "float64",
+    allow_partial: bool = False,
 ) -> dict[str, Any]:
-    """Fetch LLA ephemeris for a satellite over the scenario interval using Data Providers.
+    """Fetch one page of LLA ephemeris for a satellite using Data Providers.
+
+    The window defaults to the scenario interval; `start_time`/`stop_time` are
+    UTCG strings. Each page holds at most `page_size` samples and is fetched with
+    its own `ExecElements` call over that sub-window, so memory stays bounded
+    regardless of scenario length. Pass the returned `next_cursor` back to get
+    the following page; it is None on the last page.
+
+    Within a page, samples are fetched in sub-windows of
+    `report_chunk_samples`, checking the job's cancel token between them. With
+    `allow_partial`, a stopped request returns the samples fetched so far with
+    `truncated` set and `next_cursor` pointing at the first missing sample.
+
+    Returns a dictionary:
+    {satellite, step_sec, start, stop, next_cursor, truncated,
+     records:[{time, lat_deg, lon_deg, alt_km}...]}
 
-    Returns a dictionary: {satellite, step_sec, records:[{time, lat_deg, lon_deg, alt_km}...]}
+    With `fmt` "columns" or "binary" (see `encoding.encode_columns`), `records`
+    is replaced by `columns` {time, lat_deg, lon_deg, alt_km} with `time` in
+    seconds from the scenario `epoch`.
     """
-    p = _normalize_path(satellite_path)
-    sat = stk_root.GetObjectFromPath(p)
+    validate_format(fmt, dtype)
+    if step_sec <= 0:
+        raise ValueError("step_sec must be positive.")
+    page_size = page_size or get_config().ephemeris_page_size
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1.")
+
+    p = normalize_path(satellite_path)
+    # Data provider name and elements are standard for satellites
+    dp = DP_HANDLES.get(stk_root, p, "LLA State", "Fixed")
 
     scenario = stk_root.CurrentScenario
     if scenario is None:
         raise RuntimeError("No active scenario.")
 
-    start = scenario.StartTime
-    stop = scenario.StopTime
+    conv = stk_root.ConversionUtility
+    with date_unit(stk_root, "EpSec"):
+        t0 = float(conv.ConvertDate("UTCG", "EpSec", start_time)) if start_time else float(scenario.StartTime)
+        t1 = float(conv.ConvertDate("UTCG", "EpSec", stop_time)) if stop_time else float(scenario.StopTime)
+    if t1 < t0:
+        raise ValueError("stop_time must not be before start_time.")
 
-    # Data provider name and elements are standard for satellites
-    dp_group = sat.DataProviders.Item("LLA State")
-    dp = dp_group.Group.Item("Fixed")
-    res = dp.ExecElements(start, stop, step_sec, ["Time", "Lat", "Lon", "Alt"])
+    page_start = t0
+    if cursor:
+        try:
+            page_start = float(cursor)
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor!r}") from None
+        if not (t0 <= page_start <= t1):
+            raise ValueError("Cursor is outside the requested window.")
+    page_stop = min(page_start + (page_size - 1) * step_sec, t1)
+    next_start = page_start + page_size * step_sec
+    next_cursor = repr(next_start) if next_start <= t1 else None
+
+    # Page bounds in the root's current date unit (UTCG by default)
+    unit = stk_root.UnitPreferences.GetCurrentUnitAbbrv("DateFormat")
+    start = conv.ConvertDate("EpSec", unit, str(page_start))
+    stop = conv.ConvertDate("EpSec", unit, str(page_stop))
+    page = {
+        "satellite": p,
+        "step_sec": step_sec,
+        "start": start,
+        "stop": stop,
+        "next_cursor": next_cursor,
+    }
+
+    elements = ["Time", "Lat", "Lon", "Alt"]
+    names = {"Time": "time", "Lat": "lat_deg", "Lon": "lon_deg", "Alt": "alt_km"}
+    columns: dict[str, list[Any]] = {v: [] for v in names.values()}
+
+    # Fetch the page in sub-windows so a cancelled/timed-out request stops early
+    token = current_token()
+    chunk = max(get_config().report_chunk_samples, 1)
+    a = page_start
+    while a <= page_stop:
+        if token.stopped:
+            if not allow_partial:
+                token.check()
+            page["truncated"] = True
+            page["next_cursor"] = repr(a)
+            break
+        b = min(a + (chunk - 1) * step_sec, page_stop)
+        if fmt != "records":
+            # Times come back as seconds from the scenario epoch
+            with date_unit(stk_root, "EpSec"):
+                data = dp.ExecElements(a, b, step_sec, elements).DataSets
+                for el, col in names.items():
+                    columns[col].extend(data.GetDataSetByName(el).GetValues())
+        else:
+            a_str = start if a == page_start else conv.ConvertDate("EpSec", unit, str(a))
+            b_str = stop if b == page_stop else conv.ConvertDate("EpSec", unit, str(b))
+            data = dp.ExecElements(a_str, b_str, step_sec, elements).DataSets
+            for el, col in names.items():
+                columns[col].extend(data.GetDataSetByName(el).GetValues())
+        a = b + step_sec
+    else:
+        page["truncated"] = False
 
-    time_vals = list(res.DataSets.GetDataSetByName("Time").GetValues())
-    lat_vals = list(res.DataSets.GetDataSetByName("Lat").GetValues())
-    lon_vals = list(res.DataSets.GetDataSetByName("Lon").GetValues())
-    alt_vals = list(res.DataSets.GetDataSetByName("Alt").GetValues())
+    if fmt != "records":
+        page["epoch"] = getattr(scenario, "Epoch", None) or scenario.StartTime
+        page.update(encode_columns(columns, fmt, dtype))
+        return page
 
     records: list[dict[str, float | str]] = []
-    for i in range(len(time_vals)):
+    for i in range(len(columns["time"])):
         records.append(
             {
-                "time": time_vals[i],
-                "lat_deg": float(lat_vals[i]),
-                "lon_deg": float(lon_vals[i]),
-                "alt_km": float(alt_vals[i]),
+                "time": columns["time"][i],
+                "lat_deg": float(columns["lat_deg"][i]),
+                "lon_deg": float(columns["lon_deg"][i]),
+                "alt_km": float(columns["alt_km"][i]),
             }
         )
 
-    return {"satellite": p, "step_sec": step_sec, "records": records}
+    page["records"] = records
+    return page
+
+
+@timed_operation
+def stk_ephemeris_samples_internal(
+    stk_root: IAgStkObjectRoot,
+    satellite_path: str,
+    samples: int = 24,
+) -> dict[str, Any]:
+    """Sample a satellite's position from STK's data providers, for checking local ephemeris.
+
+    `samples` times are spread evenly over the scenario interval and fetched
+    from "LLA State" (Fixed) and "Cartesian Position" (J2000 and Fixed).
+
+    Returns:
+        dict: {time (UTCG), lla {lat_deg, lon_deg, alt_km}, eci {x_km, y_km, z_km},
+        ecf {x_km, y_km, z_km}}
+    """
+    if samples < 2:
+        raise ValueError("samples must be at least 2.")
+    p = normalize_path(satellite_path)
+    scenario = stk_root.CurrentScenario
+    if scenario is None:
+        raise RuntimeError("No active scenario.")
+
+    with date_unit(stk_root, "EpSec"):
+        step_sec = (float(scenario.StopTime) - float(scenario.StartTime)) / (samples - 1)
+    if step_sec <= 0:
+        raise RuntimeError("The scenario interval is empty.")
+
+    def fetch(provider: str, group: str, elements: dict[str, str]) -> dict[str, list[Any]]:
+        data = DP_HANDLES.get(stk_root, p, provider, group).ExecElements(
+            start, stop, step_sec, ["Time", *elements],
+        ).DataSets
+        return {col: list(data.GetDataSetByName(el).GetValues()) for el, col in {"Time": "time", **elements}.items()}
+
+    xyz = {"x": "x_km", "y": "y_km", "z": "z_km"}
+    with date_unit(stk_root, "UTCG"):
+        start, stop = scenario.StartTime, scenario.StopTime
+        lla = fetch("LLA State", "Fixed", {"Lat": "lat_deg", "Lon": "lon_deg", "Alt": "alt_km"})
+        eci = fetch("Cartesian Position", "J2000", xyz)
+        ecf = fetch("Cartesian Position", "Fixed", xyz)
+    return {"time": lla.pop("time"), "lla": lla, "eci": {k: eci[k] for k in xyz.values()},
+            "ecf": {k: ecf[k] for k in xyz.values()}}
+
+
+REPORT_KINDS = ("time", "interval", "fixed")
 
+
+@timed_operation
+def data_provider_report_internal(
+    stk_root: IAgStkObjectRoot,
+    objects: list[str],
+    provider: str,
+    elements: list[str],
+    step_sec: float = 60.0,
+    start_time: str | None = None,
+    stop_time: str | None = None,
+    kind: str = "time",
+    fmt: str = "columns",
+    dtype: str = "float64",
+    allow_partial: bool = False,
+) -> dict[str, Any]:
+    """Run one data provider for many objects and return the elements as columns.
+
+    `provider` is a data provider path such as "LLA State/Fixed",
+    "Cartesian Position/J2000" or "Beta Angle" (no group); `kind` selects the
+    `ExecElements` form: "time" (time-varying, sampled every `step_sec`),
+    "interval" (e.g. "Lighting Times/Sunlight") or "fixed". Handles are
+    resolved once per engine and reused (`dataproviders`). Every element of an
+    object comes from one `ExecElements` call per sub-window of
+    `report_chunk_samples` samples (one call for interval and fixed
+    providers), and the cancel token is checked between calls. With
+    `allow_partial`, a stopped request returns the objects finished so far
+    with `truncated` set.
+
+    Objects the provider fails for (missing object, provider or element) are
+    reported in `errors` instead of failing the report.
+
+    Returns:
+        dict: {provider, kind, elements, objects, start, stop, step_sec, epoch,
+        truncated, errors, format, length, columns {obj, <element>...}} where
+        `obj` indexes `objects` and times are seconds from `epoch`; elements
+        with non-numeric values are returned as plain lists in `text_columns`.
+    """
+    if fmt not in ("columns", "binary"):
+        raise ValueError("format must be 'columns' or 'binary'.")
+    validate_format(fmt, dtype)
+    if kind not in REPORT_KINDS:
+        raise ValueError(f"kind must be one of: {', '.join(REPORT_KINDS)}.")
+    if kind == "time" and step_sec <= 0:
+        raise ValueError("step_sec must be positive.")
+    elements = list(dict.fromkeys(e.strip() for e in elements if e and e.strip()))
+    if not elements:
+        raise ValueError("elements must name at least one data provider element.")
+    name, group = split_provider_path(provider)
+
+    scenario = stk_root.CurrentScenario
+    if scenario is None:
+        raise RuntimeError("No active scenario.")
+    paths = _expand_paths(stk_root, objects)
+    if not paths:
+        raise ValueError("No objects match the given paths.")
+
+    conv = stk_root.ConversionUtility
+    with date_unit(stk_root, "EpSec"):
+        t0 = float(conv.ConvertDate("UTCG", "EpSec", start_time)) if start_time else float(scenario.StartTime)
+        t1 = float(conv.ConvertDate("UTCG", "EpSec", stop_time)) if stop_time else float(scenario.StopTime)
+    if t1 < t0:
+        raise ValueError("stop_time must not be before start_time.")
+    if kind == "time":
+        samples = math.floor((t1 - t0) / step_sec + 1e-9) + 2
+        limit = get_config().report_max_samples
+        if samples * len(paths) > limit:
+            raise ValueError(
+                f"The report would have about {samples * len(paths)} samples (limit {limit}); "
+                "use a larger step_sec, a shorter window or fewer objects."
+            )
+
+    unit = stk_root.UnitPreferences.GetCurrentUnitAbbrv("DateFormat")
+    report: dict[str, Any] = {
+        "provider": f"{name}/{group}" if group else name,
+        "kind": kind,
+        "elements": elements,
+        "objects": paths,
+        "start": conv.ConvertDate("EpSec", unit, str(t0)),
+        "stop": conv.ConvertDate("EpSec", unit, str(t1)),
+        "step_sec": step_sec if kind == "time" else None,
+        "epoch": getattr(scenario, "Epoch", None) or scenario.StartTime,
+        "truncated": False,
+    }
+
+    token = current_token()
+    chunk = max(get_config().report_chunk_samples, 1)
+    index: list[int] = []
+    columns: dict[str, list[Any]] = {el: [] for el in elements}
+    errors: list[dict[str, str]] = []
+
+    def stopped() -> bool:
+        if token.stopped:
+            if not allow_partial:
+                token.check()
+            report["truncated"] = True
+        return token.stopped
+
+    with date_unit(stk_root, "EpSec"):
+        for i, path in enumerate(paths):
+            if stopped():
+                break
+            rows: dict[str, list[Any]] = {el: [] for el in elements}
+            try:
+                dp = DP_HANDLES.get(stk_root, path, name, group)
+                if kind == "time":
+                    a = t0
+                    while a <= t1:
+                        if stopped():
+                            break
+                        b = min(a + (chunk - 1) * step_sec, t1)
+                        data = dp.ExecElements(a, b, step_sec, elements).DataSets
+                        for el in elements:
+                            rows[el].extend(data.GetDataSetByName(el).GetValues())
+                        a = b + step_sec
+                elif kind == "interval":
+                    data = dp.ExecElements(t0, t1, elements).DataSets
+                    for el in elements:
+                        rows[el].extend(data.GetDataSetByName(el).GetValues())
+                else:
+                    data = dp.ExecElements(elements).DataSets
+                    for el in elements:
+                        rows[el].extend(data.GetDataSetByName(el).GetValues())
+            except (OperationCancelled, OperationTimeout):
+                raise
+            except Exception as e:
+                errors.append({"object": path, "error": str(e)})
+                continue
+            if report["truncated"]:
+                # Only whole objects are returned
+                break
+            n = len(rows[elements[0]])
+            if any(len(v) != n for v in rows.values()):
+                errors.append({"object": path, "error": "Elements returned different numbers of values."})
+                continue
+            index.extend([i] * n)
+            for el in elements:
+                columns[el].extend(rows[el])
+
+    numeric: dict[str, Any] = {"obj": index}
+    text: dict[str, list[Any]] = {}
+    for el, values in columns.items():
+        try:
+            numeric[el] = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            text[el] = values
+    report["errors"] = errors
+    report.update(encode_columns(numeric, fmt, dtype))
+    if text:
+        report["text_columns"] = text
+    return report
+
+
+def _expand_paths(stk_root: IAgStkObjectRoot, entries: list[str]) -> list[str]:
+    """Normalize object paths, expanding class wildcards such as 'Satellite/*'.
+
+    Duplicates are dropped while preserving the order of first appearance.
+    """
+    out: list[str] = []
+    for entry in entries:
+        p = normalize_path(entry)
+        parts = [x for x in p.split("/") if x and x != "*"]
+        if p.endswith("/*") and len(parts) == 1:
+            cls = parts[0]
+            for obj in list_objects_internal(stk_root, filter_type=cls):
+                out.append(f"*/{obj['type']}/{obj['name']}")
+        else:
+            out.append(p)
+    return list(dict.fromkeys(out))
+
+
+@timed_operation
+def compute_access_matrix_internal(
+    stk_root: IAgStkObjectRoot,
+    sources: list[str],
+    targets: list[str],
+    allow_partial: bool = False,
+    prefilter: bool | None = None,
+    min_elevation_deg: float | None = None,
+) -> dict[str, Any]:
+    """Compute access for every source x target pair in a single pass.
+
+    Each object path is resolved once and each pair is computed in
+    sub-windows (see `_chunked_access`), so a cancelled or timed out request
+    stops between sub-windows. With `allow_partial`, the pairs finished so far
+    are returned with `truncated` set (the last pair may cover only up to
+    `computed_until`).
+
+    With `prefilter` (default `STK_MCP_ACCESS_PREFILTER`) the pairs are first
+    screened for line of sight on a coarse grid (see `screening`); STK then
+    computes only the windows that pass, and pairs that never pass are
+    returned with no intervals without calling STK. Spans already computed
+    for a pair are reused from the access store (see `_pair_access`).
+
+    Times are returned as seconds from the scenario epoch ("EpSec"), in
+    columnar form:
+
+    - `pairs`: parallel `source`/`target` index lists into `sources`/`targets`
+    - `intervals`: parallel `pair`/`start`/`stop` lists (pair indexes into `pairs`)
+    - `summary`: per-pair `count`, `total_sec`, `min_sec`, `max_sec`
+    - `errors`: `{pair, error}` for pairs STK could not compute
+    - `pairs_total`, `truncated`, `computed_until` (EpSec, or None)
+    - `computed_sec`: pair-time (seconds) passed to STK; the rest was reused or screened out
+    - `prefilter`: {step_sec, min_elevation_deg, pairs_pruned, pairs_unscreened,
+      window_fraction, screen_sec, stk_sec, estimated_saved_sec}, or None
+    """
+    scenario = stk_root.CurrentScenario
+    if scenario is None:
+        raise RuntimeError("No active scenario.")
+
+    src_paths = _expand_paths(stk_root, sources)
+    tgt_paths = _expand_paths(stk_root, targets)
+    if not src_paths or not tgt_paths:
+        raise ValueError("No objects matched the given sources/targets.")
+
+    objects = {p: stk_root.GetObjectFromPath(p) for p in dict.fromkeys(src_paths + tgt_paths)}
+
+    pair_src: list[int] = []
+    pair_tgt: list[int] = []
+    ivl_pair: list[int] = []
+    ivl_start: list[float] = []
+    ivl_stop: list[float] = []
+    summary: dict[str, list[float | int]] = {"count": [], "total_sec": [], "min_sec": [], "max_sec": []}
+    errors: list[dict[str, Any]] = []
+
+    token = current_token()
+    truncated = False
+    until: float | None = None
+    cfg = get_config()
+    if prefilter is None:
+        prefilter = cfg.access_prefilter
+    chunk_sec = cfg.access_chunk_sec
+    stats: dict[str, Any] | None = None
+    cost = AccessCost()
+    stk_sec = 0.0
+    computed_total = 0.0
+    epoch = getattr(scenario, "Epoch", None) or scenario.StartTime
+    with date_unit(stk_root, "EpSec"):
+        t0, t1 = float(scenario.StartTime), float(scenario.StopTime)
+        pairs = [(i, j) for i, sp in enumerate(src_paths) for j, tp in enumerate(tgt_paths) if sp != tp]
+        offset = _epoch_offset(stk_root)
+        windows: list[list[Span] | None] = [None] * len(pairs)
+        if prefilter and pairs:
+            windows, stats = screen_access(
+                stk_root, objects, src_paths, tgt_paths, pairs, t0, t1, token, min_elevation_deg,
+            )
+        for n, (i, j) in enumerate(pairs):
+            if token.stopped:
+                if not allow_partial:
+                    token.check()
+                truncated = True
+                break
+            k = len(pair_src)
+            pair_src.append(i)
+            pair_tgt.append(j)
+            durations: list[float] = []
+            started = time.perf_counter()
+            try:
+                src, dst = objects[src_paths[i]], objects[tgt_paths[j]]
+                spans, reached, cut, computed = _pair_access(
+                    lambda: src.GetAccessToObject(dst), src_paths[i], tgt_paths[j], t0, t1,
+                    token, allow_partial, offset, chunk_sec, windows[n], cost,
+                )
+                computed_total += computed
+                for start, stop in spans:
+                    ivl_pair.append(k)
+                    ivl_start.append(start)
+                    ivl_stop.append(stop)
+                    durations.append(stop - start)
+                if cut:
+                    truncated, until = True, reached
+            except (OperationCancelled, OperationTimeout):
+                raise
+            except Exception as e:
+                errors.append({"pair": k, "error": str(e)})
+            stk_sec += time.perf_counter() - started
+            summary["count"].append(len(durations))
+            summary["total_sec"].append(sum(durations, 0.0))
+            summary["min_sec"].append(min(durations) if durations else 0.0)
+            summary["max_sec"].append(max(durations) if durations else 0.0)
+            if truncated:
+                break
+
+    return {
+        "epoch": epoch,
+        "sources": src_paths,
+        "targets": tgt_paths,
+        "pairs": {"source": pair_src, "target": pair_tgt},
+        "intervals": {"pair": ivl_pair, "start": ivl_start, "stop": ivl_stop},
+        "summary": summary,
+        "errors": errors,
+        "pairs_total": len(pairs),
+        "truncated": truncated,
+        "computed_until": until,
+        "computed_sec": round(computed_total, 3),
+        "prefilter": _prefilter_report(stats, cost, stk_sec, len(pair_src), t0, t1, chunk_sec),
+    }
+
+
+def _access_calls(t0: float, t1: float, chunk_sec: float) -> int:
+    """Number of ComputeAccess calls `_chunked_access` makes over [t0, t1]."""
+    return max(math.ceil((t1 - t0) / chunk_sec - 1e-9), 1) if chunk_sec > 0 else 1
+
+
+def _prefilter_report(
+    stats: dict[str, Any] | None,
+    cost: AccessCost,
+    stk_sec: float,
+    pairs: int,
+    t0: float,
+    t1: float,
+    chunk_sec: float,
+) -> dict[str, Any] | None:
+    """Screening stats plus the STK time spent and an estimate of the time saved.
+
+    The saving is the fitted cost (`AccessCost`) of computing every pair over
+    the full interval, minus the STK and screening time actually spent; None
+    when too few windows were computed to fit the cost.
+    """
+    if stats is None:
+        return None
+    full = cost.estimate(pairs * _access_calls(t0, t1, chunk_sec), pairs * (t1 - t0))
+    saved = None if full is None else round(full - stk_sec - stats["screen_sec"], 4)
+    return {**stats, "stk_sec": round(stk_sec, 4), "estimated_saved_sec": saved}
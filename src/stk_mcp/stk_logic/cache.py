@@ -0,0 +1,142 @@
+"""
+In-memory LRU cache for STK analysis results.
+
+Entries are bounded both by count and by approximate size in bytes. Each entry
+carries a set of tags (object paths, or the scenario itself) so that tools
+which mutate the scenario can invalidate exactly the results they affect.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any, TypeVar
+
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Tag attached to every entry of a scope; invalidating it drops the whole scope
+SCENARIO_TAG = "<scenario>"
+
+
+def _approx_size(value: Any) -> int:
+    """Rough deep size in bytes of JSON-like data (dicts, lists, scalars)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += _approx_size(k) + _approx_size(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            size += _approx_size(v)
+    return size
+
+
+class ResultCache:
+    """Size- and byte-bounded LRU cache with tag-based invalidation."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int, frozenset]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, tags: Iterable[Hashable] = ()) -> None:
+        size = _approx_size(value)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, size, frozenset(tags))
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[Hashable]) -> int:
+        """Drop every entry carrying any of `tags`; returns the number dropped."""
+        wanted = set(tags)
+        with self._lock:
+            doomed = [k for k, (_, _, t) in self._entries.items() if t & wanted]
+            for k in doomed:
+                self._remove(k)
+            self.invalidations += len(doomed)
+        if doomed:
+            logger.debug("Invalidated %d cached results for %s", len(doomed), wanted)
+        return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        tags: Iterable[Hashable],
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Return the cached value for `key`, or await `compute()` and cache it.
+
+        Results flagged `truncated` (partial results of a stopped request) are
+        returned but never cached.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        value = await compute()
+        if not (isinstance(value, dict) and value.get("truncated")):
+            self.put(key, value, tags)
+        return value
+
+
+def object_tags(scope: Hashable, *paths: str) -> list[tuple[Hashable, str]]:
+    """Tags for a result that depends on `paths` within engine `scope`."""
+    return [(scope, SCENARIO_TAG), *((scope, p) for p in paths)]
+
+
+_cfg = get_config()
+RESULT_CACHE = ResultCache(
+    max_entries=_cfg.cache_max_entries,
+    max_bytes=_cfg.cache_max_bytes,
+)
@@ -0,0 +1,99 @@
+"""
+Cooperative cancellation and timeouts for STK jobs.
+
+STK calls such as `ComputeAccess` or `ExecElements` cannot be interrupted once
+started, so long computations are split into sub-windows and check the
+current job's `CancelToken` between them. `run_stk` creates one token per
+request: it is cancelled when the MCP request is cancelled (or the client goes
+away) and expires after the request's timeout. The executor makes the token
+available to the running job through `current_token()`; in an engine pool
+the cancellation is relayed to the worker process.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+
+class OperationCancelled(RuntimeError):
+    """The request was cancelled by the client; the STK job stopped early."""
+
+
+class OperationTimeout(RuntimeError):
+    """The request exceeded its timeout; the STK job stopped early."""
+
+
+class CancelToken:
+    """Cancellation flag plus optional deadline for one STK job."""
+
+    def __init__(self, timeout_sec: float | None = None) -> None:
+        self._event = threading.Event()
+        self.deadline = time.monotonic() + timeout_sec if timeout_sec else None
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        # Extra cancellation source, e.g. a flag shared with the parent process
+        self.remote: Callable[[], bool] | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (self.remote is not None and self.remote())
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    @property
+    def stopped(self) -> bool:
+        """True if the job should stop (cancelled or past its deadline)."""
+        return self.cancelled or self.expired
+
+    def remaining(self) -> float | None:
+        """Seconds left before the deadline, or None without one."""
+        return None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._event.set()
+            callbacks = list(self._callbacks)
+        for cb in callbacks:
+            cb()
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Run `callback` when the token is cancelled (immediately if it already is)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def check(self) -> None:
+        """Raise if the job should stop."""
+        if self.cancelled:
+            raise OperationCancelled("Request was cancelled.")
+        if self.expired:
+            raise OperationTimeout("Request timed out.")
+
+
+# Token of a job with no cancellation or timeout
+NEVER = CancelToken()
+
+_local = threading.local()
+
+
+def current_token() -> CancelToken:
+    """Token of the STK job running on this thread (never stops outside a job)."""
+    return getattr(_local, "token", None) or NEVER
+
+
+@contextmanager
+def using_token(token: CancelToken | None) -> Iterator[None]:
+    """Make `token` the current token for the duration of a job."""
+    previous = getattr(_local, "token", None)
+    _local.token = token
+    try:
+        yield
+    finally:
+        _local.token = previous
@@ -24,6 +24,101 @@ class StkConfig(BaseSettings):
     default_start_time: str = "20 Jan 2020 17:00:00.000"
     default_duration_hours: float = 48.0
 
+    # Engine pool (engine mode only; 1 = single in-process engine)
+    engine_workers: int = 1
+    engine_start_timeout_sec: float = 300.0
+    # Start STK after the listener is up, then run one throwaway access and
+    # data-provider computation so the first real request is not a cold start
+    engine_background_start: bool = True
+    engine_warmup: bool = True
+
+    # Engine supervision (0 = off). Any of these runs engine mode in worker
+    # processes so an engine can be recycled after N jobs or past an RSS
+    # limit, killed when one job holds it too long, and replaced from a pool
+    # of pre-started spares.
+    engine_recycle_ops: int = 0
+    engine_max_rss_mb: float = 0.0
+    engine_hang_timeout_sec: float = 0.0
+    engine_spares: int = 0
+
+    # Simulated backend (`--mode simulated`): artificial latency per STK call
+    # and extra latency per access/data-provider computation
+    sim_call_latency_ms: float = 0.0
+    sim_compute_latency_ms: float = 0.0
+
+    # Result cache (access intervals / ephemeris)
+    cache_max_entries: int = 256
+    cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Ephemeris pagination (samples per page)
+    ephemeris_page_size: int = 10000
+    ephemeris_max_page_size: int = 100000
+
+    # Generic data-provider reports: samples per request (all objects) and
+    # resolved provider handles kept per engine
+    report_max_samples: int = 1_000_000
+    report_handle_cache_max: int = 10000
+
+    # Local two-body ephemeris for TwoBody satellites created by this server,
+    # and the position tolerance `verify_twobody_ephemeris` checks against STK
+    twobody_fast_path: bool = True
+    twobody_tolerance_km: float = 1.0
+
+    # Serialization of bulk results: "none", "gzip" or "zstd" (needs the
+    # `zstandard` package) for JSON of at least `min_bytes`, and the level
+    response_compression: str = "none"
+    response_compression_min_bytes: int = 1024 * 1024
+    response_compression_level: int = 3
+
+    # Saved scenarios (snapshots/ and templates/ below this directory)
+    scenario_dir: str = "~/.stk-mcp/scenarios"
+
+    # Scenarios parked when another one becomes active: how many are kept
+    # (saved to disk; 0 disables parking), how many keep their TwoBody
+    # elements and stored access in memory, and the memory bound, before the
+    # least recently used is dropped or evicted to disk
+    parked_max_saved: int = 8
+    parked_max_resident: int = 4
+    parked_max_mb: float = 256.0
+
+    # Bulk location import (rows per STK batch)
+    import_batch_size: int = 500
+
+    # Constellation generator (satellites per create_constellation call)
+    constellation_max_satellites: int = 5000
+
+    # Retries of transient STK failures and the engine circuit breaker
+    retry_max_attempts: int = 3
+    retry_budget_sec: float = 2.0
+    retry_initial_delay_sec: float = 0.1
+    retry_max_delay_sec: float = 1.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_sec: float = 30.0
+
+    # Scheduler: queue bound per engine (0 = unbounded) and start deadlines
+    # per priority class in seconds (0 = none)
+    queue_max_pending: int = 256
+    deadline_interactive_sec: float = 30.0
+    deadline_analysis_sec: float = 300.0
+    deadline_bulk_sec: float = 0.0
+
+    # Timeouts (0 = none) and chunking of long computations so they can stop
+    # between sub-windows when cancelled or out of time
+    operation_timeout_sec: float = 0.0
+    timeout_grace_sec: float = 5.0
+    access_chunk_sec: float = 6 * 3600.0
+    report_chunk_samples: int = 5000
+
+    # Access matrix line-of-sight prefilter: coarse ephemeris step and the
+    # elevation mask applied at ground sites (0 = geometric horizon only)
+    access_prefilter: bool = True
+    access_prefilter_step_sec: float = 60.0
+    access_prefilter_min_elevation_deg: float = 0.0
+
+    # Access intervals kept per object pair (with the spans they cover) so an
+    # extended interval or a narrower window computes only what is missing
+    access_store_max_pairs: int = 100000
+
     # Server defaults
     default_host: str = "127.0.0.1"
     default_port: int = 8765
@@ -31,6 +126,13 @@ class StkConfig(BaseSettings):
     # Logging
     log_level: str = "INFO"
 
+    @property
+    def engine_supervised(self) -> bool:
+        """True if any engine supervision setting is enabled."""
+        return bool(
+            self.engine_recycle_ops or self.engine_max_rss_mb or self.engine_hang_timeout_sec or self.engine_spares
+        )
+
     model_config = SettingsConfigDict(
         env_prefix="STK_MCP_",
         extra="ignore",
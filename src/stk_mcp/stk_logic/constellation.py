@@ -0,0 +1,197 @@
+"""
+Bulk satellite creation: Walker-delta patterns and explicit element tables.
+
+Every satellite is created and configured inside one STK job: the Object
+Model creates the objects and the orbits are set by Connect
+`SetState ... Classical TwoBody` commands sent as a single batch. No
+win32com casting is needed, so the same code runs on Windows Desktop and
+Linux Engine.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from .accesses import ACCESSES
+from .config import get_config
+from .core import IAgStkObjectRoot, stk_objects
+from .orbits import ORBITS
+from .registry import REGISTRY
+from .satellite import mean_anomaly_deg, scenario_interval_utcg, twobody_state_command
+from .twobody import Elements as TwoBodyElements, parse_utcg
+from .utils import ConnectBatch, timed_operation
+
+logger = logging.getLogger(__name__)
+
+Elements = dict[str, Any]
+
+
+def walker_elements(
+    name_prefix: str,
+    total_satellites: int,
+    planes: int,
+    phasing: int,
+    altitude_km: float,
+    inclination_deg: float,
+    raan_spread_deg: float = 360.0,
+) -> list[Elements]:
+    """
+    Classical elements for a Walker constellation i:T/P/F (circular orbits).
+
+    Planes are spread evenly over `raan_spread_deg` (360 for Walker-delta,
+    180 for Walker-star). Satellite `s` of plane `p` is named
+    `{name_prefix}_P{p}_S{s}` (1-based).
+
+    Raises:
+        ValueError: If T is not a multiple of P or F is outside [0, P-1].
+    """
+    if total_satellites < 1 or planes < 1:
+        raise ValueError("total_satellites and planes must be at least 1.")
+    if total_satellites % planes:
+        raise ValueError("total_satellites must be a multiple of planes.")
+    if not (0 <= phasing < planes):
+        raise ValueError("phasing must be within [0, planes - 1].")
+    if altitude_km < 0:
+        raise ValueError("altitude_km must be non-negative.")
+    if not (0.0 <= inclination_deg <= 180.0):
+        raise ValueError("inclination_deg must be within [0, 180] degrees.")
+
+    per_plane = total_satellites // planes
+    a_km = get_config().earth_radius_km + altitude_km
+    out: list[Elements] = []
+    for p in range(planes):
+        raan = p * raan_spread_deg / planes
+        for s in range(per_plane):
+            anomaly = (s * 360.0 / per_plane + p * phasing * 360.0 / total_satellites) % 360.0
+            out.append({
+                "name": f"{name_prefix}_P{p + 1}_S{s + 1}",
+                "semi_major_axis_km": a_km,
+                "eccentricity": 0.0,
+                "inclination_deg": inclination_deg,
+                "argp_deg": 0.0,
+                "raan_deg": raan,
+                "true_anom_deg": anomaly,
+            })
+    return out
+
+
+def elements_from_table(name_prefix: str, rows: Sequence[Mapping[str, Any]]) -> list[Elements]:
+    """
+    Normalize an explicit element table.
+
+    Each row needs `inclination_deg` and either `semi_major_axis_km` or
+    `altitude_km`; `eccentricity`, `raan_deg`, `argp_deg` and `true_anom_deg`
+    default to 0 and `name` to `{name_prefix}_{n}` (1-based).
+
+    Raises:
+        ValueError: Naming the first invalid row.
+    """
+    radius = get_config().earth_radius_km
+    out: list[Elements] = []
+    for n, row in enumerate(rows, start=1):
+        try:
+            if row.get("semi_major_axis_km") is not None:
+                a_km = float(row["semi_major_axis_km"])
+            elif row.get("altitude_km") is not None:
+                a_km = radius + float(row["altitude_km"])
+            else:
+                raise ValueError("needs semi_major_axis_km or altitude_km")
+            el = {
+                "name": str(row.get("name") or f"{name_prefix}_{n}"),
+                "semi_major_axis_km": a_km,
+                "eccentricity": float(row.get("eccentricity", 0.0)),
+                "inclination_deg": float(row["inclination_deg"]),
+                "argp_deg": float(row.get("argp_deg", 0.0)),
+                "raan_deg": float(row.get("raan_deg", 0.0)),
+                "true_anom_deg": float(row.get("true_anom_deg", 0.0)),
+            }
+        except KeyError as e:
+            raise ValueError(f"Row {n}: missing {e.args[0]}") from None
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Row {n}: {e}") from None
+        if not (0.0 <= el["eccentricity"] < 1.0):
+            raise ValueError(f"Row {n}: eccentricity must be within [0, 1).")
+        if el["semi_major_axis_km"] * (1.0 - el["eccentricity"]) < radius - 0.5:
+            raise ValueError(f"Row {n}: perigee is below the Earth's surface.")
+        if not (0.0 <= el["inclination_deg"] <= 180.0):
+            raise ValueError(f"Row {n}: inclination_deg must be within [0, 180] degrees.")
+        out.append(el)
+    return out
+
+
+@timed_operation
+def create_constellation_internal(
+    stk_root: IAgStkObjectRoot,
+    satellites: list[Elements],
+    step_sec: float = 60.0,
+) -> dict[str, Any]:
+    """
+    Create or update every satellite in `satellites` in a single STK job.
+
+    Satellites already in the scenario are reconfigured in place. A failing
+    satellite is reported and does not stop the batch. The elapsed time and
+    creation rate are measured inside the job, excluding queueing.
+
+    Returns:
+        dict: {satellites, created, updated, failed, errors:[{name, error}],
+        elapsed_sec, satellites_per_sec}
+    """
+    stkobjects = stk_objects()
+    if stkobjects is None:
+        raise RuntimeError("STK enums not available; cannot create satellites.")
+    scenario = stk_root.CurrentScenario
+    if scenario is None:
+        raise RuntimeError("No active scenario found. Use 'setup_scenario' first.")
+
+    t0 = time.perf_counter()
+    REGISTRY.ensure(stk_root)
+    start, stop = scenario_interval_utcg(stk_root, scenario)
+    epoch = parse_utcg(start)
+    children = scenario.Children
+    summary: dict[str, Any] = {"satellites": len(satellites), "created": 0, "updated": 0, "failed": 0, "errors": []}
+
+    # Objects are created first; all orbit states then go to STK as one Connect batch
+    batch = ConnectBatch(stk_root)
+    queued: list[tuple[str, bool, Elements]] = []
+    for el in satellites:
+        name = el["name"]
+        try:
+            exists = REGISTRY.contains("Satellite", name)
+            if not exists:
+                children.New(stkobjects.AgESTKObjectType.eSatellite, name)
+                REGISTRY.add("Satellite", name)
+        except Exception as e:
+            summary["failed"] += 1
+            summary["errors"].append({"name": name, "error": str(e)})
+            continue
+        batch.add(twobody_state_command(
+            name, start, stop, step_sec,
+            el["semi_major_axis_km"], el["eccentricity"], el["inclination_deg"],
+            el["argp_deg"], el["raan_deg"], el["true_anom_deg"],
+        ))
+        queued.append((name, exists, el))
+        ORBITS.discard(name)
+        ACCESSES.discard(f"*/Satellite/{name}")
+
+    for (name, exists, el), reply in zip(queued, batch.execute()):
+        if reply.ok:
+            summary["updated" if exists else "created"] += 1
+            ORBITS.add(name, TwoBodyElements(
+                el["semi_major_axis_km"], el["eccentricity"], el["inclination_deg"], el["argp_deg"],
+                el["raan_deg"], mean_anomaly_deg(el["true_anom_deg"], el["eccentricity"]), epoch,
+            ), start, stop)
+        else:
+            summary["failed"] += 1
+            summary["errors"].append({"name": name, "error": reply.error})
+
+    elapsed = time.perf_counter() - t0
+    summary["elapsed_sec"] = round(elapsed, 3)
+    summary["satellites_per_sec"] = round(len(satellites) / elapsed, 1) if elapsed > 0 else None
+    logger.info(
+        "Constellation: %d satellites in %.3fs (%.1f/s), %d failed",
+        len(satellites), elapsed, len(satellites) / elapsed if elapsed > 0 else 0.0, summary["failed"],
+    )
+    return summary
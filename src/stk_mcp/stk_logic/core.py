@@ -1,3 +1,6 @@
+import asyncio
+import functools
+import importlib.util
 import os
 import platform
 import logging
@@ -8,8 +11,15 @@ from enum import Enum  # <--- IMPORT Enum
 from threading import Lock
 
 from pydantic import BaseModel
-from typing import NamedTuple, Optional
-from mcp.server.fastmcp import FastMCP
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional
+
+from .config import get_config
+from .metrics import METRICS
+from .cancellation import CancelToken, OperationTimeout
+from .scheduler import Priority
+
+if TYPE_CHECKING:  # the MCP SDK is only needed once a server is built
+    from mcp.server.fastmcp import FastMCP
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +29,12 @@ class StkMode(str, Enum):
     """Enumeration for selecting the STK execution mode."""
     DESKTOP = "desktop"
     ENGINE = "engine"
+    SIMULATED = "simulated"  # in-process stand-in for STK (see `simulation`)
 
-# --- Attempt STK Imports ---
-stk_available = False
+# --- Locate the STK Python API ---
+# The API is only located here and imported on first use (`load_stk_api`,
+# `stk_objects`), so `--help`, `list-tools` and server startup don't pay its
+# import cost; the engine launchers load it on the STK thread.
 STKApplication = None
 STKDesktop = None
 STKEngine = None
@@ -29,38 +42,79 @@ IAgStkObjectRoot = None
 IAgScenario = None
 
 _platform = platform.system()
-if _platform == "Windows":
-    try:
-        from agi.stk12.stkdesktop import STKDesktop as STKDesktopImport, STKApplication as STKApplicationImport
-        from agi.stk12.stkengine import STKEngine as STKEngineImport
-        from agi.stk12.stkobjects import IAgStkObjectRoot as IAgStkObjectRootImport, IAgScenario as IAgScenarioImport
 
-        STKDesktop = STKDesktopImport
-        STKApplication = STKApplicationImport  # Desktop App
-        STKEngine = STKEngineImport
-        IAgStkObjectRoot = IAgStkObjectRootImport
-        IAgScenario = IAgScenarioImport
-        stk_available = True
-        logger.info("STK Desktop and Engine modules loaded successfully (Windows).")
-    except ImportError:
-        logger.warning("Failed to import STK modules on Windows. Functionality disabled.")
-elif _platform == "Linux":
+
+def _api_installed() -> bool:
     try:
-        from agi.stk12.stkengine import STKEngine as STKEngineImport, IAgStkObjectRoot as IAgStkObjectRootImport
-        from agi.stk12.stkobjects import IAgScenario as IAgScenarioImport
+        return importlib.util.find_spec("agi.stk12") is not None
+    except (ImportError, ValueError):
+        return False
 
-        STKEngine = STKEngineImport
-        IAgStkObjectRoot = IAgStkObjectRootImport
-        IAgScenario = IAgScenarioImport
-        stk_available = True
-        logger.info("STK Engine modules loaded successfully (Linux). STK Desktop is unavailable.")
-    except ImportError:
-        logger.warning("Failed to import STK Engine modules. Functionality disabled.")
-elif _platform == "Darwin":
+
+stk_available = _platform in ("Windows", "Linux") and _api_installed()
+if _platform == "Darwin":
     # STK Engine is not supported on macOS
     logger.error("Detected macOS (Darwin). STK Engine/Desktop are not supported on this platform.")
-else:
+elif _platform not in ("Windows", "Linux"):
     logger.warning("Unknown platform '%s'. STK availability undetermined.", _platform)
+elif not stk_available:
+    logger.warning("STK Python API (agi.stk12) not found. Functionality disabled.")
+
+_api_lock = Lock()
+
+# Set by `enable_simulation` (simulated mode, also in pool worker processes)
+simulated = False
+
+
+def enable_simulation() -> None:
+    """Serve STK calls from the simulated backend: enums and roots come from `simulation`."""
+    global stk_available, simulated
+    stk_available = True
+    simulated = True
+    stk_objects.cache_clear()
+
+
+def load_stk_api() -> bool:
+    """Import the STK application/root classes on first call; returns False if they are unavailable."""
+    global STKApplication, STKDesktop, STKEngine, IAgStkObjectRoot, IAgScenario
+    with _api_lock:
+        if IAgStkObjectRoot is not None:
+            return True
+        if not stk_available:
+            return False
+        try:
+            from agi.stk12.stkengine import STKEngine as STKEngineImport
+            from agi.stk12.stkobjects import IAgStkObjectRoot as IAgStkObjectRootImport, IAgScenario as IAgScenarioImport
+            if _platform == "Windows":
+                from agi.stk12.stkdesktop import STKDesktop as STKDesktopImport, STKApplication as STKApplicationImport
+
+                STKDesktop = STKDesktopImport
+                STKApplication = STKApplicationImport  # Desktop App
+        except ImportError as e:
+            logger.warning("Failed to import STK modules: %s. Functionality disabled.", e)
+            return False
+        STKEngine = STKEngineImport
+        IAgScenario = IAgScenarioImport
+        IAgStkObjectRoot = IAgStkObjectRootImport
+        logger.info("STK modules loaded (%s).", _platform)
+        return True
+
+
+@functools.cache
+def stk_objects() -> Any:
+    """Return the `agi.stk12.stkobjects` module (enums), imported on first use; None if unavailable."""
+    if simulated:
+        from .simulation import ENUMS
+
+        return ENUMS
+    if not stk_available:
+        return None
+    try:
+        from agi.stk12 import stkobjects
+    except Exception as e:
+        logger.error("Error importing STK object enums: %s", e)
+        return None
+    return stkobjects
 
 # A type hint for whichever application object is in use
 StkAppType = object | None
@@ -70,8 +124,35 @@ class StkState(BaseModel):
     stk_app: StkAppType = None
     stk_root: object | None = None
     mode: StkMode | None = None
+    # Engine worker pool (engine mode with more than one worker); when set,
+    # stk_app/stk_root stay None in this process and work is dispatched to it.
+    pool: object | None = None
+    # Dedicated thread that owns stk_app/stk_root and runs every STK call
+    executor: object | None = None
+    # Background engine start + warm-up (asyncio.Task) while the server already listens
+    startup: object | None = None
+    # Warm-up timings per engine, as reported by the health resource
+    warmup: list[dict[str, Any]] | None = None
+
+    @property
+    def starting(self) -> bool:
+        """True while the engine is still being started or warmed up in the background."""
+        return self.startup is not None and not self.startup.done()
 
-# Global lock to serialize all STK access across tools/resources
+    @property
+    def ready(self) -> bool:
+        """True when STK work can be dispatched (owned executor or worker pool)."""
+        if self.starting:
+            return False
+        return (self.executor is not None and self.stk_root is not None) or self.pool is not None
+
+    async def wait_started(self) -> None:
+        """Wait for a background start to finish (successfully or not); never cancels it."""
+        if self.starting:
+            await asyncio.wait({self.startup})
+
+# Global lock to serialize all STK access across tools/resources.
+# Held by the in-process STK executor thread while it runs each job.
 STK_LOCK: Lock = Lock()
 
 
@@ -81,66 +162,275 @@ class OperationResult(NamedTuple):
     message: str
     data: Optional[dict] = None
 
-def create_stk_lifespan(mode: StkMode):
+
+async def run_stk(
+    state: StkState,
+    func: Callable[..., Any],
+    /,
+    *args: Any,
+    client: str = "",
+    priority: Priority = Priority.ANALYSIS,
+    deadline_sec: float | None = None,
+    timeout_sec: float | None = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run `func(stk_root, *args, **kwargs)` on the engine serving `client` and await the result.
+
+    The call is executed on the thread that owns the STK root (or on the
+    client's sticky pool worker), never on the event loop. With a worker pool
+    `func` must be a module-level function returning picklable data.
+
+    Jobs are scheduled by `priority` with per-client fair share. A job that
+    has not started within `deadline_sec` (default: the configured deadline
+    for its priority class) fails with `DeadlineExceededError`; a full queue
+    raises `OverloadedError` immediately.
+
+    Each call gets a `CancelToken` that `func` can poll via `current_token()`.
+    It is cancelled when the awaiting task is cancelled (MCP cancellation or a
+    client disconnect) and expires `timeout_sec` (default
+    `STK_MCP_OPERATION_TIMEOUT_SEC`; 0 = none) after submission. Chunked
+    computations stop at the next sub-window; if the job does not return
+    within the timeout plus `STK_MCP_TIMEOUT_GRACE_SEC`, `OperationTimeout`
+    is raised here while the engine finishes its current call.
+    """
+    cfg = get_config()
+    if timeout_sec is None:
+        timeout_sec = cfg.operation_timeout_sec
+    token = CancelToken(timeout_sec or None)
+    if deadline_sec is None:
+        deadline_sec = {
+            Priority.INTERACTIVE: cfg.deadline_interactive_sec,
+            Priority.ANALYSIS: cfg.deadline_analysis_sec,
+            Priority.BULK: cfg.deadline_bulk_sec,
+        }[priority]
+    options = {"priority": priority, "deadline_sec": deadline_sec, "token": token}
+    if state.pool is not None:
+        fut = state.pool.schedule(client, func, args, kwargs, **options)
+    elif state.executor is not None:
+        fut = state.executor.schedule(func, args, kwargs, client=client, **options)
+    else:
+        raise RuntimeError("STK is not initialized.")
+    try:
+        async with asyncio.timeout(timeout_sec + cfg.timeout_grace_sec if timeout_sec else None):
+            return await asyncio.wrap_future(fut)
+    except asyncio.CancelledError:
+        token.cancel()
+        raise
+    except TimeoutError:
+        if fut.done():
+            raise
+        token.cancel()
+        raise OperationTimeout(f"STK operation did not finish within {timeout_sec:g}s.") from None
+
+
+def engine_scope(state: StkState, client: str = "") -> int:
+    """Identify the engine (pool worker index, or 0 in-process) that serves `client`.
+
+    Results and caches keyed by scope never mix data from different engines.
+    """
+    if state.pool is not None:
+        return state.pool.worker_for(client)
+    return 0
+
+
+def engine_samples(state: StkState) -> list[tuple[str, str, str, dict[str, Any], float]]:
+    """Per-engine metric samples (liveness, queue, lock, breaker, retries) from lock-free stats."""
+    from .resilience import RETRY_STATS
+
+    if state.pool is not None:
+        engines = state.pool.stats()
+    elif state.executor is not None:
+        engines = [{"index": 0, **state.executor.stats(), "retries": RETRY_STATS.snapshot()}]
+    else:
+        engines = []
+
+    samples = []
+    for e in engines:
+        labels = {"engine": e["index"]}
+        samples += [
+            ("stk_mcp_engine_up", "gauge", "1 if the STK engine is alive.", labels, float(e["alive"])),
+            ("stk_mcp_engine_queue_depth", "gauge", "STK jobs waiting for the engine.", labels, e["queue_depth"]),
+            ("stk_mcp_engine_lock_held_seconds", "gauge", "Age of the job currently holding the engine lock.",
+             labels, e["lock_held_sec"] or 0.0),
+            ("stk_mcp_breaker_open", "gauge", "1 if the engine circuit breaker is open or half-open.",
+             labels, float(e["breaker"]["state"] != "closed")),
+        ]
+        if e.get("rss_mb") is not None:
+            samples.append(("stk_mcp_engine_rss_bytes", "gauge", "Resident memory of the engine worker process.",
+                            labels, e["rss_mb"] * 2**20))
+        for field, n in e.get("retries", {}).items():
+            samples.append(("stk_mcp_retry_events_total", "counter", "Connect retry events by kind.",
+                            {**labels, "kind": field}, n))
+    return samples
+
+
+def _launch_desktop() -> tuple[Any, Any]:
+    """Attach to (or start) STK Desktop and return `(app, root)` with no scenario open."""
+    if not load_stk_api() or STKDesktop is None:
+        raise RuntimeError("STK Desktop API could not be loaded.")
+    logger.info("   Attempting to attach to existing STK instance...")
+    try:
+        app = STKDesktop.AttachToApplication()
+        logger.info("   Successfully attached to existing STK instance.")
+        app.Visible = True
+    except Exception:
+        logger.info("   Could not attach. Launching new STK instance...")
+        app = STKDesktop.StartApplication(visible=True, userControl=True)
+
+    root = app.Root
+    # Close any open scenario to start clean
+    if root and root.Children.Count > 0:
+        logger.info("   Closing existing scenario '%s'...", root.CurrentScenario.InstanceName)
+        root.CloseScenario()
+    return app, root
+
+
+def _launch_engine() -> tuple[Any, Any]:
+    """Start a new STK Engine instance and return `(app, root)`."""
+    if not load_stk_api():
+        raise RuntimeError("STK Engine API could not be loaded.")
+    logger.info("   Starting new STK Engine instance...")
+    app = STKEngine.StartApplication(noGraphics=True)
+    root = app.NewObjectRoot()
+    logger.info("   STK Engine instance started.")
+    return app, root
+
+
+def _launch_simulated() -> tuple[Any, Any]:
+    """Start the simulated backend and return `(app, root)`."""
+    from .simulation import SimApplication
+
+    enable_simulation()
+    app = SimApplication()
+    logger.info("   Simulated STK backend started.")
+    return app, app.NewObjectRoot()
+
+
+async def _start_engines(state: StkState, mode: StkMode, workers: int) -> None:
+    """Start the executor or engine pool into `state`, then warm each engine up."""
+    from .executor import StkExecutor
+
+    cfg = get_config()
+    pooled = mode in (StkMode.ENGINE, StkMode.SIMULATED)
+    if pooled and (workers > 1 or cfg.engine_supervised):
+        # --- Engine Pool Logic (also used for one supervised engine) ---
+        from .pool import EnginePool
+
+        logger.info("   Starting pool of %d STK Engine workers...", workers)
+        state.pool = EnginePool(
+            workers, start_timeout=cfg.engine_start_timeout_sec, simulated=mode == StkMode.SIMULATED,
+        )
+        try:
+            await asyncio.to_thread(state.pool.start)
+        except Exception:
+            state.pool = None
+            raise
+        logger.info("   STK Engine pool started.")
+    else:
+        # --- Desktop/Engine Mode Logic (single owned STK thread) ---
+        if cfg.engine_supervised:
+            logger.warning("   Engine supervision needs engine mode; running STK Desktop unsupervised.")
+        launcher = {
+            StkMode.DESKTOP: _launch_desktop,
+            StkMode.ENGINE: _launch_engine,
+            StkMode.SIMULATED: _launch_simulated,
+        }[mode]
+        state.executor = StkExecutor(lock=STK_LOCK)
+        await asyncio.wrap_future(state.executor.start(launcher))
+        state.stk_app = state.executor.app
+        state.stk_root = state.executor.root
+
+    if not cfg.engine_warmup:
+        return
+    from .warmup import warm_up_engine
+
+    if state.pool is not None:
+        futures = state.pool.broadcast(warm_up_engine, priority=Priority.INTERACTIVE)
+    else:
+        futures = [state.executor.schedule(warm_up_engine, priority=Priority.INTERACTIVE)]
+    results = await asyncio.gather(*(asyncio.wrap_future(f) for f in futures), return_exceptions=True)
+    state.warmup = []
+    for index, res in enumerate(results):
+        if isinstance(res, Exception):
+            # A failed warm-up only costs the first request its cold start
+            logger.warning("   STK engine %d warm-up failed: %s", index, res)
+            res = {"error": str(res)}
+        state.warmup.append({"engine": index, **res})
+
+
+def create_stk_lifespan(mode: StkMode, workers: int | None = None):
     """
     A factory that returns an async context manager for the STK lifecycle.
+
+    In engine mode, `workers` > 1 (or any `STK_MCP_ENGINE_*` supervision
+    setting) starts a pool of engine worker processes instead of a single
+    in-process engine (simulated mode pools the same way). Otherwise the application is
+    started on, and owned by, a dedicated `StkExecutor` thread.
+
+    With `STK_MCP_ENGINE_BACKGROUND_START` (default) the lifespan yields at
+    once and the engine starts in the background, so the server accepts
+    connections immediately; requests arriving meanwhile wait for it. Each
+    engine then runs a warm-up pass (`warmup.warm_up_engine`).
     """
+    if workers is None:
+        workers = get_config().engine_workers
+
     @asynccontextmanager
-    async def stk_lifespan_manager(server: FastMCP) -> AsyncIterator[StkState]:
+    async def stk_lifespan_manager(server: "FastMCP") -> AsyncIterator[StkState]:
         """
         Manages the STK application lifecycle based on the selected mode.
         """
-        if not stk_available or IAgStkObjectRoot is None:
+        if mode == StkMode.SIMULATED:
+            enable_simulation()
+        elif not stk_available:
             logger.warning("STK is not available. MCP server will run without STK functionality.")
             yield StkState(mode=mode)
             return
 
         logger.info("MCP Server Startup: Initializing STK in '%s' mode...", mode.value)
         state = StkState(mode=mode)
-        
+
         try:
-            if mode == StkMode.DESKTOP:
-                # --- Desktop Mode Logic ---
-                logger.info("   Attempting to attach to existing STK instance...")
-                try:
-                    state.stk_app = STKDesktop.AttachToApplication()
-                    logger.info("   Successfully attached to existing STK instance.")
-                    state.stk_app.Visible = True
-                except Exception:
-                    logger.info("   Could not attach. Launching new STK instance...")
-                    state.stk_app = STKDesktop.StartApplication(visible=True, userControl=True)
-                
-                state.stk_root = state.stk_app.Root
-                # Close any open scenario to start clean
-                if state.stk_root and state.stk_root.Children.Count > 0:
-                     logger.info("   Closing existing scenario '%s'...", state.stk_root.CurrentScenario.InstanceName)
-                     state.stk_root.CloseScenario()
-
-            elif mode == StkMode.ENGINE:
-                # --- Engine Mode Logic ---
-                logger.info("   Starting new STK Engine instance...")
-                state.stk_app = STKEngine.StartApplication(noGraphics=True)
-                state.stk_root = state.stk_app.NewObjectRoot()
-                logger.info("   STK Engine instance started.")
-
-            if state.stk_root is None:
-                raise RuntimeError("Failed to obtain STK Root object.")
-
-            logger.info("STK Initialized. Providing STK context to tools.")
-            yield state
+            if get_config().engine_background_start:
+                async def start_in_background() -> None:
+                    try:
+                        await _start_engines(state, mode, workers)
+                    except Exception as e:
+                        logger.exception("Failed to initialize STK in %s mode: %s", mode.value, e)
+                        return
+                    logger.info("STK Initialized in the background.")
+
+                state.startup = asyncio.create_task(start_in_background(), name="stk-startup")
+                logger.info("Starting STK in the background; the server is accepting connections.")
+            else:
+                await _start_engines(state, mode, workers)
+                if not state.ready:
+                    raise RuntimeError("Failed to obtain STK Root object.")
+                logger.info("STK Initialized. Providing STK context to tools.")
+
+            collector = lambda: engine_samples(state)  # noqa: E731
+            METRICS.add_collector(collector)
+            try:
+                yield state
+            finally:
+                METRICS.remove_collector(collector)
 
         except Exception as e:
             logger.exception("FATAL: Failed to initialize STK in %s mode: %s", mode.value, e)
             yield StkState(mode=mode) # Yield empty state on failure
-        
+
         finally:
             logger.info("MCP Server Shutdown: Cleaning up STK (%s mode)...", mode.value)
-            if state.stk_app:
-                try:
-                    state.stk_app.Close()
-                    logger.info("   STK Application/Engine Closed.")
-                except Exception as quit_e:
-                    logger.warning("   Error closing STK: %s", quit_e)
+            if state.starting:
+                state.startup.cancel()
+                await asyncio.wait({state.startup})
+            if state.pool is not None:
+                await asyncio.to_thread(state.pool.close)
+                logger.info("   STK Engine pool closed.")
+            if state.executor is not None:
+                # Queued jobs drain first; the application is closed on its own thread
+                await asyncio.to_thread(state.executor.close)
             logger.info("STK Cleanup Complete.")
 
     return stk_lifespan_manager
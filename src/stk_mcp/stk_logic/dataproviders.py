@@ -0,0 +1,71 @@
+"""
+Resolved data-provider handles, kept per engine.
+
+Reaching a data provider costs several round trips into STK:
+`GetObjectFromPath`, `DataProviders.Item(provider)` and, for grouped
+providers, `Group.Item(group)`. Reports ask for the same few providers on
+the same objects over and over, so the resolved handle is kept per
+(object path, provider, group) and reused; only `ExecElements` then crosses
+into STK. Handles belong to the open scenario and are dropped whenever it
+is closed, created, loaded or switched (like the object registry, one store
+per engine).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from .config import get_config
+from .core import IAgStkObjectRoot
+
+
+def split_provider_path(path: str) -> tuple[str, str | None]:
+    """'LLA State/Fixed' -> ('LLA State', 'Fixed'); 'Beta Angle' -> ('Beta Angle', None)."""
+    provider, _, group = (path or "").strip().partition("/")
+    provider, group = provider.strip(), group.strip()
+    if not provider:
+        raise ValueError("provider must be a data provider name, optionally followed by '/<group>'.")
+    return provider, group or None
+
+
+class DataProviderHandles:
+    """LRU of `DataProviders.Item(...)[.Group.Item(...)]` handles keyed by (path, provider, group)."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._handles: OrderedDict[tuple[str, str, str | None], Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, stk_root: IAgStkObjectRoot, path: str, provider: str, group: str | None = None) -> Any:
+        """The handle for `provider` (and `group`) of the object at `path`, resolving it on first use."""
+        key = (path, provider, group)
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is not None:
+                self._handles.move_to_end(key)
+                self.hits += 1
+                return handle
+            self.misses += 1
+        dp = stk_root.GetObjectFromPath(path).DataProviders.Item(provider)
+        handle = dp.Group.Item(group) if group else dp
+        if self.max_entries > 0:
+            with self._lock:
+                self._handles[key] = handle
+                while len(self._handles) > self.max_entries:
+                    self._handles.popitem(last=False)
+        return handle
+
+    def clear(self) -> None:
+        """Forget every handle (the scenario they belong to is closing)."""
+        with self._lock:
+            self._handles.clear()
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+
+DP_HANDLES = DataProviderHandles(get_config().report_handle_cache_max)
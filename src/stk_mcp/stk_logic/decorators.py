@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from functools import wraps
-from typing import Callable, Any, TypeVar, ParamSpec
+from typing import Awaitable, Callable, Any, TypeVar, ParamSpec
 
 from mcp.server.fastmcp import Context
 from mcp.server.fastmcp.exceptions import ResourceError
 
-from .core import stk_available
+from . import core
+from .metrics import METRICS
+from .serialization import encode_response
 
 logger = logging.getLogger(__name__)
 
@@ -15,41 +18,89 @@ P = ParamSpec("P")
 T = TypeVar("T")
 
 
-def require_stk_tool(func: Callable[P, T]) -> Callable[P, T]:
-    """Ensure STK is available and initialized for MCP tools.
+def client_key(ctx: Context) -> str:
+    """Return a stable key identifying the MCP client behind `ctx`.
 
-    Returns a user-friendly error string if unavailable.
+    Used for sticky routing to engine pool workers. Prefers the client id sent
+    with the request and falls back to the identity of the session.
+    """
+    client_id = ctx.client_id
+    if client_id:
+        return str(client_id)
+    return f"session-{id(ctx.session)}"
+
+
+async def _tracked(handler: str, call: Awaitable[T]) -> T:
+    """Await `call` while counting it in the in-flight gauge and request counter."""
+    METRICS.inc("stk_mcp_requests_in_flight", 1)
+    outcome = "error"
+    try:
+        result = await call
+        outcome = "ok"
+        return result
+    finally:
+        METRICS.inc("stk_mcp_requests_in_flight", -1)
+        METRICS.inc("stk_mcp_requests_total", handler=handler, outcome=outcome)
+
+
+def require_stk_tool(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    """Ensure STK is available and initialized for async MCP tools.
+
+    Returns a user-friendly error string if unavailable. While the engine is
+    still starting in the background, waits for it first.
     Expects first parameter to be `ctx: Context`.
     """
 
     @wraps(func)
-    def wrapper(ctx: Context, *args: P.args, **kwargs: P.kwargs) -> T:  # type: ignore[override]
+    async def wrapper(ctx: Context, *args: P.args, **kwargs: P.kwargs) -> T:  # type: ignore[override]
         lifespan_ctx = ctx.request_context.lifespan_context
 
-        if not stk_available:
+        if not core.stk_available:
             return "Error: STK is not available on this system."  # type: ignore[return-value]
-        if not lifespan_ctx or not lifespan_ctx.stk_root:
+        if lifespan_ctx:
+            await lifespan_ctx.wait_started()
+        if not lifespan_ctx or not lifespan_ctx.ready:
             return "Error: STK Root not available. Initialize via server lifespan."  # type: ignore[return-value]
 
-        return func(ctx, *args, **kwargs)
+        return await _tracked(func.__name__, func(ctx, *args, **kwargs))
 
     return wrapper
 
 
-def require_stk_resource(func: Callable[P, T]) -> Callable[P, T]:
-    """Ensure STK is available and initialized for MCP resources.
+def require_stk_resource(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    """Ensure STK is available and initialized for async MCP resources.
 
-    Raises ResourceError if unavailable. Expects first parameter `ctx: Context`.
+    Raises ResourceError if unavailable; waits for a background engine start
+    first. Expects first parameter `ctx: Context`.
     """
 
     @wraps(func)
-    def wrapper(ctx: Context, *args: P.args, **kwargs: P.kwargs) -> T:  # type: ignore[override]
+    async def wrapper(ctx: Context, *args: P.args, **kwargs: P.kwargs) -> T:  # type: ignore[override]
         lifespan_ctx = ctx.request_context.lifespan_context
-        if not stk_available:
+        if not core.stk_available:
             raise ResourceError("STK is not available on this system.")
-        if not lifespan_ctx or not lifespan_ctx.stk_root:
+        if lifespan_ctx:
+            await lifespan_ctx.wait_started()
+        if not lifespan_ctx or not lifespan_ctx.ready:
             raise ResourceError("STK Root not available. Initialize via server lifespan.")
-        return func(ctx, *args, **kwargs)
+        return await _tracked(func.__name__, func(ctx, *args, **kwargs))
 
     return wrapper
 
+
+def json_response(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T | str]]:
+    """Serialize dict/list results once with `serialization.encode_response`.
+
+    Strings (error messages) pass through. Encoding runs on a worker thread so
+    large results do not stall the event loop. Register tools using this with
+    `structured_output=False`, so FastMCP does not also build a pydantic copy.
+    """
+
+    @wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T | str:
+        result = await func(*args, **kwargs)
+        if isinstance(result, (dict, list)):
+            return await asyncio.to_thread(encode_response, result)
+        return result
+
+    return wrapper
@@ -0,0 +1,100 @@
+"""
+Encodings for tabular data-provider output.
+
+- "records": list of per-sample dicts (the original, most verbose format)
+- "columns": parallel arrays keyed by column name
+- "binary": base64 little-endian blobs per column, decodable with
+  `numpy.frombuffer(base64.b64decode(blob), dtypes[name])`
+
+The binary `dtype` ("float64" or "float32") applies to value columns only.
+Index columns (`obj`, `sat`, `pair`) are sent as int32 and time columns
+(`time`, `start`, `stop`, "... Time") as float64: float32 rounds a time
+100 days from the epoch to the nearest second.
+
+Columnar and binary outputs are built straight from the `GetValues()` arrays
+without creating one Python object per sample.
+"""
+
+from __future__ import annotations
+
+import base64
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+
+FORMATS = ("records", "columns", "binary")
+DTYPES = {"float64": "<f8", "float32": "<f4"}
+INDEX_COLUMNS = frozenset({"obj", "sat", "pair"})
+_TIME_COLUMNS = frozenset({"time", "start", "stop"})
+
+
+def column_dtype(name: str, dtype: str = "float64") -> str:
+    """NumPy type string of column `name` in a "binary" payload of `dtype` values."""
+    if name in INDEX_COLUMNS:
+        return "<i4"
+    lowered = name.lower()
+    if lowered in _TIME_COLUMNS or lowered.endswith(" time"):
+        return "<f8"
+    return DTYPES[dtype]
+
+
+def validate_format(fmt: str, dtype: str = "float64") -> None:
+    """Raise ValueError for an unknown format or dtype."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Use one of: {', '.join(FORMATS)}.")
+    if dtype not in DTYPES:
+        raise ValueError(f"Unknown dtype '{dtype}'. Use one of: {', '.join(DTYPES)}.")
+
+
+def encode_columns(
+    columns: Mapping[str, Sequence[Any]],
+    fmt: str = "columns",
+    dtype: str = "float64",
+) -> dict[str, Any]:
+    """Encode equally long numeric columns as "records", "columns" or "binary".
+
+    Returns a dict with `format`, `length` and either `records` or `columns`
+    (plus `dtype`, per-column `dtypes` and `encoding` for binary).
+    """
+    validate_format(fmt, dtype)
+    length = len(next(iter(columns.values()), ()))
+
+    if fmt == "records":
+        names = list(columns)
+        return {
+            "format": fmt,
+            "length": length,
+            "records": [dict(zip(names, row)) for row in zip(*columns.values())],
+        }
+
+    if fmt == "columns":
+        return {
+            "format": fmt,
+            "length": length,
+            "columns": {
+                name: np.asarray(values, dtype=np.float64).tolist() for name, values in columns.items()
+            },
+        }
+
+    dtypes = {name: column_dtype(name, dtype) for name in columns}
+    return {
+        "format": fmt,
+        "length": length,
+        "dtype": DTYPES[dtype],
+        "dtypes": dtypes,
+        "encoding": "base64",
+        "columns": {
+            name: base64.b64encode(np.asarray(values, dtype=dtypes[name]).tobytes()).decode("ascii")
+            for name, values in columns.items()
+        },
+    }
+
+
+def decode_binary_columns(payload: Mapping[str, Any]) -> dict[str, np.ndarray]:
+    """Decode the `columns` of a "binary" payload back into NumPy arrays."""
+    dtypes = payload.get("dtypes") or {}
+    return {
+        name: np.frombuffer(base64.b64decode(blob), dtype=np.dtype(dtypes.get(name, payload["dtype"])))
+        for name, blob in payload["columns"].items()
+    }
@@ -0,0 +1,266 @@
+"""
+Dedicated STK executor thread.
+
+All calls into an STK root go through one long-lived thread that owns the
+application (respecting COM apartment affinity on Windows). MCP handlers stay
+on the asyncio event loop and await `concurrent.futures.Future` results via
+`asyncio.wrap_future`, so a long STK call never blocks handshakes, listing or
+cancellation.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from .cancellation import CancelToken, OperationCancelled, OperationTimeout, using_token
+from .config import get_config
+from .metrics import METRICS
+from .resilience import CircuitBreaker
+from .scheduler import DeadlineExceededError, JobScheduler, OverloadedError, Priority
+
+logger = logging.getLogger(__name__)
+
+Launcher = Callable[[], tuple[Any, Any]]
+
+
+def _com_initialize() -> Callable[[], None] | None:
+    """Initialize COM for the current thread on Windows; return the matching uninitializer."""
+    try:
+        import pythoncom  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    pythoncom.CoInitialize()
+    return pythoncom.CoUninitialize
+
+
+class StkExecutor:
+    """Runs STK jobs one at a time on a single dedicated thread.
+
+    Jobs are submitted as `func` plus arguments and executed as
+    `func(root, *args, **kwargs)`. The root is created on the executor thread
+    by the `launcher` passed to `start()` and closed there on `close()`.
+    Each job runs while holding `lock`. Jobs are ordered by a `JobScheduler`
+    (priority class, per-client round-robin, start deadlines, bounded queue),
+    and a circuit breaker rejects new jobs after repeated transient failures
+    (see `resilience.CircuitBreaker`).
+    """
+
+    def __init__(
+        self,
+        name: str = "stk-executor",
+        lock: threading.Lock | None = None,
+        max_pending: int | None = None,
+    ) -> None:
+        self.name = name
+        self.lock = lock or threading.Lock()
+        self.app: Any = None
+        self.root: Any = None
+        self._launcher: Launcher | None = None
+        if max_pending is None:
+            max_pending = get_config().queue_max_pending
+        self._jobs: JobScheduler[
+            tuple[Future, float, Callable[..., Any], tuple, dict, CancelToken | None, bool]
+        ] = JobScheduler(max_pending)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._ready: Future = Future()
+        self._busy_since: float | None = None
+        self._submitted_at: float | None = None
+        self.breaker = CircuitBreaker()
+
+    # --- Introspection -------------------------------------------------
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting to start."""
+        return self._jobs.qsize()
+
+    @property
+    def busy_for(self) -> float | None:
+        """Seconds the current job has been running, or None when idle."""
+        since = self._busy_since
+        return None if since is None else time.perf_counter() - since
+
+    @property
+    def alive(self) -> bool:
+        """True while the thread runs and the application started successfully."""
+        return (
+            self._thread.is_alive()
+            and self._ready.done()
+            and self._ready.exception() is None
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Lock-free snapshot for health probes (reads plain attributes only)."""
+        busy = self.busy_for
+        submitted = self._submitted_at
+        return {
+            "alive": self.alive,
+            "starting": self._thread.is_alive() and not self._ready.done(),
+            "queue_depth": self.pending,
+            "lock_held_sec": busy,
+            "current_operation_age_sec": (
+                None if busy is None or submitted is None else time.perf_counter() - submitted
+            ),
+            "breaker": self.breaker.stats(),
+            **self._jobs.stats(),
+        }
+
+    # --- Lifecycle -----------------------------------------------------
+
+    def start(self, launcher: Launcher | None = None) -> Future:
+        """Start the thread; the returned future resolves once `launcher` has run."""
+        self._launcher = launcher
+        self._thread.start()
+        return self._ready
+
+    def close(self, timeout: float = 60.0) -> None:
+        """Stop accepting work, let queued jobs drain, then shut the application down."""
+        self._jobs.close()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    # --- Work ----------------------------------------------------------
+
+    def submit(self, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """Queue `func(root, *args, **kwargs)` with default scheduling and return a future."""
+        return self.schedule(func, args, kwargs)
+
+    def schedule(
+        self,
+        func: Callable[..., Any],
+        args: tuple = (),
+        kwargs: dict | None = None,
+        *,
+        priority: Priority = Priority.ANALYSIS,
+        client: str = "",
+        deadline_sec: float | None = None,
+        token: CancelToken | None = None,
+    ) -> Future:
+        """Queue `func(root, *args, **kwargs)` in `priority`'s class for `client`.
+
+        If the job has not started within `deadline_sec`, its future fails with
+        `DeadlineExceededError` and it never runs. `token` is made the job's
+        `current_token()`; a job whose token stopped before it started is not run.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            OverloadedError: If the queue is full.
+            RuntimeError: If the engine is shutting down.
+        """
+        fut: Future = Future()
+        deadline = None if not deadline_sec else time.monotonic() + deadline_sec
+        trial = self.breaker.check()
+        try:
+            self._jobs.put(
+                (fut, time.perf_counter(), func, args, kwargs or {}, token, trial), priority, client, deadline,
+            )
+        except BaseException as e:
+            # The job was never queued (full, or the scheduler is closed); hand a trial slot back
+            if trial:
+                self.breaker.release()
+            if isinstance(e, OverloadedError):
+                METRICS.inc("stk_mcp_scheduler_rejected_total", engine=self.name, reason="overloaded")
+            raise
+        return fut
+
+    def _startup(self) -> None:
+        if self._launcher is not None:
+            self.app, self.root = self._launcher()
+
+    def _shutdown(self) -> None:
+        from .parked import PARKED
+
+        # Parked scenarios die with the engine; remove their saves
+        PARKED.clear()
+        if self.app is not None:
+            try:
+                self.app.Close()
+                logger.info("   STK Application/Engine Closed.")
+            except Exception as e:
+                logger.warning("   Error closing STK: %s", e)
+
+    def _execute(self, func: Callable[..., Any], args: tuple, kwargs: dict, token: CancelToken | None) -> Any:
+        with using_token(token):
+            return func(self.root, *args, **kwargs)
+
+    def _refusal(
+        self,
+        submitted_at: float,
+        expired: bool,
+        startup_error: Exception | None,
+        token: CancelToken | None,
+    ) -> Exception | None:
+        """The error failing a dequeued job that must not run, or None if it can run."""
+        if expired:
+            METRICS.inc("stk_mcp_scheduler_rejected_total", engine=self.name, reason="deadline")
+            return DeadlineExceededError(
+                f"Request waited {time.perf_counter() - submitted_at:.1f}s for STK and passed its deadline."
+            )
+        if startup_error is not None:
+            return RuntimeError(f"STK failed to start: {startup_error}")
+        if token is not None and token.stopped:
+            return (
+                OperationCancelled("Request was cancelled before it started.") if token.cancelled
+                else OperationTimeout("Request timed out before it started.")
+            )
+        return None
+
+    def _after_job(self) -> None:
+        """Hook run on the executor thread after each job, outside the lock (engine upkeep)."""
+
+    def _run(self) -> None:
+        uninit = _com_initialize()
+        try:
+            try:
+                self._startup()
+            except Exception as e:
+                self._ready.set_exception(e)
+                startup_error: Exception | None = e
+            else:
+                self._ready.set_result(None)
+                startup_error = None
+
+            while True:
+                got = self._jobs.get()
+                if got is None:
+                    break
+                (fut, submitted_at, func, args, kwargs, token, trial), expired = got
+                cancelled = not fut.set_running_or_notify_cancel()
+                refused = None if cancelled else self._refusal(submitted_at, expired, startup_error, token)
+                if cancelled or refused is not None:
+                    # The job never reaches the engine; hand a half-open trial slot back
+                    if trial:
+                        self.breaker.release()
+                    if refused is not None:
+                        fut.set_exception(refused)
+                    continue
+                with self.lock:
+                    self._submitted_at = submitted_at
+                    self._busy_since = time.perf_counter()
+                    METRICS.observe("stk_mcp_lock_wait_seconds", self._busy_since - submitted_at, engine=self.name)
+                    try:
+                        result = self._execute(func, args, kwargs, token)
+                    except Exception as e:
+                        self.breaker.record(e)
+                        fut.set_exception(e)
+                    else:
+                        self.breaker.record(None)
+                        fut.set_result(result)
+                    finally:
+                        METRICS.observe(
+                            "stk_mcp_lock_hold_seconds", time.perf_counter() - self._busy_since, engine=self.name
+                        )
+                        self._busy_since = None
+                        self._submitted_at = None
+                try:
+                    self._after_job()
+                except Exception as e:  # pragma: no cover - upkeep must never stop the loop
+                    logger.exception("%s: post-job upkeep failed: %s", self.name, e)
+        finally:
+            self._shutdown()
+            if uninit is not None:
+                uninit()
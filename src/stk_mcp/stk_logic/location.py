@@ -1,20 +1,33 @@
 from __future__ import annotations
 
 import logging
-from typing import Literal
+from typing import Any, Literal
 
-from .core import stk_available, IAgStkObjectRoot, IAgScenario
-from .utils import timed_operation, safe_stk_command
+from . import core
+from .accesses import ACCESSES
+from .core import stk_objects, IAgStkObjectRoot, IAgScenario
+from .registry import REGISTRY
+from .utils import ConnectBatch, timed_operation, safe_stk_command
 
 logger = logging.getLogger(__name__)
 
-try:
-    # Enums are available on both Desktop and Engine
-    from agi.stk12.stkobjects import AgESTKObjectType
-    enums_available = True
-except Exception:
-    AgESTKObjectType = None  # type: ignore[assignment]
-    enums_available = False
+
+def validate_location(
+    latitude_deg: float,
+    longitude_deg: float,
+    altitude_km: float,
+    kind: str,
+) -> str | None:
+    """Return the reason a location is invalid, or None if it is acceptable."""
+    if not (-90.0 <= latitude_deg <= 90.0):
+        return "latitude_deg must be within [-90, 90] degrees."
+    if not (-180.0 <= longitude_deg <= 180.0):
+        return "longitude_deg must be within [-180, 180] degrees."
+    if altitude_km < -0.5:
+        return "altitude_km must be >= -0.5 km."
+    if kind.lower() not in ("facility", "place"):
+        return "kind must be 'facility' or 'place'."
+    return None
 
 
 @timed_operation
@@ -37,16 +50,19 @@ def create_location_internal(
     Returns:
         tuple[bool, str, object | None]: (success, message, created_or_found_object)
     """
-    if not stk_available or not stk_root or not scenario:
+    if not core.stk_available or not stk_root or not scenario:
         return False, "STK Root/Scenario is not available.", None
 
     kind = kind.lower().strip()
     if kind not in ("facility", "place"):
         return False, "Invalid kind. Use 'facility' or 'place'.", None
 
-    if not enums_available:
+    # Enums are available on both Desktop and Engine
+    stkobjects = stk_objects()
+    if stkobjects is None:
         return False, "STK enums not available; cannot create object.", None
 
+    AgESTKObjectType = stkobjects.AgESTKObjectType
     obj_type = (
         AgESTKObjectType.eFacility if kind == "facility" else AgESTKObjectType.ePlace
     )
@@ -73,8 +89,72 @@ def create_location_internal(
             )
             safe_stk_command(stk_root, cmd)
 
+        REGISTRY.add("Facility" if kind == "facility" else "Place", name)
+        ACCESSES.discard(f"*/{'Facility' if kind == 'facility' else 'Place'}/{name}")
         action = "created" if created else "updated"
         return True, f"Successfully {action} {kind}: '{name}'", obj
     except Exception as e:
         logger.error("Error creating %s '%s': %s", kind, name, e)
         return False, f"Error creating {kind} '{name}': {e}", None
+
+
+@timed_operation
+def create_locations_batch_internal(
+    stk_root: IAgStkObjectRoot,
+    rows: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """
+    Create or update many ground locations in one STK job.
+
+    Each row is `{row, name, latitude_deg, longitude_deg, altitude_km, kind}`
+    and is assumed to be validated already. Existence checks use the object
+    registry instead of one `Children.Contains` call per row, and positions that
+    need the Connect fallback are sent as one command batch. A failing row is
+    reported and does not stop the batch.
+
+    Returns:
+        list[dict]: `{row, name, ok, action}` or `{row, name, ok, error}` per input row.
+    """
+    if not core.stk_available or not stk_root:
+        raise RuntimeError("STK Root is not available.")
+    stkobjects = stk_objects()
+    if stkobjects is None:
+        raise RuntimeError("STK enums not available; cannot create objects.")
+    AgESTKObjectType = stkobjects.AgESTKObjectType
+    scenario = stk_root.CurrentScenario
+    if scenario is None:
+        raise RuntimeError("No active scenario found. Use 'setup_scenario' first.")
+
+    REGISTRY.ensure(stk_root)
+    children = scenario.Children
+    results: list[dict[str, Any]] = []
+    # Rows whose position must be set via Connect, sent together at the end
+    fallback = ConnectBatch(stk_root)
+    fallback_rows: list[int] = []
+    for r in rows:
+        name = r["name"]
+        kind = r["kind"]
+        class_name = "Facility" if kind == "facility" else "Place"
+        obj_type = AgESTKObjectType.eFacility if kind == "facility" else AgESTKObjectType.ePlace
+        try:
+            exists = REGISTRY.contains(class_name, name)
+            obj = children.Item(name) if exists else children.New(obj_type, name)
+            REGISTRY.add(class_name, name)
+            ACCESSES.discard(f"*/{class_name}/{name}")
+            results.append({"row": r["row"], "name": name, "ok": True, "action": "updated" if exists else "created"})
+            try:
+                obj.Position.AssignGeodetic(r["latitude_deg"], r["longitude_deg"], r["altitude_km"])
+            except Exception:
+                fallback.add(
+                    f"SetPosition */{class_name}/{name} Geodetic "
+                    f"{r['latitude_deg']} {r['longitude_deg']} {r['altitude_km']} km"
+                )
+                fallback_rows.append(len(results) - 1)
+        except Exception as e:
+            results.append({"row": r["row"], "name": name, "ok": False, "error": str(e)})
+
+    for i, reply in zip(fallback_rows, fallback.execute()):
+        if not reply.ok:
+            res = results[i]
+            results[i] = {"row": res["row"], "name": res["name"], "ok": False, "error": reply.error}
+    return results
@@ -0,0 +1,179 @@
+"""
+Prometheus-style metrics for the STK-MCP server.
+
+`METRICS` holds counters, gauges and histograms keyed by metric name and
+label values, and renders them in the Prometheus text exposition format.
+Point-in-time values that already live elsewhere (cache statistics, queue
+depth, breaker state) are added at render time by collectors.
+
+Observations made inside engine worker processes are forwarded to the parent
+with each job reply (`drain()` / `replay()`), so the parent's `METRICS` covers
+the whole pool.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+
+# Seconds; covers quick object-model calls up to long access/report jobs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# name -> (type, help)
+DEFINITIONS: dict[str, tuple[str, str]] = {
+    "stk_mcp_operation_seconds": ("histogram", "Duration of STK operations (timed_operation)."),
+    "stk_mcp_operation_errors_total": ("counter", "STK operations that raised, by error class."),
+    "stk_mcp_lock_wait_seconds": ("histogram", "Time STK jobs waited in the engine queue before taking the lock."),
+    "stk_mcp_lock_hold_seconds": ("histogram", "Time STK jobs held the engine lock."),
+    "stk_mcp_scheduler_rejected_total": ("counter", "STK jobs rejected by the scheduler (queue full or deadline passed)."),
+    "stk_mcp_engine_recycles_total": ("counter", "STK engines replaced by the supervisor, by reason and source."),
+    "stk_mcp_requests_in_flight": ("gauge", "MCP tool/resource requests currently being handled."),
+    "stk_mcp_requests_total": ("counter", "MCP tool/resource requests handled, by outcome."),
+}
+
+Labels = tuple[tuple[str, str], ...]
+# (name, kind, help, labels, value) as returned by collectors
+Sample = tuple[str, str, str, dict[str, Any], float]
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(labels: Iterable[tuple[str, str]]) -> str:
+    parts = []
+    for k, v in labels:
+        v = v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, n: int) -> None:
+        self.counts = [0] * n
+        self.sum = 0.0
+        self.count = 0
+
+
+class Metrics:
+    """Thread-safe metric store with Prometheus text rendering."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, Labels], float] = {}
+        self._hists: dict[tuple[str, Labels], _Histogram] = {}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+        # Set in engine worker processes: keep raw events for the parent
+        self.forward = False
+        self._pending: list[tuple[str, str, Labels, float]] = []
+
+    # --- Recording -----------------------------------------------------
+
+    def inc(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        """Add `amount` to a counter (or a gauge, for in-flight style tracking)."""
+        self._record("inc", name, _labels(labels), amount)
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        self._record("set", name, _labels(labels), value)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record one histogram observation (seconds)."""
+        self._record("observe", name, _labels(labels), value)
+
+    def _record(self, op: str, name: str, labels: Labels, value: float) -> None:
+        key = (name, labels)
+        with self._lock:
+            if op == "observe":
+                h = self._hists.get(key)
+                if h is None:
+                    h = self._hists[key] = _Histogram(len(self.buckets))
+                for i, bound in enumerate(self.buckets):
+                    if value <= bound:
+                        h.counts[i] += 1
+                h.sum += value
+                h.count += 1
+            elif op == "inc":
+                self._values[key] = self._values.get(key, 0.0) + value
+            else:
+                self._values[key] = value
+            if self.forward:
+                self._pending.append((op, name, labels, value))
+
+    def drain(self) -> list[tuple[str, str, Labels, float]]:
+        """Return and clear events recorded since the last drain (worker side)."""
+        with self._lock:
+            events, self._pending = self._pending, []
+        return events
+
+    def replay(self, events: Iterable[tuple[str, str, Labels, float]]) -> None:
+        """Apply events drained in another process (parent side)."""
+        for op, name, labels, value in events:
+            self._record(op, name, labels, value)
+
+    # --- Collectors ----------------------------------------------------
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Register a callable producing samples at render time."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    # --- Output --------------------------------------------------------
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            values = dict(self._values)
+            hists = {k: (list(h.counts), h.sum, h.count) for k, h in self._hists.items()}
+            collectors = list(self._collectors)
+
+        # name -> (kind, help, [lines])
+        families: dict[str, tuple[str, str, list[str]]] = {}
+
+        def family(name: str, kind: str | None = None, help_: str | None = None) -> list[str]:
+            if name not in families:
+                d_kind, d_help = DEFINITIONS.get(name, (kind or "untyped", help_ or name))
+                families[name] = (d_kind, d_help, [])
+            return families[name][2]
+
+        for (name, labels), v in sorted(values.items()):
+            family(name).append(f"{name}{_fmt_labels(labels)} {_fmt_value(v)}")
+
+        for (name, labels), (counts, total, count) in sorted(hists.items()):
+            lines = family(name)
+            for bound, n in zip(self.buckets, counts):
+                lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', _fmt_value(bound)),))} {n}")
+            lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_value(total)}")
+            lines.append(f"{name}_count{_fmt_labels(labels)} {count}")
+
+        for collector in collectors:
+            for name, kind, help_, labels, v in collector():
+                if v is None:
+                    continue
+                family(name, kind, help_).append(f"{name}{_fmt_labels(_labels(labels))} {_fmt_value(v)}")
+
+        out: list[str] = []
+        for name, (kind, help_, lines) in families.items():
+            out.append(f"# HELP {name} {help_}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(lines)
+        return "\n".join(out) + "\n"
+
+
+METRICS = Metrics()
@@ -3,20 +3,14 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
-from .core import stk_available, IAgStkObjectRoot
-from .utils import safe_exec_lines, timed_operation
+from . import core
+from .core import IAgStkObjectRoot
+from .registry import REGISTRY
+from .utils import exec_batch, timed_operation
 
 logger = logging.getLogger(__name__)
 
 
-def _exec_lines(stk_root: IAgStkObjectRoot, cmd: str) -> list[str]:
-    """
-    Execute an STK Connect command and return the result lines.
-    Safe helper that returns an empty list on failure.
-    """
-    return safe_exec_lines(stk_root, cmd)
-
-
 def _parse_all_instance_names(lines: list[str]) -> list[tuple[str, str]]:
     """
     Parse lines returned by the "AllInstanceNames" Connect command.
@@ -114,6 +108,42 @@ def _normalize_filter(filter_type: str) -> set[str] | None:
     return mapping.get(t)
 
 
+def _list_objects_connect(
+    stk_root: IAgStkObjectRoot,
+    normalized: set[str] | None,
+) -> list[dict[str, str]]:
+    """Enumerate objects with `AllInstanceNames` Connect commands, one per class,
+    sent to STK as a single batch.
+
+    Fallback for when the Object Model walk used by the registry fails.
+    """
+    # (command, expected type) pairs, all sent in one batch
+    queries: list[tuple[str, str]] = []
+
+    # Top-level classes
+    for cls in _TOP_LEVEL_CLASSES:
+        if normalized is not None and cls not in normalized:
+            continue
+        queries.append((f"AllInstanceNames */{cls}", cls))
+
+    # Sensors (nested under multiple parents)
+    # Only include if no filter, or if filter explicitly asks for sensors
+    if normalized is None or ("Sensor" in normalized):
+        for parent in _SENSOR_PARENTS:
+            queries.append((f"AllInstanceNames */{parent}/*/Sensor", "Sensor"))
+
+    results: list[dict[str, str]] = []
+    replies = exec_batch(stk_root, [cmd for cmd, _ in queries])
+    for (cmd, expected_type), reply in zip(queries, replies):
+        if not reply.ok:
+            logger.debug("Connect command failed: %s", cmd)
+            continue
+        for _cls, name in _parse_all_instance_names(reply.lines):
+            results.append({"name": name, "type": expected_type})
+
+    return results
+
+
 @timed_operation
 def list_objects_internal(
     stk_root: IAgStkObjectRoot,
@@ -123,10 +153,11 @@ def list_objects_internal(
     Enumerate objects in the active scenario and return a list of
     {"name": <instance name>, "type": <class>} dictionaries.
 
-    Uses STK Connect (AllInstanceNames) for broad compatibility with
-    both STK Desktop and STK Engine.
+    Served from the in-process object registry, which is built once by
+    walking the Object Model and kept current by the create/setup functions.
+    Falls back to STK Connect (AllInstanceNames) if the walk fails.
     """
-    if not stk_available or not stk_root:
+    if not core.stk_available or not stk_root:
         raise RuntimeError("STK Root is not available.")
 
     # Ensure there is an active scenario
@@ -139,28 +170,10 @@ def list_objects_internal(
 
     normalized: set[str] | None = _normalize_filter(filter_type) if filter_type else None
 
-    results: list[dict[str, str]] = []
-
-    def add_from_cmd(cmd: str, expected_type: str | None = None) -> None:
-        lines = _exec_lines(stk_root, cmd)
-        for cls, name in _parse_all_instance_names(lines):
-            typ = expected_type or (cls if cls else "")
-            if not typ:
-                continue
-            if normalized is not None and typ not in normalized:
-                continue
-            results.append({"name": name, "type": typ})
-
-    # Top-level classes
-    for cls in _TOP_LEVEL_CLASSES:
-        if normalized is not None and cls not in normalized:
-            continue
-        add_from_cmd(f"AllInstanceNames */{cls}", expected_type=cls)
-
-    # Sensors (nested under multiple parents)
-    # Only include if no filter, or if filter explicitly asks for sensors
-    if normalized is None or ("Sensor" in normalized):
-        for parent in _SENSOR_PARENTS:
-            add_from_cmd(f"AllInstanceNames */{parent}/*/Sensor", expected_type="Sensor")
-
-    return results
+    try:
+        REGISTRY.ensure(stk_root)
+    except Exception as e:
+        logger.warning("Object registry walk failed (%s); falling back to Connect.", e)
+        REGISTRY.invalidate()
+        return _list_objects_connect(stk_root, normalized)
+    return REGISTRY.records(normalized)
@@ -0,0 +1,299 @@
+"""
+Local ephemeris for the TwoBody satellites created by this server.
+
+`create_satellite` and `create_constellation` configure plain TwoBody orbits
+from classical elements we already know, so those elements are recorded here
+(one store per engine, like the object registry) together with the scenario
+interval. Ephemeris requests for such satellites are then computed with the
+vectorized `twobody` math in the server process, over all time steps and
+satellites at once, without queueing on the engine or calling STK.
+
+Agreement with STK's data providers (see `twobody` and the
+`verify_twobody_ephemeris` tool): J2000 positions to metres, Earth-fixed
+positions and altitude well within `STK_MCP_TWOBODY_TOLERANCE_KM`
+(default 1 km), latitude/longitude within 0.01 deg.
+
+Satellites whose orbit was set any other way (loaded scenarios, objects made
+outside this server) are not recorded and keep using STK.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import threading
+from typing import Any
+
+import numpy as np
+
+from . import twobody
+from .config import get_config
+from .encoding import encode_columns, validate_format
+from .twobody import Elements, format_utcg, parse_utcg
+
+FRAMES = ("lla", "eci", "ecf")
+_FRAME_COLUMNS = {
+    "lla": ("lat_deg", "lon_deg", "alt_km"),
+    "eci": ("x_km", "y_km", "z_km"),
+    "ecf": ("x_km", "y_km", "z_km"),
+}
+
+
+class TwoBodyStore:
+    """Elements of the TwoBody satellites in the active scenario, keyed by satellite name."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._satellites: dict[str, Elements] = {}
+        self.start: str | None = None
+        self.stop: str | None = None
+        # Bumped on every change so pool workers ship the store only when needed
+        self.version = 0
+
+    def clear(self) -> None:
+        """Forget everything (new, loaded or closed scenario)."""
+        with self._lock:
+            self._satellites.clear()
+            self.start = self.stop = None
+            self.version += 1
+
+    def add(self, name: str, elements: Elements, start: str, stop: str) -> None:
+        """Record the elements of satellite `name`, propagated over [start, stop] (UTCG)."""
+        with self._lock:
+            self._satellites[name] = elements
+            self.start, self.stop = start, stop
+            self.version += 1
+
+    def set_interval(self, start: str, stop: str) -> None:
+        """Record a new propagation interval (UTCG) for every stored satellite."""
+        with self._lock:
+            self.start, self.stop = start, stop
+            self.version += 1
+
+    def discard(self, name: str) -> None:
+        """Forget `name` (its orbit is being changed by other means)."""
+        with self._lock:
+            if self._satellites.pop(name, None) is not None:
+                self.version += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """{start, stop, satellites: {name: Elements}}; a copy safe to use on any thread."""
+        with self._lock:
+            return {"start": self.start, "stop": self.stop, "satellites": dict(self._satellites)}
+
+    def restore(self, snapshot: dict[str, Any] | None) -> None:
+        """Replace the contents with a `snapshot()` (e.g. after a scenario handoff)."""
+        with self._lock:
+            snapshot = snapshot or {}
+            self._satellites = dict(snapshot.get("satellites") or {})
+            self.start, self.stop = snapshot.get("start"), snapshot.get("stop")
+            self.version += 1
+
+
+ORBITS = TwoBodyStore()
+
+
+def orbits_for(state: Any, client: str = "") -> dict[str, Any]:
+    """The TwoBody store snapshot of the engine serving `client` (no STK calls)."""
+    if state.pool is not None:
+        return state.pool.orbits_for(client)
+    return ORBITS.snapshot()
+
+
+def satellite_name(path: str) -> str | None:
+    """Name of a top-level satellite path like "*/Satellite/Sat1", else None."""
+    parts = [p for p in path.split("/") if p and p != "*"]
+    if len(parts) == 2 and parts[0] == "Satellite":
+        return parts[1]
+    return None
+
+
+def local_satellite(orbits: dict[str, Any], path: str) -> str | None:
+    """Return the satellite name if `path` has recorded TwoBody elements, else None."""
+    if orbits.get("start") is None:
+        return None
+    name = satellite_name(path)
+    return name if name in orbits["satellites"] else None
+
+
+def _page_window(
+    orbits: dict[str, Any],
+    step_sec: float,
+    start_time: str | None,
+    stop_time: str | None,
+    cursor: str | None,
+    page_size: int,
+) -> tuple[dt.datetime, float, float, str | None]:
+    """(scenario start, page start, page stop, next cursor) in seconds from the scenario start."""
+    if step_sec <= 0:
+        raise ValueError("step_sec must be positive.")
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1.")
+    epoch = parse_utcg(orbits["start"])
+    t0 = (parse_utcg(start_time) - epoch).total_seconds() if start_time else 0.0
+    t1 = (parse_utcg(stop_time or orbits["stop"]) - epoch).total_seconds()
+    if t1 < t0:
+        raise ValueError("stop_time must not be before start_time.")
+
+    page_start = t0
+    if cursor:
+        try:
+            page_start = float(cursor)
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor!r}") from None
+        if not (t0 <= page_start <= t1):
+            raise ValueError("Cursor is outside the requested window.")
+    page_stop = min(page_start + (page_size - 1) * step_sec, t1)
+    next_start = page_start + page_size * step_sec
+    return epoch, page_start, page_stop, repr(next_start) if next_start <= t1 else None
+
+
+def _frame_values(
+    elements: list[Elements], epoch: dt.datetime, seconds: np.ndarray, frame: str,
+) -> dict[str, np.ndarray]:
+    """Position columns (each shape (S, N)) of `elements` in `frame`."""
+    r = twobody.eci_positions(elements, epoch, seconds)
+    if frame != "eci":
+        r = twobody.eci_to_ecf(r, epoch, seconds)
+    if frame == "lla":
+        lat, lon, alt = twobody.ecf_to_geodetic(r)
+        return dict(zip(_FRAME_COLUMNS[frame], (lat, lon, alt)))
+    return dict(zip(_FRAME_COLUMNS[frame], (r[..., 0], r[..., 1], r[..., 2])))
+
+
+def _sample_times(page_start: float, page_stop: float, step_sec: float) -> np.ndarray:
+    """Steps from `page_start`, plus `page_stop` when off the grid (as STK's ExecElements does)."""
+    n = int(np.floor((page_stop - page_start) / step_sec + 1e-9)) + 1
+    t = page_start + step_sec * np.arange(n)
+    return np.append(t, page_stop) if page_stop - t[-1] > 1e-6 else t
+
+
+def local_lla_page(
+    orbits: dict[str, Any],
+    satellite_path: str,
+    step_sec: float = 60.0,
+    start_time: str | None = None,
+    stop_time: str | None = None,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    fmt: str = "records",
+    dtype: str = "float64",
+) -> dict[str, Any]:
+    """One page of LLA ephemeris computed locally, shaped like `get_lla_ephemeris_internal`.
+
+    Adds `source: "twobody"`. Record times are UTCG strings.
+    """
+    validate_format(fmt, dtype)
+    name = satellite_name(satellite_path)
+    epoch, page_start, page_stop, next_cursor = _page_window(
+        orbits, step_sec, start_time, stop_time, cursor, page_size or get_config().ephemeris_page_size,
+    )
+    t = _sample_times(page_start, page_stop, step_sec)
+    values = {k: v[0] for k, v in _frame_values([orbits["satellites"][name]], epoch, t, "lla").items()}
+    page: dict[str, Any] = {
+        "satellite": satellite_path,
+        "step_sec": step_sec,
+        "start": format_utcg(epoch + dt.timedelta(seconds=page_start)),
+        "stop": format_utcg(epoch + dt.timedelta(seconds=page_stop)),
+        "next_cursor": next_cursor,
+        "truncated": False,
+        "source": "twobody",
+    }
+    if fmt != "records":
+        page["epoch"] = orbits["start"]
+        page.update(encode_columns({"time": t, **values}, fmt, dtype))
+        return page
+
+    times = [format_utcg(epoch + dt.timedelta(seconds=float(x))) for x in t]
+    lat, lon, alt = (values[k].tolist() for k in _FRAME_COLUMNS["lla"])
+    page["records"] = [
+        {"time": times[i], "lat_deg": lat[i], "lon_deg": lon[i], "alt_km": alt[i]} for i in range(len(times))
+    ]
+    return page
+
+
+def bulk_ephemeris(
+    orbits: dict[str, Any],
+    names: list[str],
+    frame: str = "lla",
+    step_sec: float = 60.0,
+    start_time: str | None = None,
+    stop_time: str | None = None,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    fmt: str = "columns",
+    dtype: str = "float64",
+) -> dict[str, Any]:
+    """One page of ephemeris for many TwoBody satellites, computed in one vectorized pass.
+
+    `page_size` is the number of samples per satellite; it is reduced so a
+    page holds at most `STK_MCP_EPHEMERIS_MAX_PAGE_SIZE` rows in total. Rows
+    are satellite-major: columns `sat` (index into `satellites`), `time`
+    (seconds from `epoch`) and the frame's position columns.
+
+    Returns:
+        dict: {epoch, frame, step_sec, page_size, start, stop, next_cursor,
+        satellites, format, length, columns | records}
+    """
+    if frame not in FRAMES:
+        raise ValueError(f"Unknown frame '{frame}'. Use one of: {', '.join(FRAMES)}.")
+    validate_format(fmt, dtype)
+    if not names:
+        raise ValueError("No TwoBody satellites to propagate.")
+    cfg = get_config()
+    page_size = min(page_size or cfg.ephemeris_page_size, max(cfg.ephemeris_max_page_size // len(names), 1))
+    epoch, page_start, page_stop, next_cursor = _page_window(
+        orbits, step_sec, start_time, stop_time, cursor, page_size,
+    )
+    t = _sample_times(page_start, page_stop, step_sec)
+    values = _frame_values([orbits["satellites"][n] for n in names], epoch, t, frame)
+
+    columns = {
+        "sat": np.repeat(np.arange(len(names)), len(t)),
+        "time": np.tile(t, len(names)),
+        **{k: v.ravel() for k, v in values.items()},
+    }
+    return {
+        "epoch": orbits["start"],
+        "frame": frame,
+        "step_sec": step_sec,
+        "page_size": page_size,
+        "start": format_utcg(epoch + dt.timedelta(seconds=page_start)),
+        "stop": format_utcg(epoch + dt.timedelta(seconds=page_stop)),
+        "next_cursor": next_cursor,
+        "satellites": [f"*/Satellite/{n}" for n in names],
+        **encode_columns(columns, fmt, dtype),
+    }
+
+
+def compare_with_stk(orbits: dict[str, Any], name: str, stk: dict[str, Any]) -> dict[str, Any]:
+    """Compare STK data-provider samples (from `stk_ephemeris_samples_internal`) with local values.
+
+    Returns:
+        dict: {samples, max_eci_km, max_ecf_km, max_lat_deg, max_lon_deg,
+        max_alt_km, tolerance_km, within_tolerance}
+    """
+    epoch = parse_utcg(orbits["start"])
+    t = np.array([(parse_utcg(x) - epoch).total_seconds() for x in stk["time"]])
+    el = [orbits["satellites"][name]]
+
+    def diff(frame: str) -> float:
+        local = _frame_values(el, epoch, t, frame)
+        d = np.stack([local[k][0] - np.asarray(stk[frame][k]) for k in _FRAME_COLUMNS[frame]], axis=-1)
+        return float(np.max(np.linalg.norm(d, axis=-1), initial=0.0))
+
+    lla = _frame_values(el, epoch, t, "lla")
+    dlat = np.abs(lla["lat_deg"][0] - np.asarray(stk["lla"]["lat_deg"]))
+    dlon = np.abs((lla["lon_deg"][0] - np.asarray(stk["lla"]["lon_deg"]) + 180.0) % 360.0 - 180.0)
+    dalt = np.abs(lla["alt_km"][0] - np.asarray(stk["lla"]["alt_km"]))
+    tolerance = get_config().twobody_tolerance_km
+    result = {
+        "samples": len(t),
+        "max_eci_km": diff("eci"),
+        "max_ecf_km": diff("ecf"),
+        "max_lat_deg": float(np.max(dlat, initial=0.0)),
+        "max_lon_deg": float(np.max(dlon, initial=0.0)),
+        "max_alt_km": float(np.max(dalt, initial=0.0)),
+        "tolerance_km": tolerance,
+    }
+    result["within_tolerance"] = max(result["max_eci_km"], result["max_ecf_km"], result["max_alt_km"]) <= tolerance
+    return result
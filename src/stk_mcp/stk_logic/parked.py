@@ -0,0 +1,238 @@
+"""
+Scenarios parked on an engine while another one is active.
+
+STK holds one scenario per engine, so alternating between scenarios used to
+mean closing one and rebuilding the other object by object. Instead, before
+`setup_scenario`, `load_scenario` or `switch_scenario` closes the active
+scenario, it is parked: saved with `SaveScenarioAs` to a private temporary
+directory together with the server-side state derived from it (recorded
+TwoBody elements and stored access intervals). `switch_scenario` brings it
+back with one `LoadScenario` and restores that state, so the local ephemeris
+fast path and computed access survive the switch.
+
+The derived state of recently parked scenarios is kept in memory; past
+`STK_MCP_PARKED_MAX_RESIDENT` scenarios or `STK_MCP_PARKED_MAX_MB` the least
+recently used one is evicted to a file next to its save and read back when
+the scenario is switched to. Past `STK_MCP_PARKED_MAX_SAVED` parked scenarios
+the least recently used one is dropped with its save; 0 disables parking (and
+the save it costs). One store per engine, like the object registry.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .accesses import ACCESSES
+from .config import get_config
+from .core import IAgStkObjectRoot
+from .dataproviders import DP_HANDLES
+from .orbits import ORBITS
+from .registry import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_STATE_FILE = "state.pickle"
+
+
+class _Parked:
+    __slots__ = ("name", "directory", "file", "objects", "parked_at", "state_bytes", "state")
+
+    def __init__(self, name: str, directory: str, file: str, objects: int, state: bytes) -> None:
+        self.name = name
+        self.directory = directory
+        self.file = file
+        self.objects = objects
+        self.parked_at = time.time()
+        self.state_bytes = len(state)
+        # Pickled {orbits, accesses}; None once evicted to `directory`
+        self.state: bytes | None = state
+
+
+class ParkedScenarios:
+    """Parked scenarios of one engine, least recently used first."""
+
+    def __init__(self, max_saved: int, max_resident: int, max_bytes: int) -> None:
+        self.max_saved = max_saved
+        self.max_resident = max_resident
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Parked] = OrderedDict()
+        self.evictions = 0
+        self.dropped = 0
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def park(self, stk_root: IAgStkObjectRoot, keep: str | None = None) -> _Parked | None:
+        """Save the active scenario and its derived state; it stays open.
+
+        None if there is no scenario or parking is disabled. Past `max_saved`
+        the least recently used entries other than `keep` are dropped.
+        """
+        if self.max_saved <= 0:
+            return None
+        scenario = stk_root.CurrentScenario
+        if scenario is None:
+            return None
+        name = scenario.InstanceName
+        REGISTRY.ensure(stk_root)
+        directory = tempfile.mkdtemp(prefix="stk-mcp-parked-")
+        try:
+            file = os.path.join(directory, f"{name}.sc")
+            stk_root.SaveScenarioAs(file)
+        except Exception:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        state = pickle.dumps(
+            {"orbits": ORBITS.snapshot(), "accesses": ACCESSES.snapshot()}, protocol=pickle.HIGHEST_PROTOCOL
+        )
+        entry = _Parked(name, directory, file, sum(REGISTRY.counts().values()), state)
+        with self._lock:
+            old = self._entries.pop(name, None)
+            self._entries[name] = entry
+            dropped = self._trim(keep)
+            self._evict()
+        for stale in ([old] if old is not None else []) + dropped:
+            shutil.rmtree(stale.directory, ignore_errors=True)
+        logger.info("  Parked scenario '%s' (%d objects)", name, entry.objects)
+        return entry
+
+    def restore(self, stk_root: IAgStkObjectRoot, name: str) -> _Parked:
+        """Close the active scenario (park it first) and load the parked `name` with its state.
+
+        If loading fails, `name` stays parked so the switch can be retried.
+        """
+        with self._lock:
+            entry = self._entries.pop(name, None)
+        if entry is None:
+            raise ValueError(f"No parked scenario named '{name}'.")
+        try:
+            state = pickle.loads(entry.state if entry.state is not None else _read_state(entry))
+            if stk_root.CurrentScenario is not None:
+                stk_root.CloseScenario()
+            REGISTRY.reset(None)
+            ORBITS.clear()
+            ACCESSES.clear()
+            DP_HANDLES.clear()
+            stk_root.LoadScenario(entry.file)
+            scenario = stk_root.CurrentScenario
+            if scenario is None:
+                raise RuntimeError(f"STK did not open a scenario from '{entry.file}'.")
+        except Exception:
+            with self._lock:
+                self._entries.setdefault(name, entry)
+            raise
+        REGISTRY.rebuild(scenario)
+        ORBITS.restore(state["orbits"])
+        ACCESSES.restore(state["accesses"])
+        shutil.rmtree(entry.directory, ignore_errors=True)
+        return entry
+
+    def forget(self, name: str) -> None:
+        """Drop the parked `name` (a scenario of that name is being created or loaded)."""
+        with self._lock:
+            entry = self._entries.pop(name, None)
+        if entry is not None:
+            shutil.rmtree(entry.directory, ignore_errors=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), OrderedDict()
+        for entry in entries:
+            shutil.rmtree(entry.directory, ignore_errors=True)
+
+    def export(self) -> list[_Parked]:
+        """Evict every state to disk and hand the entries over (engine replacement)."""
+        with self._lock:
+            for entry in self._entries.values():
+                _spill(entry)
+            entries, self._entries = list(self._entries.values()), OrderedDict()
+        return entries
+
+    def adopt(self, entries: list[_Parked] | None) -> None:
+        """Take over entries from `export()` of the engine this one replaces."""
+        with self._lock:
+            for entry in entries or ():
+                self._entries[entry.name] = entry
+            dropped = self._trim(None)
+        for entry in dropped:
+            shutil.rmtree(entry.directory, ignore_errors=True)
+
+    def listing(self) -> list[dict[str, Any]]:
+        """Parked scenarios, most recently used first."""
+        with self._lock:
+            return [
+                {
+                    "name": e.name,
+                    "objects": e.objects,
+                    "parked_at": e.parked_at,
+                    "state": "memory" if e.state is not None else "disk",
+                    "state_bytes": e.state_bytes,
+                }
+                for e in reversed(self._entries.values())
+            ]
+
+    def _trim(self, keep: str | None) -> list[_Parked]:
+        """Remove the least recently used entries past `max_saved`; the caller deletes their saves.
+
+        `keep` (about to be restored, so about to leave) is neither dropped nor counted.
+        """
+        excess = len(self._entries) - self.max_saved - (keep in self._entries)
+        dropped = []
+        for name in list(self._entries):
+            if excess <= 0:
+                break
+            if name == keep:
+                continue
+            dropped.append(self._entries.pop(name))
+            excess -= 1
+        self.dropped += len(dropped)
+        for entry in dropped:
+            logger.debug("Dropped parked scenario '%s'", entry.name)
+        return dropped
+
+    def _evict(self) -> None:
+        resident = [e for e in self._entries.values() if e.state is not None]
+        count, total = len(resident), sum(e.state_bytes for e in resident)
+        for entry in resident:
+            if count <= self.max_resident and total <= self.max_bytes:
+                break
+            _spill(entry)
+            count -= 1
+            total -= entry.state_bytes
+            self.evictions += 1
+            logger.debug("Evicted state of parked scenario '%s' to disk", entry.name)
+
+
+def _spill(entry: _Parked) -> None:
+    if entry.state is None:
+        return
+    with open(os.path.join(entry.directory, _STATE_FILE), "wb") as f:
+        f.write(entry.state)
+    entry.state = None
+
+
+def _read_state(entry: _Parked) -> bytes:
+    with open(os.path.join(entry.directory, _STATE_FILE), "rb") as f:
+        return f.read()
+
+
+_cfg = get_config()
+PARKED = ParkedScenarios(
+    max_saved=_cfg.parked_max_saved,
+    max_resident=_cfg.parked_max_resident,
+    max_bytes=int(_cfg.parked_max_mb * 2**20),
+)
@@ -0,0 +1,588 @@
+"""
+Engine-mode worker pool.
+
+Each worker is a separate process that owns its own STK Engine root, so
+requests from different clients no longer serialize behind one engine.
+Clients are routed stickily: once a client has been assigned a worker, all of
+its requests (and therefore its scenario) stay on that worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import pickle
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from .cache import RESULT_CACHE, SCENARIO_TAG
+from .cancellation import CancelToken, using_token
+from .config import get_config
+from .executor import StkExecutor
+from .metrics import METRICS
+from .resilience import EngineUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+def _picklable_error(exc: BaseException) -> BaseException:
+    """Return `exc` if it survives pickling, else a RuntimeError carrying its text."""
+    try:
+        pickle.dumps(exc)
+        return exc
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+
+
+def _worker_main(conn: Any, cancel_id: Any, simulated: bool = False) -> None:
+    """Entry point of a worker process: start an engine and serve jobs until told to stop.
+
+    Jobs arrive as `(job_id, func, args, kwargs, timeout_sec)` and are executed
+    as `func(stk_root, *args, **kwargs)` with a `CancelToken` that stops once
+    the parent writes `job_id` into the shared `cancel_id`. Replies are
+    `(ok, result_or_error, snapshot, metric_events)`, where the snapshot of
+    this worker's object registry, retry counters and TwoBody elements is
+    only sent when it changed, and the metric events are replayed into the parent's `METRICS`.
+    """
+    from . import core
+    from .orbits import ORBITS
+    from .registry import REGISTRY
+    from .resilience import RETRY_STATS
+
+    app = None
+    try:
+        if simulated:
+            app, root = core._launch_simulated()
+        else:
+            if not core.load_stk_api():
+                raise RuntimeError("STK Engine is not available in the worker process.")
+            app = core.STKEngine.StartApplication(noGraphics=True)
+            root = app.NewObjectRoot()
+    except Exception as e:
+        conn.send((False, _picklable_error(e)))
+        return
+    conn.send((True, None))
+    METRICS.forward = True
+
+    sent_version: tuple[int, int, int] | None = None
+
+    def snapshot() -> dict[str, Any] | None:
+        nonlocal sent_version
+        version = (REGISTRY.version, RETRY_STATS.version, ORBITS.version)
+        if version == sent_version:
+            return None
+        snap = {**REGISTRY.snapshot(), "retries": RETRY_STATS.snapshot()}
+        if sent_version is None or sent_version[2] != ORBITS.version:
+            # TwoBody elements let the parent compute ephemeris without this engine
+            snap["orbits"] = ORBITS.snapshot()
+        sent_version = version
+        return snap
+
+    try:
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                break
+            if msg is None:
+                break
+            job_id, func, args, kwargs, timeout_sec = msg
+            token = CancelToken(timeout_sec)
+            token.remote = lambda job_id=job_id: cancel_id.value == job_id
+            try:
+                with using_token(token):
+                    result = func(root, *args, **kwargs)
+            except Exception as e:
+                conn.send((False, _picklable_error(e), snapshot(), METRICS.drain()))
+                continue
+            snap = snapshot()
+            events = METRICS.drain()
+            try:
+                conn.send((True, result, snap, events))
+            except Exception as e:
+                # Result was not picklable (e.g., a raw STK object)
+                conn.send((False, _picklable_error(e), snap, events))
+    finally:
+        from .parked import PARKED
+
+        # Saves of scenarios still parked here (not handed over) go with the engine
+        PARKED.clear()
+        try:
+            app.Close()
+        except Exception:  # pragma: no cover - depends on STK runtime
+            pass
+
+
+def _process_rss(pid: int | None) -> int | None:
+    """Resident set size of process `pid` in bytes, or None if it cannot be read."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import win32api  # type: ignore[import-not-found]
+        import win32con  # type: ignore[import-not-found]
+        import win32process  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    try:
+        handle = win32api.OpenProcess(win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ, False, pid)
+        try:
+            return int(win32process.GetProcessMemoryInfo(handle)["WorkingSetSize"])
+        finally:
+            win32api.CloseHandle(handle)
+    except Exception:
+        return None
+
+
+def _save_handoff(stk_root: Any, directory: str) -> dict[str, Any] | None:
+    """Save the open scenario under `directory` so a replacement engine can load it.
+
+    Scenarios parked on the engine are handed over too (their saves stay where they are).
+    """
+    from .parked import PARKED
+
+    scenario = stk_root.CurrentScenario
+    if scenario is None:
+        return None
+    path = os.path.join(directory, f"{scenario.InstanceName}.sc")
+    stk_root.SaveScenarioAs(path)
+    return {"path": path, "parked": PARKED.export()}
+
+
+def _load_handoff(stk_root: Any, handoff: dict[str, Any], orbits: dict[str, Any] | None = None) -> None:
+    """Load a scenario saved by `_save_handoff`, index its objects and restore its TwoBody elements."""
+    from .orbits import ORBITS
+    from .parked import PARKED
+    from .registry import REGISTRY
+
+    PARKED.adopt(handoff["parked"])
+    stk_root.LoadScenario(handoff["path"])
+    REGISTRY.ensure(stk_root)
+    ORBITS.restore(orbits)
+
+
+class _EngineProcess:
+    """One STK Engine worker process plus the pipe and cancel flag that drive it."""
+
+    def __init__(self, mp_ctx: Any, name: str, simulated: bool = False) -> None:
+        self.name = name
+        self._conn, self._child_conn = mp_ctx.Pipe()
+        # Id of the job the worker should stop; written by the parent on cancel
+        self.cancel_id = mp_ctx.Value("q", -1, lock=False)
+        self.process = mp_ctx.Process(
+            target=_worker_main,
+            args=(self._child_conn, self.cancel_id, simulated),
+            name=name,
+            daemon=True,
+        )
+        self.ops = 0
+
+    @property
+    def pid(self) -> int | None:
+        return self.process.pid
+
+    def start(self) -> None:
+        self.process.start()
+        # The child owns its end now; closing ours lets recv() see EOF if it dies
+        self._child_conn.close()
+
+    def wait_ready(self, timeout: float) -> None:
+        """Block until the engine inside the process has started."""
+        try:
+            if not self._conn.poll(timeout):
+                raise TimeoutError(f"STK engine {self.name} did not start within {timeout:.0f}s.")
+            ok, err = self._conn.recv()
+        except EOFError:
+            raise RuntimeError(f"STK engine {self.name} exited during startup.") from None
+        if not ok:
+            raise RuntimeError(f"STK engine {self.name} failed to start: {err}")
+
+    def call(self, job_id: int, func: Callable[..., Any], args: tuple, kwargs: dict, timeout_sec: float | None) -> tuple:
+        """Run one job; returns the raw `(ok, payload, snapshot, events)` reply."""
+        self.ops += 1
+        self._conn.send((job_id, func, args, kwargs, timeout_sec))
+        return self._conn.recv()
+
+    def rss_bytes(self) -> int | None:
+        return _process_rss(self.pid)
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        try:
+            self._conn.send(None)
+        except Exception:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            logger.warning("   STK engine %s did not exit; terminating.", self.name)
+            self.process.terminate()
+
+
+class _SpareEngines:
+    """Pre-started engine processes handed to workers that recycle or lose their engine.
+
+    A background thread keeps `count` engines started and ready; `take()`
+    never blocks, so failover costs a scenario load instead of a cold start.
+    """
+
+    def __init__(self, count: int, mp_ctx: Any, start_timeout: float, simulated: bool = False) -> None:
+        self.count = count
+        self.simulated = simulated
+        self._mp_ctx = mp_ctx
+        self._start_timeout = start_timeout
+        self._ready: deque[_EngineProcess] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._serial = 0
+        self._thread = threading.Thread(target=self._fill, name="stk-engine-spares", daemon=True)
+
+    @property
+    def available(self) -> int:
+        return len(self._ready)
+
+    def start(self) -> None:
+        if self.count > 0:
+            self._thread.start()
+
+    def take(self) -> _EngineProcess | None:
+        """Return a ready spare (and trigger a refill), or None if none is ready."""
+        with self._cond:
+            while self._ready:
+                engine = self._ready.popleft()
+                self._cond.notify()
+                if engine.process.is_alive():
+                    return engine
+                engine.stop(0)
+        return None
+
+    def _fill(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and len(self._ready) >= self.count:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                self._serial += 1
+                engine = _EngineProcess(self._mp_ctx, f"stk-engine-spare-{self._serial}", self.simulated)
+            try:
+                engine.start()
+                engine.wait_ready(self._start_timeout)
+            except Exception as e:
+                engine.kill()
+                if self._closed:
+                    return
+                logger.warning("   Could not start a spare STK engine: %s", e)
+                time.sleep(min(self._start_timeout, 30.0))
+                continue
+            with self._cond:
+                if self._closed:
+                    engine.stop()
+                    return
+                self._ready.append(engine)
+            logger.info("   Spare STK engine ready (pid %s).", engine.pid)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            spares, self._ready = list(self._ready), deque()
+            self._cond.notify_all()
+        for engine in spares:
+            engine.stop()
+
+
+class _EngineWorker(StkExecutor):
+    """Parent-side handle for one worker slot and the engine process serving it.
+
+    The executor thread feeds queued jobs to the process one at a time, so the
+    engine inside the worker is only ever driven by a single caller. Between
+    jobs the thread also replaces the process when it died, was killed by the
+    hang watchdog, ran `engine_recycle_ops` jobs or grew past
+    `engine_max_rss_mb`; planned recycles carry the open scenario over.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        mp_ctx: Any,
+        start_timeout: float,
+        spares: _SpareEngines | None = None,
+        simulated: bool = False,
+    ) -> None:
+        super().__init__(name=f"stk-engine-{index}")
+        self.index = index
+        self.start_timeout = start_timeout
+        self._mp_ctx = mp_ctx
+        self._spares = spares
+        self.simulated = simulated
+        cfg = get_config()
+        # Recycle limits, checked after every job (0 disables)
+        self.recycle_ops = cfg.engine_recycle_ops
+        self.max_rss_bytes = int(cfg.engine_max_rss_mb * 2**20)
+        self.engine = _EngineProcess(mp_ctx, f"stk-engine-{index}", simulated)
+        self._next_job_id = 0
+        self._killed: str | None = None
+        self.clients = 0
+        self.recycles: dict[str, int] = {}
+        # Last TwoBody store snapshot shipped by the engine (see `orbits`)
+        self.orbits: dict[str, Any] = {"start": None, "stop": None, "satellites": {}}
+        self.engine_snapshot: dict[str, Any] = {"scenario": None, "counts": {}, "retries": {}}
+
+    @property
+    def process(self) -> Any:
+        return self.engine.process
+
+    def stats(self) -> dict[str, Any]:
+        rss = self.engine.rss_bytes()
+        return {
+            "index": self.index,
+            "pid": self.engine.pid,
+            **super().stats(),
+            "alive": super().alive and self.process.is_alive(),
+            "clients": self.clients,
+            "engine_ops": self.engine.ops,
+            "rss_mb": None if rss is None else round(rss / 2**20, 1),
+            "recycles": dict(self.recycles),
+            **self.engine_snapshot,
+        }
+
+    def start_process(self) -> None:
+        self.engine.start()
+
+    def _startup(self) -> None:
+        self.engine.wait_ready(self.start_timeout)
+        logger.info("   STK engine worker %d ready (pid %s).", self.index, self.engine.pid)
+
+    def _call(self, func: Callable[..., Any], args: tuple, kwargs: dict, token: CancelToken | None) -> Any:
+        engine = self.engine
+        self._next_job_id += 1
+        job_id = self._next_job_id
+        timeout_sec = None
+        if token is not None:
+            timeout_sec = token.remaining()
+            token.on_cancel(lambda: setattr(engine.cancel_id, "value", job_id))
+        try:
+            ok, payload, snapshot, events = engine.call(job_id, func, args, kwargs, timeout_sec)
+        except (EOFError, OSError) as e:
+            reason = self._killed or str(e) or type(e).__name__
+            raise EngineUnavailableError(f"STK engine worker {self.index} failed: {reason}") from None
+        if snapshot is not None:
+            self.orbits = snapshot.pop("orbits", self.orbits)
+            self.engine_snapshot = snapshot
+        METRICS.replay(events)
+        if not ok:
+            raise payload
+        return payload
+
+    def _execute(self, func: Callable[..., Any], args: tuple, kwargs: dict, token: CancelToken | None) -> Any:
+        return self._call(func, args, kwargs, token)
+
+    # --- Supervision ---------------------------------------------------
+
+    def kill_hung(self, held_sec: float) -> None:
+        """Kill the engine process (watchdog thread); the running job fails and the engine is replaced."""
+        self._killed = f"killed after holding the engine for {held_sec:.0f}s (hung call)"
+        logger.error("STK engine worker %d %s; replacing it.", self.index, self._killed)
+        self.engine.kill()
+
+    def _after_job(self) -> None:
+        reason = None
+        if self._killed is not None:
+            reason = "hung"
+        elif not self.process.is_alive():
+            reason = "crashed"
+        elif self.recycle_ops and self.engine.ops >= self.recycle_ops:
+            reason = "ops"
+        elif self.max_rss_bytes:
+            rss = self.engine.rss_bytes()
+            if rss is not None and rss > self.max_rss_bytes:
+                reason = "rss"
+        if reason is not None:
+            self._replace_engine(reason)
+
+    def _replace_engine(self, reason: str) -> None:
+        """Swap in a spare (or freshly started) engine, carrying the scenario over on planned recycles."""
+        old = self.engine
+        t0 = time.perf_counter()
+        handoff_dir = None
+        handoff = None
+        if reason in ("ops", "rss") and self.engine_snapshot.get("scenario"):
+            handoff_dir = tempfile.mkdtemp(prefix="stk-mcp-handoff-")
+            try:
+                handoff = self._call(_save_handoff, (handoff_dir,), {}, None)
+            except Exception as e:
+                logger.warning("   Could not save scenario of STK engine worker %d: %s", self.index, e)
+
+        new = self._spares.take() if self._spares is not None else None
+        source = "spare" if new is not None else "cold"
+        if new is None:
+            new = _EngineProcess(self._mp_ctx, f"stk-engine-{self.index}", self.simulated)
+            new.start()
+            try:
+                new.wait_ready(self.start_timeout)
+            except Exception:
+                new.stop(0)
+                if handoff_dir is not None:
+                    shutil.rmtree(handoff_dir, ignore_errors=True)
+                raise
+        self.engine = new
+        self._killed = None
+        # The old process exits on its own time (or is already dead)
+        threading.Thread(target=old.stop, name=f"{old.name}-stop", daemon=True).start()
+
+        restored = False
+        if handoff:
+            try:
+                self._call(_load_handoff, (handoff, self.orbits), {}, None)
+                restored = True
+                new.ops = 0
+            except Exception as e:
+                logger.warning("   Could not restore scenario on STK engine worker %d: %s", self.index, e)
+        if handoff_dir is not None:
+            shutil.rmtree(handoff_dir, ignore_errors=True)
+        if not restored:
+            # The scenario is gone with the old engine; drop everything cached for it
+            self.engine_snapshot = {"scenario": None, "counts": {}, "retries": self.engine_snapshot.get("retries", {})}
+            self.orbits = {"start": None, "stop": None, "satellites": {}}
+            RESULT_CACHE.invalidate([(self.index, SCENARIO_TAG)])
+
+        self.recycles[reason] = self.recycles.get(reason, 0) + 1
+        METRICS.inc("stk_mcp_engine_recycles_total", engine=self.index, reason=reason, source=source)
+        logger.warning(
+            "STK engine worker %d replaced (%s, %s engine, scenario %s) in %.1fs; old pid %s, new pid %s.",
+            self.index, reason, source, "restored" if restored else "not restored",
+            time.perf_counter() - t0, old.pid, new.pid,
+        )
+
+    def _shutdown(self, timeout: float = 30.0) -> None:
+        self.engine.stop(timeout)
+
+
+class EnginePool:
+    """A fixed-size pool of STK Engine worker processes with sticky client routing.
+
+    With engine supervision enabled (`STK_MCP_ENGINE_*`), a watchdog thread
+    kills engines whose current job holds them past `engine_hang_timeout_sec`,
+    and `engine_spares` pre-started engines stand by to replace recycled or
+    failed ones. With `simulated`, workers run the simulated backend instead.
+    """
+
+    def __init__(self, size: int, start_timeout: float = 300.0, simulated: bool = False) -> None:
+        if size < 1:
+            raise ValueError("Engine pool size must be at least 1.")
+        cfg = get_config()
+        # Spawn keeps each engine in a fresh interpreter (no inherited COM/engine state)
+        self._mp_ctx = mp.get_context("spawn")
+        self.spares = (
+            _SpareEngines(cfg.engine_spares, self._mp_ctx, start_timeout, simulated) if cfg.engine_spares else None
+        )
+        self._workers = [_EngineWorker(i, self._mp_ctx, start_timeout, self.spares, simulated) for i in range(size)]
+        self._routes: dict[str, int] = {}
+        self._routes_lock = threading.Lock()
+        self.spares_target = cfg.engine_spares
+        self.recycle_ops = cfg.engine_recycle_ops
+        self.max_rss_mb = cfg.engine_max_rss_mb
+        self.hang_timeout = cfg.engine_hang_timeout_sec
+        self._stop = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch, name="stk-engine-watchdog", daemon=True)
+
+    @property
+    def size(self) -> int:
+        return len(self._workers)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Per-worker liveness, queue and registry snapshots (no STK calls)."""
+        return [w.stats() for w in self._workers]
+
+    def supervisor_stats(self) -> dict[str, Any]:
+        """Spare engines ready and the supervision limits in force."""
+        return {
+            "spares_ready": self.spares.available if self.spares is not None else 0,
+            "spares_target": self.spares_target,
+            "recycle_ops": self.recycle_ops,
+            "max_rss_mb": self.max_rss_mb,
+            "hang_timeout_sec": self.hang_timeout,
+        }
+
+    def start(self) -> None:
+        """Start all workers concurrently and wait until each engine is up."""
+        for w in self._workers:
+            w.start_process()
+        ready = [w.start() for w in self._workers]
+        try:
+            for fut in ready:
+                fut.result()
+        except Exception:
+            self.close()
+            raise
+        # Spares start after the serving engines so they don't compete at startup
+        if self.spares is not None:
+            self.spares.start()
+        if self.hang_timeout > 0:
+            self._watchdog.start()
+
+    def _watch(self) -> None:
+        """Kill engines whose current job has held them longer than the hang timeout."""
+        interval = min(max(self.hang_timeout / 4, 0.5), 5.0)
+        while not self._stop.wait(interval):
+            for w in self._workers:
+                held = w.busy_for
+                if held is not None and held > self.hang_timeout and w._killed is None:
+                    w.kill_hung(held)
+
+    def worker_for(self, client: str) -> int:
+        """Return the worker index serving `client`, assigning the least-loaded one on first use."""
+        with self._routes_lock:
+            index = self._routes.get(client)
+            if index is None:
+                worker = min(self._workers, key=lambda w: (w.clients, w.pending))
+                worker.clients += 1
+                index = self._routes[client] = worker.index
+                logger.debug("Routed client %s to STK engine worker %d", client, index)
+            return index
+
+    def orbits_for(self, client: str) -> dict[str, Any]:
+        """TwoBody elements recorded by the worker serving `client` (no STK calls)."""
+        return self._workers[self.worker_for(client)].orbits
+
+    def submit(self, client: str, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """Queue `func(stk_root, *args, **kwargs)` on the worker serving `client`."""
+        return self.schedule(client, func, args, kwargs)
+
+    def schedule(
+        self,
+        client: str,
+        func: Callable[..., Any],
+        args: tuple = (),
+        kwargs: dict | None = None,
+        **options: Any,
+    ) -> Future:
+        """Like `StkExecutor.schedule`, on the worker serving `client`."""
+        worker = self._workers[self.worker_for(client)]
+        return worker.schedule(func, args, kwargs, client=client, **options)
+
+    def broadcast(self, func: Callable[..., Any], /, *args: Any, **options: Any) -> list[Future]:
+        """Queue `func(stk_root, *args)` once on every worker (e.g. warm-up); futures in worker order."""
+        return [w.schedule(func, args, **options) for w in self._workers]
+
+    def close(self) -> None:
+        self._stop.set()
+        for w in self._workers:
+            try:
+                w.close()
+            except Exception as e:  # pragma: no cover - shutdown diagnostics
+                logger.warning("   Error closing STK engine worker %d: %s", w.index, e)
+        if self.spares is not None:
+            self.spares.close()
@@ -0,0 +1,131 @@
+"""
+In-process registry of the objects in the active scenario.
+
+The registry is built once by walking `scenario.Children` through the Object
+Model and is then kept current by the functions that create objects or
+scenarios, so listing, filtering and counting are served from memory instead
+of issuing Connect commands. Each engine (process) has its own registry.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectRegistry:
+    """Index of scenario objects keyed by path ("Class/Name" or "Parent/Name/Class/Name")."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._objects: dict[str, tuple[str, str]] = {}
+        self._top_level = 0
+        self.scenario: str | None = None
+        self.built = False
+        # Bumped on every change so snapshots can be shipped only when needed
+        self.version = 0
+
+    # --- Maintenance ---------------------------------------------------
+
+    def reset(self, scenario_name: str | None) -> None:
+        """Start tracking a new, empty scenario (or none at all)."""
+        with self._lock:
+            self._objects.clear()
+            self._top_level = 0
+            self.scenario = scenario_name
+            self.built = scenario_name is not None
+            self.version += 1
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next `ensure()`."""
+        with self._lock:
+            self.built = False
+
+    def add(self, cls: str, name: str, parent: str | None = None) -> None:
+        """Record an object created in the current scenario (no-op if already known)."""
+        path = f"{parent}/{cls}/{name}" if parent else f"{cls}/{name}"
+        with self._lock:
+            if path not in self._objects:
+                self._objects[path] = (cls, name)
+                if parent is None:
+                    self._top_level += 1
+                self.version += 1
+
+    def contains(self, cls: str, name: str) -> bool:
+        with self._lock:
+            return f"{cls}/{name}" in self._objects
+
+    def rebuild(self, scenario: Any) -> None:
+        """Walk the scenario's object tree and replace the registry contents."""
+        objects: dict[str, tuple[str, str]] = {}
+
+        def walk(children: Any, parent: str | None) -> None:
+            for i in range(children.Count):
+                obj = children.Item(i)
+                cls = obj.ClassName
+                name = obj.InstanceName
+                path = f"{parent}/{cls}/{name}" if parent else f"{cls}/{name}"
+                objects[path] = (cls, name)
+                try:
+                    sub = obj.Children
+                except Exception:
+                    continue
+                if sub is not None and sub.Count:
+                    walk(sub, path)
+
+        top = scenario.Children
+        walk(top, None)
+        with self._lock:
+            self._objects = objects
+            self._top_level = top.Count
+            self.scenario = scenario.InstanceName
+            self.built = True
+            self.version += 1
+        logger.debug("Object registry rebuilt: %d objects in '%s'", len(objects), self.scenario)
+
+    def ensure(self, stk_root: Any) -> None:
+        """Rebuild if unbuilt, if the scenario changed, or if objects were added outside this process.
+
+        The staleness check costs two property reads; the full walk only runs
+        when something actually differs.
+        """
+        scenario = stk_root.CurrentScenario
+        if scenario is None:
+            self.reset(None)
+            return
+        if (
+            not self.built
+            or scenario.InstanceName != self.scenario
+            or scenario.Children.Count != self._top_level
+        ):
+            self.rebuild(scenario)
+
+    # --- Queries -------------------------------------------------------
+
+    def records(self, types: set[str] | None = None) -> list[dict[str, str]]:
+        """Return `{name, type}` records, optionally restricted to `types`."""
+        with self._lock:
+            return [
+                {"name": name, "type": cls}
+                for cls, name in self._objects.values()
+                if types is None or cls in types
+            ]
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            return dict(Counter(cls for cls, _ in self._objects.values()))
+
+    def snapshot(self) -> dict[str, Any]:
+        """Scenario name and per-class counts, as reported by the health resource."""
+        with self._lock:
+            return {
+                "scenario": self.scenario,
+                "counts": dict(Counter(cls for cls, _ in self._objects.values())),
+            }
+
+
+REGISTRY = ObjectRegistry()
@@ -0,0 +1,227 @@
+"""
+Error classification, budgeted retries and a circuit breaker for STK calls.
+
+- `is_transient` separates failures worth retrying (busy/rejected COM calls,
+  timeouts, a lost engine connection) from deterministic ones (bad paths,
+  invalid Connect syntax, validation errors), which fail on the first attempt.
+- `retry_call` retries transient failures with exponential backoff, but never
+  starts a wait that would run past the configured latency budget, so a
+  failing command cannot hold the STK lock for long.
+- `CircuitBreaker` fails new work fast after repeated transient failures and
+  lets a single trial call through once the reset period has passed.
+
+All thresholds come from `StkConfig` (`STK_MCP_RETRY_*`, `STK_MCP_BREAKER_*`).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+from tenacity import (
+    RetryCallState,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    stop_before_delay,
+    wait_exponential,
+)
+
+from .cancellation import OperationCancelled, OperationTimeout
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Read once: `retry_call` wraps every engine call, and building the settings costs milliseconds
+_cfg = get_config()
+
+
+class EngineUnavailableError(RuntimeError):
+    """The STK engine (or its worker process) could not be reached."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Work was rejected without running because the engine is marked unhealthy."""
+
+
+# COM HRESULTs that mean "try again": call rejected / server busy / RPC failures
+_TRANSIENT_HRESULTS = {
+    -2147418111,  # 0x80010001 RPC_E_CALL_REJECTED
+    -2147417846,  # 0x8001010A RPC_E_SERVERCALL_RETRYLATER
+    -2147417848,  # 0x80010108 RPC_E_DISCONNECTED
+    -2147023174,  # 0x800706BA RPC_S_SERVER_UNAVAILABLE
+    -2147023170,  # 0x800706BE RPC_S_CALL_FAILED
+}
+_TRANSIENT_TEXT = (
+    "call was rejected",
+    "retry later",
+    "server is busy",
+    "rpc server",
+    "timed out",
+    "timeout",
+    "temporarily unavailable",
+)
+_PERMANENT_TYPES = (
+    ValueError, KeyError, TypeError, AttributeError,
+    CircuitOpenError, OperationCancelled, OperationTimeout,
+)
+_TRANSIENT_TYPES = (TimeoutError, ConnectionError, EOFError, EngineUnavailableError)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Return True if `exc` is worth retrying; unknown errors count as permanent."""
+    if isinstance(exc, _PERMANENT_TYPES):
+        return False
+    if isinstance(exc, _TRANSIENT_TYPES):
+        return True
+    hresult = getattr(exc, "hresult", None)
+    if hresult is None and exc.args and isinstance(exc.args[0], int):
+        hresult = exc.args[0]
+    if hresult in _TRANSIENT_HRESULTS:
+        return True
+    text = str(exc).lower()
+    return any(t in text for t in _TRANSIENT_TEXT)
+
+
+class RetryStats:
+    """Process-wide retry counters (each engine worker process has its own)."""
+
+    _FIELDS = ("calls", "retries", "recovered", "transient_failures", "permanent_failures", "budget_exhausted")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self._FIELDS, 0)
+        self.version = 0
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            self._counts[field] += 1
+            self.version += 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+RETRY_STATS = RetryStats()
+
+
+def retry_call(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """
+    Call `func(*args, **kwargs)`, retrying transient failures within the budget.
+
+    Stops after `retry_max_attempts` attempts, or earlier if the next backoff
+    would end past `retry_budget_sec` from the first attempt. Permanent
+    failures are raised immediately.
+    """
+    RETRY_STATS.incr("calls")
+
+    def before_sleep(state: RetryCallState) -> None:
+        RETRY_STATS.incr("retries")
+        logger.debug(
+            "Retrying %s after transient error (attempt %d): %s",
+            getattr(func, "__name__", func), state.attempt_number, state.outcome.exception(),
+        )
+
+    retrying = Retrying(
+        stop=stop_after_attempt(_cfg.retry_max_attempts) | stop_before_delay(_cfg.retry_budget_sec),
+        wait=wait_exponential(multiplier=_cfg.retry_initial_delay_sec, max=_cfg.retry_max_delay_sec),
+        retry=retry_if_exception(is_transient),
+        before_sleep=before_sleep,
+        reraise=True,
+    )
+    try:
+        result = retrying(func, *args, **kwargs)
+    except Exception as e:
+        if not is_transient(e):
+            RETRY_STATS.incr("permanent_failures")
+        else:
+            RETRY_STATS.incr("transient_failures")
+            if retrying.statistics.get("attempt_number", 1) < _cfg.retry_max_attempts:
+                RETRY_STATS.incr("budget_exhausted")
+        raise
+    if retrying.statistics.get("attempt_number", 1) > 1:
+        RETRY_STATS.incr("recovered")
+    return result
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive transient failures.
+
+    While open, `check()` raises `CircuitOpenError`. After `reset_sec` one
+    trial call is let through (half-open); its success closes the circuit and
+    its failure reopens it. A trial that is admitted but never runs (queue
+    full, deadline passed, cancelled) must be handed back with `release()`.
+    Permanent failures show that the engine answered, so they count as
+    successes here.
+    """
+
+    def __init__(self, failure_threshold: int | None = None, reset_sec: float | None = None) -> None:
+        self.failure_threshold = failure_threshold or _cfg.breaker_failure_threshold
+        self.reset_sec = _cfg.breaker_reset_sec if reset_sec is None else reset_sec
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._trial or time.monotonic() - self._opened_at >= self.reset_sec:
+            return "half_open"
+        return "open"
+
+    def check(self) -> bool:
+        """Raise `CircuitOpenError` if new work must not be started.
+
+        Returns True if the admitted call is the half-open trial.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if not self._trial and time.monotonic() - self._opened_at >= self.reset_sec:
+                self._trial = True
+                return True
+            self.rejected += 1
+            retry_in = max(0.0, self.reset_sec - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(
+            f"STK engine is unhealthy after {self._failures} consecutive failures; "
+            f"rejecting work (retry in {retry_in:.0f}s)."
+        )
+
+    def release(self) -> None:
+        """Free the trial slot taken by a `check()` whose call did not run."""
+        with self._lock:
+            self._trial = False
+
+    def record(self, exc: BaseException | None) -> None:
+        """Record the outcome of a call that `check()` admitted."""
+        with self._lock:
+            if exc is None or not is_transient(exc):
+                self._failures = 0
+                self._opened_at = None
+                self._trial = False
+                return
+            self._failures += 1
+            if self._trial or (self._opened_at is None and self._failures >= self.failure_threshold):
+                if self._opened_at is None:
+                    logger.warning("Circuit opened after %d consecutive STK failures: %s", self._failures, exc)
+                self.opened += 1
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
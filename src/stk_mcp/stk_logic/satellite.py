@@ -1,41 +1,93 @@
+import functools
 import os
 import logging
+import math
+from typing import Any
 from . import core as core
 from .core import IAgStkObjectRoot, IAgScenario
-from .utils import timed_operation
+from .utils import date_unit, safe_stk_command, timed_operation
 from .config import get_config
+from .accesses import ACCESSES
+from .orbits import ORBITS
+from .registry import REGISTRY
+from .twobody import Elements, format_utcg, parse_utcg
 
 logger = logging.getLogger(__name__)
 
-# Import STK Objects specific to satellite creation if available (Windows Desktop/Engine)
-AgESTKObjectType = None
-AgEVePropagatorType = None
-AgEClassicalLocation = None
-win32com_client = None
-satellite_capable = False
+# STK enums come from `core.stk_objects()` (imported on first use, every
+# platform). win32com is only used on Windows, and the Connect `SetState` path
+# below is used wherever it is missing (e.g. Linux Engine).
 
-if core.stk_available and os.name == 'nt':
+
+@functools.cache
+def _win32com() -> Any:
+    """Return `win32com.client` on Windows (imported on first use), else None."""
+    if os.name != 'nt':
+        return None
     try:
-        from agi.stk12.stkobjects import (
-            AgESTKObjectType as AgESTKObjectTypeImport,
-            AgEVePropagatorType as AgEVePropagatorTypeImport,
-            AgEClassicalLocation as AgEClassicalLocationImport,
-        )
-        import win32com.client as win32com_client_import
-        AgESTKObjectType = AgESTKObjectTypeImport
-        AgEVePropagatorType = AgEVePropagatorTypeImport
-        AgEClassicalLocation = AgEClassicalLocationImport
-        win32com_client = win32com_client_import
-        satellite_capable = True
+        import win32com.client as win32com_client
     except ImportError:
-        logger.warning("Could not import STK COM types for satellite creation (Windows only feature).")
-    except Exception as e:
-        logger.error("Error importing win32com or STK enums: %s", e)
+        logger.warning("win32com not available; satellites will be configured via Connect.")
+        return None
+    return win32com_client
 
 
 cfg = get_config()
 EARTH_RADIUS_KM = cfg.earth_radius_km
 
+
+def mean_anomaly_deg(true_anomaly_deg: float, eccentricity: float) -> float:
+    """Convert true anomaly to mean anomaly (degrees) for an elliptical orbit."""
+    nu = math.radians(true_anomaly_deg)
+    ecc_anom = 2.0 * math.atan2(
+        math.sqrt(1.0 - eccentricity) * math.sin(nu / 2.0),
+        math.sqrt(1.0 + eccentricity) * math.cos(nu / 2.0),
+    )
+    return math.degrees(ecc_anom - eccentricity * math.sin(ecc_anom)) % 360.0
+
+
+def twobody_state_command(
+    name: str,
+    start: str,
+    stop: str,
+    step_sec: float,
+    semi_major_axis_km: float,
+    eccentricity: float,
+    inclination_deg: float,
+    argp_deg: float,
+    raan_deg: float,
+    true_anom_deg: float,
+) -> str:
+    """
+    Build the Connect command that sets a TwoBody propagator from J2000 classical
+    elements and propagates it over [start, stop] (UTCG). Works without win32com.
+    """
+    return (
+        f'SetState */Satellite/{name} Classical TwoBody "{start}" "{stop}" {step_sec} '
+        f'J2000 "{start}" {semi_major_axis_km * 1000.0} {eccentricity} {inclination_deg} '
+        f"{argp_deg} {raan_deg} {mean_anomaly_deg(true_anom_deg, eccentricity)}"
+    )
+
+
+def elements_state_command(name: str, elements: Elements, start: str, stop: str, step_sec: float) -> str:
+    """
+    Build the Connect command that re-sets a TwoBody orbit from recorded
+    `elements` (keeping their epoch) and propagates it over [start, stop] (UTCG).
+    """
+    el = elements
+    return (
+        f'SetState */Satellite/{name} Classical TwoBody "{start}" "{stop}" {step_sec} '
+        f'J2000 "{format_utcg(el.epoch)}" {el.semi_major_axis_km * 1000.0} {el.eccentricity} '
+        f"{el.inclination_deg} {el.argp_deg} {el.raan_deg} {el.mean_anomaly_deg}"
+    )
+
+
+def scenario_interval_utcg(stk_root: IAgStkObjectRoot, scenario: IAgScenario) -> tuple[str, str]:
+    """Return the scenario start/stop as UTCG strings, as Connect expects them."""
+    with date_unit(stk_root, "UTCG"):
+        return scenario.StartTime, scenario.StopTime
+
+
 @timed_operation
 def create_satellite_internal(
     stk_root: IAgStkObjectRoot,  # Although not directly used, good for context
@@ -56,10 +108,13 @@ def create_satellite_internal(
         ValueError: If input parameters are invalid (e.g., apogee < perigee).
         Exception: For COM or other STK errors.
     """
-    if not core.stk_available or not scenario or win32com_client is None or not satellite_capable:
-        raise RuntimeError("STK modules, active scenario, or win32com not available/initialized.")
-    if AgESTKObjectType is None or AgEVePropagatorType is None or AgEClassicalLocation is None:
+    stkobjects = core.stk_objects()
+    if not core.stk_available or not scenario:
+        raise RuntimeError("STK modules or active scenario not available/initialized.")
+    if stkobjects is None:
         raise RuntimeError("Required STK Object Enums not imported.")
+    AgESTKObjectType = stkobjects.AgESTKObjectType
+    win32com_client = None if core.simulated else _win32com()
 
     logger.info("  Attempting internal satellite creation/configuration: %s", name)
 
@@ -88,20 +143,42 @@ def create_satellite_internal(
 
     if satellite is None:
          raise Exception(f"Failed to create or retrieve satellite object '{name}'.")
+    REGISTRY.add("Satellite", name)
+
+    # --- Define Orbital Elements ---
+    argp_deg = 0.0 # Assumed
+    true_anom_deg = 0.0 # Assumed (starts at perigee)
+
+    # The orbit epoch is the scenario start; the elements are recorded once
+    # STK has accepted them so ephemeris can be computed locally (`orbits`)
+    ORBITS.discard(name)
+    ACCESSES.discard(f"*/Satellite/{name}")
+    start, stop = scenario_interval_utcg(stk_root, scenario)
+    elements = Elements(
+        semi_major_axis_km, eccentricity, inclination_deg, argp_deg, raan_deg,
+        mean_anomaly_deg(true_anom_deg, eccentricity), parse_utcg(start),
+    )
+
+    if win32com_client is None:
+        # No COM casting available (Linux Engine): set and propagate via Connect
+        logger.info("    Setting TwoBody state via Connect...")
+        safe_stk_command(stk_root, twobody_state_command(
+            name, start, stop, 60.0, semi_major_axis_km, eccentricity,
+            inclination_deg, argp_deg, raan_deg, true_anom_deg,
+        ))
+        ORBITS.add(name, elements, start, stop)
+        logger.info("  Internal satellite configuration for '%s' complete.", name)
+        return True, f"Successfully created/configured satellite: '{satellite.InstanceName}'", satellite
 
     # --- Set Propagator to TwoBody ---
     logger.info("    Setting propagator to TwoBody...")
-    satellite.SetPropagatorType(AgEVePropagatorType.ePropagatorTwoBody)
+    satellite.SetPropagatorType(stkobjects.AgEVePropagatorType.ePropagatorTwoBody)
     propagator = satellite.Propagator
 
     propagator_twobody = win32com_client.CastTo(propagator, "IAgVePropagatorTwoBody")
     if propagator_twobody is None:
         raise Exception("Failed to cast propagator to IAgVePropagatorTwoBody.")
 
-    # --- Define Orbital Elements ---
-    argp_deg = 0.0 # Assumed
-    true_anom_deg = 0.0 # Assumed (starts at perigee)
-
     logger.info("    Assigning Classical Elements (J2000):")
     # (Print statements omitted for brevity, add back if desired)
 
@@ -110,7 +187,7 @@ def create_satellite_internal(
 
     if classical_elements:
         classical_elements.AssignClassical(
-            AgEClassicalLocation.eCoordinateSystemJ2000,
+            stkobjects.AgEClassicalLocation.eCoordinateSystemJ2000,
             semi_major_axis_km, eccentricity, inclination_deg,
             argp_deg, raan_deg, true_anom_deg
         )
@@ -120,6 +197,7 @@ def create_satellite_internal(
     # --- Propagate the Orbit ---
     logger.info("    Propagating orbit...")
     propagator_twobody.Propagate()
+    ORBITS.add(name, elements, start, stop)
 
     logger.info("  Internal satellite configuration for '%s' complete.", name)
     # Return success flag, message, and the object
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import datetime as dt
 import logging
-from .core import stk_available, IAgStkObjectRoot, IAgScenario
-from .utils import timed_operation, safe_stk_command
+import time
+from typing import Any
+
+from . import core
+from .accesses import ACCESSES
+from .core import IAgStkObjectRoot, IAgScenario
+from .dataproviders import DP_HANDLES
+from .orbits import ORBITS
+from .parked import PARKED
+from .registry import REGISTRY
+from .satellite import elements_state_command, scenario_interval_utcg
+from .twobody import format_utcg, parse_utcg
+from .utils import ConnectBatch, exec_batch, timed_operation
 
 logger = logging.getLogger(__name__)
 
@@ -19,15 +31,24 @@ def setup_scenario_internal(
     Returns:
         tuple: (success_flag, status_message, scenario_object_or_None)
     """
-    if not stk_available or not stk_root:
+    if not core.stk_available or not stk_root:
         return False, "STK Root object not available.", None
 
     try:
-        # Close existing scenario if open
+        # Park (see `parked`) and close existing scenario if open
         if stk_root.Children.Count > 0:
             current_scen_name = stk_root.CurrentScenario.InstanceName
+            if current_scen_name != scenario_name:
+                park_active(stk_root)
             logger.info("  Closing existing scenario: %s", current_scen_name)
             stk_root.CloseScenario()
+            REGISTRY.reset(None)
+        # Also on a fresh root (e.g. a restarted engine), which has nothing to close
+        ORBITS.clear()
+        ACCESSES.clear()
+        DP_HANDLES.clear()
+
+        PARKED.forget(scenario_name)
 
         # Create new scenario
         logger.info("  Creating new scenario: %s", scenario_name)
@@ -36,6 +57,7 @@ def setup_scenario_internal(
 
         if scenario is None:
              raise Exception("Failed to create or get the new scenario object.")
+        REGISTRY.reset(scenario.InstanceName)
 
         # Set time period
         duration_str = f"+{duration_hours} hours"
@@ -46,14 +68,12 @@ def setup_scenario_internal(
         stk_root.Rewind()
 
         # Optional: Maximize windows
-        try:
-            logger.info("  Maximizing STK windows...")
-            safe_stk_command(stk_root, 'Application / Raise')
-            safe_stk_command(stk_root, 'Application / Maximize')
+        logger.info("  Maximizing STK windows...")
+        for reply in exec_batch(stk_root, ['Application / Raise', 'Application / Maximize']):
             # Consider checking for 3D window existence if needed
             # stk_root.ExecuteCommand('Window3D * Maximize')
-        except Exception as cmd_e:
-            logger.warning("  Could not execute maximize commands: %s", cmd_e)
+            if not reply.ok:
+                logger.warning("  Could not execute '%s': %s", reply.command, reply.error)
 
         return True, f"Successfully created and configured scenario: '{scenario_name}'", scenario
 
@@ -63,3 +83,143 @@ def setup_scenario_internal(
         # import traceback
         # traceback.print_exc()
         return False, error_msg, None 
+
+
+@timed_operation
+def extend_scenario_internal(
+    stk_root: IAgStkObjectRoot,
+    start_time: str | None = None,
+    stop_time: str | None = None,
+    extend_hours: float | None = None,
+) -> dict[str, Any]:
+    """
+    Grow the active scenario's time period to [start_time, stop_time] (UTCG).
+
+    Either bound defaults to the current one (`extend_hours` moves the stop
+    later instead); the new period must contain the current one. TwoBody satellites recorded by this server are re-propagated
+    over the new period with their original elements and epoch, in one
+    Connect batch. Stored access results stay valid, so later access requests
+    compute only the added time (see `accesses`).
+
+    Returns:
+        dict: {scenario, start, stop, previous_start, previous_stop,
+        repropagated, not_repropagated, errors}
+    """
+    scenario = stk_root.CurrentScenario
+    if scenario is None:
+        raise RuntimeError("No active scenario found. Use 'setup_scenario' first.")
+    old_start, old_stop = scenario_interval_utcg(stk_root, scenario)
+    start, stop = start_time or old_start, stop_time or old_stop
+    if extend_hours is not None:
+        stop = format_utcg(parse_utcg(old_stop) + dt.timedelta(hours=extend_hours))
+    if parse_utcg(start) > parse_utcg(old_start) or parse_utcg(stop) < parse_utcg(old_stop):
+        raise ValueError("The new time period must contain the current one; use 'setup_scenario' to shorten it.")
+
+    logger.info("  Extending scenario time: Start='%s', Stop='%s'", start, stop)
+    scenario.SetTimePeriod(start, stop)
+    start, stop = scenario_interval_utcg(stk_root, scenario)
+
+    orbits = ORBITS.snapshot()
+    ORBITS.set_interval(start, stop)
+    batch = ConnectBatch(stk_root)
+    names = list(orbits["satellites"])
+    for name in names:
+        batch.add(elements_state_command(name, orbits["satellites"][name], start, stop, 60.0))
+    repropagated: list[str] = []
+    errors: list[dict[str, str]] = []
+    for name, reply in zip(names, batch.execute()):
+        if reply.ok:
+            repropagated.append(name)
+        else:
+            # Its ephemeris no longer matches the recorded elements or the stored accesses
+            ORBITS.discard(name)
+            ACCESSES.discard(f"*/Satellite/{name}")
+            errors.append({"name": name, "error": reply.error})
+
+    REGISTRY.ensure(stk_root)
+    others = [r["name"] for r in REGISTRY.records({"Satellite"}) if r["name"] not in orbits["satellites"]]
+    return {
+        "scenario": scenario.InstanceName,
+        "start": start,
+        "stop": stop,
+        "previous_start": old_start,
+        "previous_stop": old_stop,
+        "repropagated": len(repropagated),
+        "not_repropagated": others,
+        "errors": errors,
+    }
+
+
+def park_active(stk_root: IAgStkObjectRoot) -> str | None:
+    """Park the active scenario before it is closed; returns its name, or None if it could not be parked.
+
+    A failed save only costs the ability to switch back, so it does not stop the caller.
+    """
+    try:
+        parked = PARKED.park(stk_root)
+    except Exception as e:
+        logger.warning("  Could not park scenario: %s", e)
+        return None
+    return parked.name if parked else None
+
+
+@timed_operation
+def switch_scenario_internal(stk_root: IAgStkObjectRoot, name: str) -> dict[str, Any]:
+    """
+    Make the parked scenario `name` active, parking the active one.
+
+    One `LoadScenario` restores the objects, orbits and time period; the
+    recorded TwoBody elements and stored access intervals come back with it.
+
+    Returns:
+        dict: {scenario, switched, parked, objects, counts, state, elapsed_sec, parked_scenarios}
+    """
+    t0 = time.perf_counter()
+    current = stk_root.CurrentScenario
+    if current is not None and current.InstanceName == name:
+        REGISTRY.ensure(stk_root)
+        counts = REGISTRY.counts()
+        return {
+            "scenario": name,
+            "switched": False,
+            "parked": None,
+            "objects": sum(counts.values()),
+            "counts": counts,
+            "state": "active",
+            "elapsed_sec": 0.0,
+            "parked_scenarios": PARKED.listing(),
+        }
+    if name not in PARKED:
+        available = ", ".join(PARKED.names()) or "none"
+        raise ValueError(f"No parked scenario named '{name}' on this engine (parked: {available}).")
+
+    # Unlike setup/load, a scenario that cannot be parked stays open
+    parked = PARKED.park(stk_root, keep=name)
+    entry = PARKED.restore(stk_root, name)
+    counts = REGISTRY.counts()
+    elapsed = time.perf_counter() - t0
+    logger.info("  Switched to scenario '%s' (%d objects) in %.2fs", name, sum(counts.values()), elapsed)
+    return {
+        "scenario": name,
+        "switched": True,
+        "parked": parked.name if parked else None,
+        "objects": sum(counts.values()),
+        "counts": counts,
+        "state": "memory" if entry.state is not None else "disk",
+        "elapsed_sec": round(elapsed, 4),
+        "parked_scenarios": PARKED.listing(),
+    }
+
+
+def parked_scenarios(stk_root: IAgStkObjectRoot) -> dict[str, Any]:
+    """The active scenario's name and the scenarios parked on this engine."""
+    return {"active": current_scenario_name(stk_root), "parked": PARKED.listing()}
+
+
+def current_scenario_name(stk_root: IAgStkObjectRoot) -> str | None:
+    """Return the instance name of the active scenario, or None if there is none."""
+    try:
+        scenario = stk_root.CurrentScenario
+        return scenario.InstanceName if scenario else None
+    except Exception:
+        return None
@@ -0,0 +1,138 @@
+"""
+Priority scheduling and admission control for STK jobs.
+
+Each engine has one `JobScheduler` in front of it:
+
+- Priority classes: interactive (object creation, small reads) before
+  analysis (access, single reports) before bulk (imports, constellations,
+  paged ephemeris and matrices). Order is strict between classes.
+- Fair share: within a class, clients are served round-robin, so one client
+  queuing hundreds of jobs cannot starve another client's single job.
+- Deadlines: a job that has not started by its deadline is dropped with
+  `DeadlineExceededError` instead of running for a caller that gave up.
+- Admission control: once `max_pending` jobs are queued, new work is
+  rejected immediately with `OverloadedError`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from enum import IntEnum
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Scheduling class of an STK job; lower values run first."""
+
+    INTERACTIVE = 0
+    ANALYSIS = 1
+    BULK = 2
+
+
+class OverloadedError(RuntimeError):
+    """The engine queue is full; the request was not queued."""
+
+
+class DeadlineExceededError(RuntimeError):
+    """The job was still queued when its deadline passed and was not run."""
+
+
+class _Entry(Generic[T]):
+    __slots__ = ("item", "deadline")
+
+    def __init__(self, item: T, deadline: float | None) -> None:
+        self.item = item
+        self.deadline = deadline
+
+
+class JobScheduler(Generic[T]):
+    """Blocking priority queue with per-client round-robin, deadlines and a size bound.
+
+    `get()` returns `(item, expired)`; expired items are handed back so the
+    caller can fail them, and never count as runnable work.
+    """
+
+    def __init__(self, max_pending: int = 0) -> None:
+        self.max_pending = max_pending
+        self._cond = threading.Condition()
+        # priority -> client -> jobs, clients kept in round-robin order
+        self._queues: dict[Priority, OrderedDict[str, deque[_Entry[T]]]] = {p: OrderedDict() for p in Priority}
+        self._size = 0
+        self._closed = False
+        self.rejected = 0
+        self.expired = 0
+
+    def qsize(self) -> int:
+        return self._size
+
+    def depth_by_priority(self) -> dict[str, int]:
+        """Queued jobs per priority class (held only briefly; never waits on STK)."""
+        with self._cond:
+            return {p.name.lower(): sum(len(q) for q in self._queues[p].values()) for p in Priority}
+
+    def put(
+        self,
+        item: T,
+        priority: Priority = Priority.ANALYSIS,
+        client: str = "",
+        deadline: float | None = None,
+    ) -> None:
+        """Queue `item`; `deadline` is a `time.monotonic()` value or None.
+
+        Raises:
+            OverloadedError: If `max_pending` jobs are already queued.
+            RuntimeError: If the scheduler was closed.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("STK engine is shutting down.")
+            if self.max_pending and self._size >= self.max_pending:
+                self.rejected += 1
+                raise OverloadedError(
+                    f"STK server overloaded: {self._size} jobs queued (limit {self.max_pending}); retry later."
+                )
+            self._queues[Priority(priority)].setdefault(client, deque()).append(_Entry(item, deadline))
+            self._size += 1
+            self._cond.notify()
+
+    def get(self) -> tuple[T, bool] | None:
+        """Block for the next job; returns `(item, expired)`, or None once closed and drained."""
+        with self._cond:
+            while self._size == 0:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            for p in Priority:
+                clients = self._queues[p]
+                if not clients:
+                    continue
+                client, jobs = next(iter(clients.items()))
+                entry = jobs.popleft()
+                # Rotate: this client goes to the back of its class
+                del clients[client]
+                if jobs:
+                    clients[client] = jobs
+                self._size -= 1
+                expired = entry.deadline is not None and time.monotonic() > entry.deadline
+                if expired:
+                    self.expired += 1
+                return entry.item, expired
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def close(self) -> None:
+        """Stop accepting work; `get()` returns None after the queue drains."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_by_priority": self.depth_by_priority(),
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+            "expired": self.expired,
+        }
@@ -0,0 +1,298 @@
+"""
+Geometric line-of-sight screening for access studies.
+
+Before `compute_access_matrix_internal` asks STK for exact intervals, coarse
+Earth-fixed ephemerides are taken once per object (locally for TwoBody
+satellites recorded in `orbits`, otherwise one "Cartesian Position"/"Fixed"
+data-provider call) and the line of sight of every pair is tested at every
+coarse step in one NumPy pass:
+
+- the segment between the two objects must clear the WGS84 ellipsoid (for a
+  ground site this is its geometric horizon);
+- at ground sites (Facility, Place, Target) the elevation must reach
+  `STK_MCP_ACCESS_PREFILTER_MIN_ELEVATION_DEG` when it is positive.
+
+The test is conservative: each condition is relaxed by how far the objects
+can move in half a step (from their sampled speeds, plus a margin), so a
+pass shorter than the step is still kept. A sample that passes keeps the
+time around it (half-way to its neighbours) as a window for STK; pairs with
+no window are pruned. Windows closer together than the fitted cost of an
+extra STK call (`AccessCost`) are computed in one call. Pairs involving an
+object whose ephemeris could not be sampled (sensors, ...) are not screened.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+import numpy as np
+
+from . import twobody
+from .cancellation import CancelToken
+from .config import get_config
+from .core import IAgStkObjectRoot
+from .orbits import ORBITS, local_satellite
+from .twobody import parse_utcg
+
+logger = logging.getLogger(__name__)
+
+GROUND_CLASSES = {"Facility", "Place", "Target"}
+# Stretch of z that turns the WGS84 ellipsoid into a sphere of radius a
+_Z_SCALE = 1.0 / (1.0 - twobody.WGS84_F)
+# Sampled (chord) speeds are scaled up by this before bounding motion
+_SPEED_MARGIN = 1.25
+# Extra distance allowed for frame and model differences (km)
+_SLACK_KM = 1.0
+# Targets tested together against one source (bounds the working arrays)
+_BLOCK = 256
+
+
+def sample_times(t0: float, t1: float, step_sec: float) -> np.ndarray:
+    """Coarse grid over [t0, t1] (EpSec) with `t1` appended when off the grid."""
+    n = int(np.floor((t1 - t0) / step_sec + 1e-9)) + 1
+    t = t0 + step_sec * np.arange(n)
+    return np.append(t, t1) if t1 - t[-1] > 1e-6 else t
+
+
+def coarse_positions(
+    stk_root: IAgStkObjectRoot,
+    objects: dict[str, Any],
+    t: np.ndarray,
+    step_sec: float,
+) -> dict[str, np.ndarray | None]:
+    """Earth-fixed positions (km, shape (N, 3)) of each object at EpSec times `t`.
+
+    Recorded TwoBody satellites are propagated locally in one vectorized call;
+    other objects use one data-provider call each. Objects whose position
+    cannot be sampled map to None. Must be called with the date unit set to
+    "EpSec".
+    """
+    out: dict[str, np.ndarray | None] = {}
+    orbits = ORBITS.snapshot() if get_config().twobody_fast_path else {}
+    local = {p: name for p in objects if (name := local_satellite(orbits, p))}
+    if local:
+        scenario = stk_root.CurrentScenario
+        conv = stk_root.ConversionUtility
+        epoch = parse_utcg(orbits["start"])
+        start = parse_utcg(conv.ConvertDate("EpSec", "UTCG", str(float(scenario.StartTime))))
+        seconds = t - float(scenario.StartTime) + (start - epoch).total_seconds()
+        r = twobody.eci_positions([orbits["satellites"][n] for n in local.values()], epoch, seconds)
+        r = twobody.eci_to_ecf(r, epoch, seconds)
+        out.update(zip(local, r))
+
+    t0, t1 = float(t[0]), float(t[-1])
+    for path, obj in objects.items():
+        if path in out:
+            continue
+        try:
+            data = obj.DataProviders.Item("Cartesian Position").Group.Item("Fixed").ExecElements(
+                t0, t1, step_sec, ["Time", "x", "y", "z"],
+            ).DataSets
+            times = np.asarray(data.GetDataSetByName("Time").GetValues(), dtype=np.float64)
+            out[path] = np.stack(
+                [np.interp(t, times, np.asarray(data.GetDataSetByName(c).GetValues(), dtype=np.float64))
+                 for c in ("x", "y", "z")],
+                axis=-1,
+            )
+        except Exception as e:
+            logger.debug("  No coarse ephemeris for %s (not screened): %s", path, e)
+            out[path] = None
+    return out
+
+
+def _speed(r: np.ndarray, t: np.ndarray) -> float:
+    """Upper estimate of the speed (km/s) along sampled positions `r`."""
+    if len(t) < 2:
+        return 0.0
+    v = np.linalg.norm(np.diff(r, axis=0), axis=-1) / np.maximum(np.diff(t), 1e-9)
+    return float(np.max(v)) * _SPEED_MARGIN
+
+
+def _up(r: np.ndarray) -> np.ndarray:
+    """Geodetic vertical (unit vector) at the mean of positions `r` (N, 3)."""
+    lat, lon, _ = twobody.ecf_to_geodetic(np.mean(r, axis=0))
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.array([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def _windows(ok: np.ndarray, t: np.ndarray) -> list[tuple[float, float]]:
+    """Merge the cells of the passing samples into [start, stop] windows.
+
+    Each sample's cell reaches half-way to its neighbours (to the ends of `t`
+    for the first and last samples).
+    """
+    edges = np.concatenate([[t[0]], 0.5 * (t[1:] + t[:-1]), [t[-1]]])
+    flags = np.concatenate([[0], ok.astype(np.int8), [0]])
+    change = np.diff(flags)
+    starts, stops = np.flatnonzero(change == 1), np.flatnonzero(change == -1)
+    return [(float(edges[a]), float(edges[b])) for a, b in zip(starts, stops)]
+
+
+def merge_windows(windows: list[tuple[float, float]], max_gap_sec: float) -> list[tuple[float, float]]:
+    """Join consecutive windows separated by less than `max_gap_sec`."""
+    out: list[tuple[float, float]] = []
+    for a, b in windows:
+        if out and a - out[-1][1] < max_gap_sec:
+            out[-1] = (out[-1][0], b)
+        else:
+            out.append((a, b))
+    return out
+
+
+class AccessCost:
+    """Online fit of STK's access cost: `per_call` seconds per ComputeAccess
+    plus `per_sec` seconds per second of window computed.
+
+    Used to join windows when computing through the gap is cheaper than an
+    extra call, and to estimate what the unscreened computation would have cost.
+    """
+
+    _MIN_SAMPLES = 8
+
+    def __init__(self) -> None:
+        self._rows: list[tuple[float, float]] = []
+        self._elapsed: list[float] = []
+        self.per_call: float | None = None
+        self.per_sec: float | None = None
+
+    def record(self, calls: int, seconds: float, elapsed: float) -> None:
+        self._rows.append((float(calls), seconds))
+        self._elapsed.append(elapsed)
+        if len(self._rows) >= self._MIN_SAMPLES and len(self._rows) % self._MIN_SAMPLES == 0:
+            self._fit()
+
+    def _fit(self) -> None:
+        a, y = np.array(self._rows), np.array(self._elapsed)
+        if np.linalg.matrix_rank(a) < 2:
+            return
+        coef = np.linalg.lstsq(a, y, rcond=None)[0]
+        if coef[0] < 0 or coef[1] < 0:
+            # Keep the one non-negative term that explains the data best
+            coef = np.zeros(2)
+            k = int(np.argmax([np.dot(a[:, c], y) ** 2 / max(np.dot(a[:, c], a[:, c]), 1e-12) for c in (0, 1)]))
+            coef[k] = max(np.dot(a[:, k], y) / max(np.dot(a[:, k], a[:, k]), 1e-12), 0.0)
+        self.per_call, self.per_sec = float(coef[0]), float(coef[1])
+
+    @property
+    def max_gap_sec(self) -> float:
+        """Gap below which one call through the gap is cheaper than two calls."""
+        if self.per_call is None or self.per_sec is None:
+            return 0.0
+        return self.per_call / self.per_sec if self.per_sec > 0 else float("inf")
+
+    def estimate(self, calls: int, seconds: float) -> float | None:
+        if self.per_call is None or self.per_sec is None:
+            return None
+        return self.per_call * calls + self.per_sec * seconds
+
+
+def screen_pairs(
+    positions: dict[str, np.ndarray | None],
+    src_paths: list[str],
+    tgt_paths: list[str],
+    pairs: list[tuple[int, int]],
+    t: np.ndarray,
+    min_elevation_deg: float,
+    token: CancelToken,
+) -> list[list[tuple[float, float]] | None]:
+    """Candidate access windows (EpSec) for each pair, aligned with `pairs`.
+
+    An empty list means the pair never has line of sight; None means the pair
+    was not screened (a position is missing) and needs the full interval.
+    """
+    half_step = 0.5 * float(np.max(np.diff(t), initial=0.0))
+    scale = np.array([1.0, 1.0, _Z_SCALE])
+    sin_mask = np.sin(np.radians(min_elevation_deg)) if min_elevation_deg > 0 else None
+
+    paths = list(dict.fromkeys(src_paths + tgt_paths))
+    scaled = {p: r * scale for p, r in positions.items() if r is not None}
+    speed = {p: _speed(r, t) for p, r in positions.items() if r is not None}
+    radius = {p: min(twobody.WGS84_A_KM, float(np.min(np.linalg.norm(r, axis=-1)))) for p, r in scaled.items()}
+    ground = {p: _up(positions[p]) for p in paths if p in scaled and p.split("/")[1] in GROUND_CLASSES}
+
+    by_source: dict[int, list[int]] = {}
+    for n, (i, _) in enumerate(pairs):
+        by_source.setdefault(i, []).append(n)
+
+    out: list[list[tuple[float, float]] | None] = [None] * len(pairs)
+    for i, members in by_source.items():
+        token.check()
+        sp = src_paths[i]
+        if sp not in scaled:
+            continue
+        members = [n for n in members if tgt_paths[pairs[n][1]] in scaled]
+        for b in range(0, len(members), _BLOCK):
+            block = members[b:b + _BLOCK]
+            tps = [tgt_paths[pairs[n][1]] for n in block]
+            ra = scaled[sp][None, :, :]
+            rb = np.stack([scaled[p] for p in tps])
+            # Clearance of the segment above the (scaled) ellipsoid
+            d = rb - ra
+            dd = np.maximum(np.sum(d * d, axis=-1), 1e-12)
+            u = np.clip(-np.sum(ra * d, axis=-1) / dd, 0.0, 1.0)
+            clearance = np.linalg.norm(ra + u[..., None] * d, axis=-1)
+            reach = np.array([min(radius[sp], radius[p]) for p in tps])[:, None]
+            motion = np.array([speed[sp] + speed[p] for p in tps])[:, None] * half_step
+            ok = clearance - reach >= -(motion * _Z_SCALE + _SLACK_KM)
+
+            if sin_mask is not None:
+                for k, tp in enumerate(tps):
+                    for site, other in ((sp, tp), (tp, sp)):
+                        if site not in ground:
+                            continue
+                        los = positions[other] - positions[site]
+                        f = los @ ground[site] - sin_mask * np.linalg.norm(los, axis=-1)
+                        ok[k] &= f >= -(speed[other] * (1.0 + sin_mask) * half_step + _SLACK_KM)
+
+            for k, n in enumerate(block):
+                out[n] = _windows(ok[k], t)
+    return out
+
+
+def screen_access(
+    stk_root: IAgStkObjectRoot,
+    objects: dict[str, Any],
+    src_paths: list[str],
+    tgt_paths: list[str],
+    pairs: list[tuple[int, int]],
+    t0: float,
+    t1: float,
+    token: CancelToken,
+    min_elevation_deg: float | None = None,
+) -> tuple[list[list[tuple[float, float]] | None], dict[str, Any]]:
+    """Screen `pairs` over [t0, t1] (EpSec); must be called with the date unit set to "EpSec".
+
+    Returns:
+        (windows, stats): per-pair windows as from `screen_pairs`, and
+        {step_sec, min_elevation_deg, pairs_pruned, pairs_unscreened,
+        window_fraction, screen_sec}
+    """
+    cfg = get_config()
+    step = cfg.access_prefilter_step_sec
+    if step <= 0:
+        raise ValueError("STK_MCP_ACCESS_PREFILTER_STEP_SEC must be positive.")
+    if min_elevation_deg is None:
+        min_elevation_deg = cfg.access_prefilter_min_elevation_deg
+
+    started = time.perf_counter()
+    t = sample_times(t0, t1, step)
+    positions = coarse_positions(stk_root, objects, t, step)
+    windows = screen_pairs(positions, src_paths, tgt_paths, pairs, t, min_elevation_deg, token)
+
+    span = max(t1 - t0, 1e-9)
+    kept = sum(b - a for w in windows for a, b in (w if w is not None else [(t0, t1)]))
+    stats = {
+        "step_sec": step,
+        "min_elevation_deg": min_elevation_deg,
+        "pairs_pruned": sum(1 for w in windows if w == []),
+        "pairs_unscreened": sum(1 for w in windows if w is None),
+        "window_fraction": round(kept / (span * len(pairs)), 4) if pairs else 0.0,
+        "screen_sec": round(time.perf_counter() - started, 4),
+    }
+    logger.info(
+        "  Prefilter: %d of %d pairs pruned, %.1f%% of pair-time kept, %.2fs",
+        stats["pairs_pruned"], len(pairs), 100.0 * stats["window_fraction"], stats["screen_sec"],
+    )
+    return windows, stats
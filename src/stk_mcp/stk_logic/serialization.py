@@ -0,0 +1,111 @@
+"""
+Fast serialization of large tool and resource results.
+
+FastMCP's generic path turns a returned dict into indented JSON text and, for
+tools with a return annotation, also validates the dict into a pydantic model
+and dumps it again as structured content; for ephemeris and access results
+that is most of the request time. Bulk tools instead return
+`encode_response(result)` (see `decorators.json_response`) and are registered
+with `structured_output=False`, so the result is encoded exactly once:
+
+- with `orjson` when installed (`pip install orjson`), else compact
+  `pydantic_core.to_json` (no indentation);
+- when `STK_MCP_RESPONSE_COMPRESSION` is "gzip" or "zstd" (`zstandard`
+  package) and the JSON is at least `STK_MCP_RESPONSE_COMPRESSION_MIN_BYTES`,
+  compressed and wrapped in an envelope:
+
+      {"content_encoding": "gzip", "content_type": "application/json",
+       "size": <uncompressed bytes>, "data": "<base64>"}
+
+Clients restore the original value with `decode_response`.
+"""
+
+from __future__ import annotations
+
+import base64
+import functools
+import gzip
+import json
+from typing import Any
+
+import pydantic_core
+
+from .config import get_config
+
+try:
+    import orjson
+except ImportError:  # optional: faster encoder
+    orjson = None
+
+CODECS = ("none", "gzip", "zstd")
+_ENVELOPE_KEYS = {"content_encoding", "content_type", "size", "data"}
+
+
+@functools.cache
+def _zstd() -> Any:
+    """The optional `zstandard` module."""
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd compression needs the 'zstandard' package (pip install zstandard).") from None
+    return zstandard
+
+
+def encoder_name() -> str:
+    return "orjson" if orjson is not None else "pydantic_core"
+
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON for `value` (NumPy arrays allowed with orjson)."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS, default=str)
+    return pydantic_core.to_json(value, fallback=str)
+
+
+def compress(data: bytes, codec: str, level: int | None = None) -> bytes:
+    if level is None:
+        level = get_config().response_compression_level
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=min(max(level, 1), 9), mtime=0)
+    if codec == "zstd":
+        return _zstd().ZstdCompressor(level=level).compress(data)
+    raise ValueError(f"Unknown compression '{codec}'. Use one of: {', '.join(CODECS)}.")
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "zstd":
+        return _zstd().ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown content encoding '{codec}'.")
+
+
+def encode_response(value: Any, compression: str | None = None, min_bytes: int | None = None) -> str:
+    """JSON text for a tool/resource result, compressed into an envelope when large.
+
+    `compression` and `min_bytes` default to `STK_MCP_RESPONSE_COMPRESSION`
+    and `STK_MCP_RESPONSE_COMPRESSION_MIN_BYTES`.
+    """
+    cfg = get_config()
+    codec = compression or cfg.response_compression
+    if codec not in CODECS:
+        raise ValueError(f"Unknown compression '{codec}'. Use one of: {', '.join(CODECS)}.")
+    data = dumps(value)
+    if codec == "none" or len(data) < (cfg.response_compression_min_bytes if min_bytes is None else min_bytes):
+        return data.decode("utf-8")
+    envelope = {
+        "content_encoding": codec,
+        "content_type": "application/json",
+        "size": len(data),
+        "data": base64.b64encode(compress(data, codec)).decode("ascii"),
+    }
+    return json.dumps(envelope)
+
+
+def decode_response(payload: str | bytes) -> Any:
+    """Inverse of `encode_response`: parse the JSON, unwrapping a compressed envelope."""
+    value = json.loads(payload)
+    if isinstance(value, dict) and value.keys() == _ENVELOPE_KEYS:
+        raw = decompress(base64.b64decode(value["data"]), value["content_encoding"])
+        return json.loads(raw)
+    return value
@@ -0,0 +1,727 @@
+"""
+Simulated in-process STK backend (`--mode simulated`).
+
+`SimApplication` / `SimRoot` stand in for the STK application and object
+root, implementing the subset of the Object Model and Connect that this
+server uses, so the server can be run, benchmarked and regression-tested
+without a licensed `agi.stk12`:
+
+- root: `NewScenario`, `CloseScenario`, `CurrentScenario`, `Children`,
+  `GetObjectFromPath`, `ExecuteCommand`, `ExecuteMultipleCommands`,
+  `UnitPreferences` (UTCG / EpSec), `ConversionUtility.ConvertDate`,
+  `SaveScenarioAs`, `LoadScenario`, `Rewind`
+- objects: `Children.New/Contains/Item/Count`, `Position.AssignGeodetic`,
+  `GetAccessToObject` (`SpecifyAccessTimePeriod`, `ComputeAccess`,
+  `AccessIntervals`, `ComputedAccessIntervalTimes`) and
+  `DataProviders` "LLA State" (Fixed) and "Cartesian Position" (Fixed,
+  J2000) `ExecElements`
+- Connect: `AllInstanceNames`, `SetState ... Classical TwoBody`,
+  `SetPosition ... Geodetic`, `Application` (no-op)
+
+Satellites follow deterministic two-body orbits (`twobody`); access is
+line of sight, with ground sites requiring the other object above their
+horizon. Every call that would cross into STK sleeps
+`STK_MCP_SIM_CALL_LATENCY_MS`, and access/data-provider computations add
+`STK_MCP_SIM_COMPUTE_LATENCY_MS`, to model engine round trips.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import re
+import shlex
+import time
+from enum import IntEnum
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+
+from . import twobody
+from .config import get_config
+from .twobody import format_utcg, parse_utcg
+
+# Sampling step (s) used to bracket access rise/set times before refining them
+_ACCESS_SCAN_SEC = 30.0
+
+
+class AgESTKObjectType(IntEnum):
+    eAircraft = 1
+    eAreaTarget = 2
+    eFacility = 8
+    eGroundVehicle = 9
+    eLaunchVehicle = 10
+    eLineTarget = 11
+    eMissile = 13
+    ePlace = 14
+    eSatellite = 18
+    eSensor = 20
+    eShip = 21
+    eSubmarine = 22
+
+
+class AgEVePropagatorType(IntEnum):
+    ePropagatorTwoBody = 7
+
+
+class AgEClassicalLocation(IntEnum):
+    eCoordinateSystemJ2000 = 3
+
+
+class AgEExecMultiCmdResultAction(IntEnum):
+    eContinueOnError = 0
+    eExceptionOnError = 1
+
+
+# Stand-in for `agi.stk12.stkobjects` (see `core.stk_objects`)
+ENUMS = SimpleNamespace(
+    AgESTKObjectType=AgESTKObjectType,
+    AgEVePropagatorType=AgEVePropagatorType,
+    AgEClassicalLocation=AgEClassicalLocation,
+    AgEExecMultiCmdResultAction=AgEExecMultiCmdResultAction,
+)
+
+_GROUND_CLASSES = {"Facility", "Place"}
+
+
+class SimError(RuntimeError):
+    """Error raised by the simulated backend where STK would raise a COM error."""
+
+
+# Artificial latency (s) per STK call and per computation; set by `SimApplication`
+_call_sec = 0.0
+_compute_sec = 0.0
+
+
+def _delay(compute: bool = False) -> None:
+    sec = _call_sec + (_compute_sec if compute else 0.0)
+    if sec > 0:
+        time.sleep(sec)
+
+
+def _class_of(obj_type: Any) -> str:
+    name = getattr(obj_type, "name", None) or AgESTKObjectType(int(obj_type)).name
+    return name[1:]
+
+
+# --- Units -------------------------------------------------------------
+
+
+class _UnitPreferences:
+    def __init__(self) -> None:
+        self._units = {"DateFormat": "UTCG"}
+
+    def GetCurrentUnitAbbrv(self, dimension: str) -> str:
+        return self._units.get(dimension, "")
+
+    def SetCurrentUnit(self, dimension: str, unit: str) -> None:
+        if dimension == "DateFormat" and unit not in ("UTCG", "EpSec"):
+            raise SimError(f"Unsupported DateFormat unit '{unit}' in simulated STK.")
+        self._units[dimension] = unit
+
+
+class _ConversionUtility:
+    def __init__(self, root: SimRoot) -> None:
+        self._root = root
+
+    def ConvertDate(self, from_unit: str, to_unit: str, value: Any) -> Any:
+        _delay()
+        return self._root._from_epsec(self._root._to_epsec(value, from_unit), to_unit)
+
+
+class _CommandResult:
+    def __init__(self, lines: list[str], ok: bool = True) -> None:
+        self._lines = lines
+        self.IsSucceeded = ok
+
+    @property
+    def Count(self) -> int:
+        return len(self._lines)
+
+    def Item(self, i: int) -> str:
+        return self._lines[i]
+
+
+class _MultiResult:
+    def __init__(self, results: list[_CommandResult]) -> None:
+        self._results = results
+
+    @property
+    def Count(self) -> int:
+        return len(self._results)
+
+    def Item(self, i: int) -> _CommandResult:
+        return self._results[i]
+
+
+# --- Objects -----------------------------------------------------------
+
+
+class _Children:
+    def __init__(self, owner: SimObject | SimScenario) -> None:
+        self._owner = owner
+        self._items: dict[str, SimObject] = {}
+
+    @property
+    def Count(self) -> int:
+        return len(self._items)
+
+    def Item(self, key: int | str) -> SimObject:
+        if isinstance(key, int):
+            return list(self._items.values())[key]
+        try:
+            return self._items[key]
+        except KeyError:
+            raise SimError(f"Object '{key}' does not exist.") from None
+
+    def Contains(self, obj_type: Any, name: str) -> bool:
+        obj = self._items.get(name)
+        return obj is not None and obj.ClassName == _class_of(obj_type)
+
+    def New(self, obj_type: Any, name: str) -> SimObject:
+        _delay()
+        if not re.fullmatch(r"[A-Za-z0-9_\-]+", name or ""):
+            raise SimError(f"Invalid object name '{name}'.")
+        if name in self._items:
+            raise SimError(f"An object named '{name}' already exists.")
+        obj = SimObject(_class_of(obj_type), name, self._owner)
+        self._items[name] = obj
+        return obj
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+
+class _Position:
+    def __init__(self, obj: SimObject) -> None:
+        self._obj = obj
+
+    def AssignGeodetic(self, lat_deg: float, lon_deg: float, alt_km: float) -> None:
+        _delay()
+        self._obj.geodetic = (float(lat_deg), float(lon_deg), float(alt_km))
+
+
+class SimObject:
+    """A scenario object (satellite, facility, place, ...)."""
+
+    def __init__(self, class_name: str, name: str, parent: Any) -> None:
+        self.ClassName = class_name
+        self.InstanceName = name
+        self.Parent = parent
+        self.Children = _Children(self)
+        self.Position = _Position(self)
+        self.geodetic = (0.0, 0.0, 0.0)
+        self.elements: twobody.Elements | None = None
+        if class_name == "Satellite":
+            # STK's default new satellite: circular, ~300 km, 28.5 deg
+            self.elements = twobody.Elements(6678.137, 0.0, 28.5, 0.0, 0.0, 0.0, self.scenario.start)
+
+    @property
+    def scenario(self) -> SimScenario:
+        p = self.Parent
+        while not isinstance(p, SimScenario):
+            p = p.Parent
+        return p
+
+    @property
+    def Path(self) -> str:
+        parent = self.Parent
+        prefix = f"/Scenario/{parent.InstanceName}" if isinstance(parent, SimScenario) else parent.Path
+        return f"{prefix}/{self.ClassName}/{self.InstanceName}"
+
+    @property
+    def DataProviders(self) -> _DataProviders:
+        return _DataProviders(self)
+
+    def GetAccessToObject(self, other: SimObject) -> _Access:
+        _delay()
+        if not isinstance(other, SimObject):
+            raise SimError("Access target must be a scenario object.")
+        return _Access(self, other)
+
+    # Positions in the inertial frame (km) at scenario seconds `t`
+    def eci(self, t: np.ndarray) -> np.ndarray:
+        scen = self.scenario
+        if self.elements is not None:
+            return twobody.eci_positions([self.elements], scen.start, t)[0]
+        ecf = twobody.geodetic_to_ecf(*self.geodetic)
+        return twobody.ecf_to_eci(np.tile(ecf, (len(t), 1)), scen.start, t)
+
+    def to_dict(self) -> dict[str, Any]:
+        el = self.elements
+        return {
+            "class": self.ClassName,
+            "name": self.InstanceName,
+            "geodetic": list(self.geodetic),
+            "elements": None if el is None else [*el[:6], format_utcg(el.epoch)],
+            "children": [c.to_dict() for c in self.Children],
+        }
+
+
+class _Interval:
+    def __init__(self, start: Any, stop: Any) -> None:
+        self.StartTime = start
+        self.StopTime = stop
+
+
+class _Intervals:
+    def __init__(self, intervals: list[_Interval]) -> None:
+        self._items = intervals
+
+    @property
+    def Count(self) -> int:
+        return len(self._items)
+
+    def Item(self, i: int) -> _Interval:
+        return self._items[i]
+
+    def GetInterval(self, i: int) -> tuple[Any, Any]:
+        ivl = self._items[i]
+        return ivl.StartTime, ivl.StopTime
+
+    def ToArray(self, start: int = 0, length: int = -1) -> list[list[Any]]:
+        items = self._items[start:] if length < 0 else self._items[start:start + length]
+        return [[i.StartTime, i.StopTime] for i in items]
+
+
+def _visibility_margin(a: SimObject, b: SimObject, t: np.ndarray) -> np.ndarray:
+    """Positive where `a` and `b` see each other: elevation above a ground site's
+    horizon, or clearance of the line of sight above the Earth's surface."""
+    ra, rb = a.eci(t), b.eci(t)
+    ground = [(o, r, other) for o, r, other in ((a, ra, rb), (b, rb, ra)) if o.ClassName in _GROUND_CLASSES]
+    if ground:
+        margins = []
+        for site, r_site, r_other in ground:
+            los = r_other - r_site
+            # Geodetic vertical, rotated with the Earth
+            lat, lon = np.radians(site.geodetic[0]), np.radians(site.geodetic[1])
+            normal = np.array([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+            up = twobody.ecf_to_eci(np.tile(normal, (len(t), 1)), site.scenario.start, t)
+            rng = np.maximum(np.linalg.norm(los, axis=1), 1e-9)
+            margins.append(np.arcsin(np.clip(np.sum(los * up, axis=1) / rng, -1.0, 1.0)))
+        return np.minimum.reduce(margins)
+    d = rb - ra
+    dd = np.maximum(np.sum(d * d, axis=1), 1e-12)
+    s = np.clip(-np.sum(ra * d, axis=1) / dd, 0.0, 1.0)
+    closest = ra + s[:, None] * d
+    return np.linalg.norm(closest, axis=1) - twobody.WGS84_A_KM
+
+
+class _Access:
+    def __init__(self, a: SimObject, b: SimObject) -> None:
+        self._a = a
+        self._b = b
+        self._root = a.scenario.root
+        self._window: tuple[float, float] | None = None
+        self._spans: list[tuple[float, float]] = []
+
+    def SpecifyAccessTimePeriod(self, start: Any, stop: Any) -> None:
+        unit = self._root.UnitPreferences.GetCurrentUnitAbbrv("DateFormat")
+        self._window = (self._root._to_epsec(start, unit), self._root._to_epsec(stop, unit))
+
+    def ComputeAccess(self) -> None:
+        _delay(compute=True)
+        scen = self._a.scenario
+        t0, t1 = self._window or (0.0, scen.duration)
+        if t1 <= t0:
+            self._spans = []
+            return
+        n = max(int(np.ceil((t1 - t0) / _ACCESS_SCAN_SEC)), 1)
+        t = np.linspace(t0, t1, n + 1)
+        vis = _visibility_margin(self._a, self._b, t) > 0
+
+        def crossing(lo: float, hi: float, rising: bool) -> float:
+            for _ in range(40):
+                mid = 0.5 * (lo + hi)
+                up = _visibility_margin(self._a, self._b, np.array([mid]))[0] > 0
+                if up == rising:
+                    hi = mid
+                else:
+                    lo = mid
+                if hi - lo < 1e-3:
+                    break
+            return hi
+
+        spans: list[tuple[float, float]] = []
+        start = t0 if vis[0] else None
+        for k in range(1, len(t)):
+            if vis[k] and not vis[k - 1]:
+                start = crossing(t[k - 1], t[k], True)
+            elif not vis[k] and vis[k - 1] and start is not None:
+                spans.append((start, crossing(t[k - 1], t[k], False)))
+                start = None
+        if start is not None:
+            spans.append((start, t1))
+        self._spans = spans
+
+    def _intervals(self) -> _Intervals:
+        unit = self._root.UnitPreferences.GetCurrentUnitAbbrv("DateFormat")
+        conv = self._root._from_epsec
+        return _Intervals([_Interval(conv(a, unit), conv(b, unit)) for a, b in self._spans])
+
+    @property
+    def AccessIntervals(self) -> _Intervals:
+        return self._intervals()
+
+    @property
+    def ComputedAccessIntervalTimes(self) -> _Intervals:
+        return self._intervals()
+
+
+class _DataSet:
+    def __init__(self, values: list[Any]) -> None:
+        self._values = values
+
+    def GetValues(self) -> list[Any]:
+        return self._values
+
+
+class _DataSets:
+    def __init__(self, columns: dict[str, list[Any]]) -> None:
+        self._columns = columns
+
+    def GetDataSetByName(self, name: str) -> _DataSet:
+        try:
+            return _DataSet(self._columns[name])
+        except KeyError:
+            raise SimError(f"Data set '{name}' not found.") from None
+
+
+class _ExecResult:
+    def __init__(self, columns: dict[str, list[Any]]) -> None:
+        self.DataSets = _DataSets(columns)
+
+
+# Simulated data providers: {provider: {group: elements}}
+_PROVIDERS = {
+    "LLA State": {"Fixed": ("Time", "Lat", "Lon", "Alt")},
+    "Cartesian Position": {"Fixed": ("Time", "x", "y", "z"), "J2000": ("Time", "x", "y", "z")},
+}
+
+
+class _ProviderGroup:
+    """One group of a simulated time-varying data provider."""
+
+    def __init__(self, obj: SimObject, provider: str, group: str) -> None:
+        self._obj = obj
+        self._provider = provider
+        self._group = group
+
+    def ExecElements(self, start: Any, stop: Any, step: float, elements: list[str]) -> _ExecResult:
+        _delay(compute=True)
+        root = self._obj.scenario.root
+        unit = root.UnitPreferences.GetCurrentUnitAbbrv("DateFormat")
+        a, b = root._to_epsec(start, unit), root._to_epsec(stop, unit)
+        if step <= 0:
+            raise SimError("Time step must be positive.")
+        t = np.arange(a, b + 1e-9, step)
+        if len(t) == 0 or b - t[-1] > 1e-6:
+            t = np.append(t, b)
+        available = _PROVIDERS[self._provider][self._group]
+        for el in elements:
+            if el not in available:
+                raise SimError(f"Element '{el}' is not provided by the simulated {self._provider} provider.")
+        r = self._obj.eci(t)
+        if self._group == "Fixed":
+            r = twobody.eci_to_ecf(r, self._obj.scenario.start, t)
+        if self._provider == "LLA State":
+            lat, lon, alt = twobody.ecf_to_geodetic(r)
+            values = {"Lat": lat.tolist(), "Lon": lon.tolist(), "Alt": alt.tolist()}
+        else:
+            values = {"x": r[:, 0].tolist(), "y": r[:, 1].tolist(), "z": r[:, 2].tolist()}
+        values["Time"] = t.tolist() if unit == "EpSec" else [root._from_epsec(x, unit) for x in t]
+        return _ExecResult({el: values[el] for el in elements})
+
+
+class _Group:
+    def __init__(self, obj: SimObject, provider: str) -> None:
+        self._obj = obj
+        self._provider = provider
+
+    def Item(self, name: str) -> _ProviderGroup:
+        if name not in _PROVIDERS[self._provider]:
+            raise SimError(f"Data provider group '{name}' is not simulated.")
+        return _ProviderGroup(self._obj, self._provider, name)
+
+
+class _DataProvider:
+    def __init__(self, obj: SimObject, provider: str) -> None:
+        self.Group = _Group(obj, provider)
+
+
+class _DataProviders:
+    def __init__(self, obj: SimObject) -> None:
+        self._obj = obj
+
+    def Item(self, name: str) -> _DataProvider:
+        if name not in _PROVIDERS:
+            raise SimError(f"Data provider '{name}' is not simulated.")
+        return _DataProvider(self._obj, name)
+
+
+# --- Scenario and root -------------------------------------------------
+
+
+class SimScenario:
+    def __init__(self, root: SimRoot, name: str) -> None:
+        self.root = root
+        self.InstanceName = name
+        self.ClassName = "Scenario"
+        self.Parent = root
+        self.Children = _Children(self)
+        self.start = parse_utcg(get_config().default_start_time)
+        self.stop = self.start + dt.timedelta(days=1)
+
+    @property
+    def duration(self) -> float:
+        return (self.stop - self.start).total_seconds()
+
+    def _time(self, t: dt.datetime) -> Any:
+        unit = self.root.UnitPreferences.GetCurrentUnitAbbrv("DateFormat")
+        return self.root._from_epsec((t - self.start).total_seconds(), unit)
+
+    @property
+    def StartTime(self) -> Any:
+        return self._time(self.start)
+
+    @property
+    def StopTime(self) -> Any:
+        return self._time(self.stop)
+
+    @property
+    def Epoch(self) -> Any:
+        return self._time(self.start)
+
+    def SetTimePeriod(self, start: str, stop: str) -> None:
+        _delay()
+        begin = parse_utcg(start)
+        text = str(stop).strip()
+        m = re.fullmatch(r"\+\s*([0-9.eE+-]+)\s*(\w+)", text)
+        if m:
+            scale = {"sec": 1, "secs": 1, "min": 60, "mins": 60, "hr": 3600, "hour": 3600, "hours": 3600,
+                     "day": 86400, "days": 86400}.get(m.group(2).lower())
+            if scale is None:
+                raise SimError(f"Unsupported duration unit in '{text}'.")
+            end = begin + dt.timedelta(seconds=float(m.group(1)) * scale)
+        else:
+            end = parse_utcg(text)
+        if end <= begin:
+            raise SimError("Scenario stop time must be after its start time.")
+        self.start, self.stop = begin, end
+
+    def find(self, parts: list[str]) -> SimObject:
+        """Resolve ["Class", "Name", ("Class", "Name")...] below this scenario."""
+        node: Any = self
+        for cls, name in zip(parts[0::2], parts[1::2]):
+            obj = node.Children._items.get(name)
+            if obj is None or obj.ClassName != cls:
+                raise SimError(f"Object '{cls}/{name}' does not exist.")
+            node = obj
+        if node is self or len(parts) % 2:
+            raise SimError(f"Invalid object path '{'/'.join(parts)}'.")
+        return node
+
+    def walk(self):
+        stack = list(self.Children)
+        while stack:
+            obj = stack.pop(0)
+            yield obj
+            stack[0:0] = list(obj.Children)
+
+
+class _ScenarioCollection:
+    def __init__(self, root: SimRoot) -> None:
+        self._root = root
+
+    @property
+    def Count(self) -> int:
+        return 0 if self._root.CurrentScenario is None else 1
+
+    def Item(self, i: int) -> SimScenario:
+        if self._root.CurrentScenario is None or i != 0:
+            raise SimError("Index out of range.")
+        return self._root.CurrentScenario
+
+
+class SimRoot:
+    """Stand-in for `IAgStkObjectRoot`."""
+
+    simulated = True
+
+    def __init__(self) -> None:
+        self.CurrentScenario: SimScenario | None = None
+        self.Children = _ScenarioCollection(self)
+        self.UnitPreferences = _UnitPreferences()
+        self.ConversionUtility = _ConversionUtility(self)
+
+    # --- Time conversion (EpSec = seconds from the scenario start) ---
+
+    def _scenario(self) -> SimScenario:
+        if self.CurrentScenario is None:
+            raise SimError("No scenario is loaded.")
+        return self.CurrentScenario
+
+    def _to_epsec(self, value: Any, unit: str) -> float:
+        if unit == "EpSec":
+            return float(value)
+        if unit == "UTCG":
+            return (parse_utcg(value) - self._scenario().start).total_seconds()
+        raise SimError(f"Unsupported date unit '{unit}'.")
+
+    def _from_epsec(self, seconds: float, unit: str) -> Any:
+        if unit == "EpSec":
+            return float(seconds)
+        if unit == "UTCG":
+            return format_utcg(self._scenario().start + dt.timedelta(seconds=float(seconds)))
+        raise SimError(f"Unsupported date unit '{unit}'.")
+
+    # --- Scenario lifecycle ---
+
+    def NewScenario(self, name: str) -> None:
+        _delay()
+        if self.CurrentScenario is not None:
+            raise SimError("A scenario is already open; close it first.")
+        self.CurrentScenario = SimScenario(self, name)
+
+    def CloseScenario(self) -> None:
+        _delay()
+        self.CurrentScenario = None
+
+    def Rewind(self) -> None:
+        pass
+
+    def SaveScenarioAs(self, path: str) -> None:
+        _delay()
+        scen = self._scenario()
+        data = {
+            "name": scen.InstanceName,
+            "start": format_utcg(scen.start),
+            "stop": format_utcg(scen.stop),
+            "objects": [o.to_dict() for o in scen.Children],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def LoadScenario(self, path: str) -> None:
+        _delay()
+        if self.CurrentScenario is not None:
+            raise SimError("A scenario is already open; close it first.")
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        scen = SimScenario(self, data["name"])
+        scen.start, scen.stop = parse_utcg(data["start"]), parse_utcg(data["stop"])
+        self.CurrentScenario = scen
+
+        def restore(owner: Any, items: list[dict[str, Any]]) -> None:
+            for item in items:
+                obj = SimObject(item["class"], item["name"], owner)
+                obj.geodetic = tuple(item["geodetic"])
+                if item["elements"] is not None:
+                    *values, epoch = item["elements"]
+                    obj.elements = twobody.Elements(*values, parse_utcg(epoch))
+                owner.Children._items[obj.InstanceName] = obj
+                restore(obj, item["children"])
+
+        restore(scen, data["objects"])
+
+    # --- Object access ---
+
+    def GetObjectFromPath(self, path: str) -> SimObject:
+        _delay()
+        parts = [p for p in path.split("/") if p and p != "*"]
+        if len(parts) >= 2 and parts[0] == "Scenario":
+            parts = parts[2:]
+        return self._scenario().find(parts)
+
+    # --- Connect ---
+
+    def ExecuteCommand(self, command: str) -> _CommandResult:
+        _delay()
+        return _CommandResult(self._connect(command))
+
+    def ExecuteMultipleCommands(self, commands: list[str], action: Any) -> _MultiResult:
+        _delay()
+        results = []
+        for cmd in commands:
+            try:
+                results.append(_CommandResult(self._connect(cmd)))
+            except SimError as e:
+                if int(action) == AgEExecMultiCmdResultAction.eExceptionOnError:
+                    raise
+                results.append(_CommandResult([str(e)], ok=False))
+        return _MultiResult(results)
+
+    def _connect(self, command: str) -> list[str]:
+        try:
+            args = shlex.split(command)
+        except ValueError as e:
+            raise SimError(f"Connect command could not be parsed: {e}") from None
+        if not args:
+            raise SimError("Empty Connect command.")
+        verb = args[0].lower()
+        if verb == "application":
+            return []
+        if verb == "allinstancenames":
+            return self._all_instance_names(args[1] if len(args) > 1 else "*")
+        if verb == "setstate":
+            return self._set_state(args)
+        if verb == "setposition":
+            return self._set_position(args)
+        raise SimError(f"Connect command '{args[0]}' is not supported by simulated STK.")
+
+    def _all_instance_names(self, pattern: str) -> list[str]:
+        scen = self._scenario()
+        want = [p for p in pattern.split("/") if p and p != "*"]
+        lines = []
+        for obj in scen.walk():
+            cls_path = [seg for k, seg in enumerate(obj.Path.split("/")[3:]) if k % 2 == 0]
+            if not want or cls_path == want:
+                lines.append(obj.Path)
+        return lines
+
+    def _set_state(self, args: list[str]) -> list[str]:
+        # SetState <path> Classical TwoBody "start" "stop" step J2000 "epoch" a_m e i argp raan M
+        if len(args) != 15 or args[2].lower() != "classical" or args[3].lower() != "twobody":
+            raise SimError("Only 'SetState <path> Classical TwoBody ...' is supported by simulated STK.")
+        if args[7].upper() != "J2000":
+            raise SimError(f"Unsupported coordinate system '{args[7]}'.")
+        obj = self.GetObjectFromPath(args[1])
+        if obj.ClassName != "Satellite":
+            raise SimError(f"'{args[1]}' is not a satellite.")
+        a_m, e, i, argp, raan, mean_anom = (float(x) for x in args[9:15])
+        if a_m <= 0 or not 0 <= e < 1:
+            raise SimError("Invalid orbit: semi-major axis must be positive and eccentricity in [0, 1).")
+        obj.elements = twobody.Elements(a_m / 1000.0, e, i, argp, raan, mean_anom, parse_utcg(args[8]))
+        return []
+
+    def _set_position(self, args: list[str]) -> list[str]:
+        # SetPosition <path> Geodetic lat lon alt [km]
+        if len(args) < 6 or args[2].lower() != "geodetic":
+            raise SimError("Only 'SetPosition <path> Geodetic lat lon alt' is supported by simulated STK.")
+        obj = self.GetObjectFromPath(args[1])
+        obj.geodetic = (float(args[3]), float(args[4]), float(args[5]))
+        return []
+
+
+class SimApplication:
+    """Stand-in for the STK Engine/Desktop application object."""
+
+    def __init__(self) -> None:
+        global _call_sec, _compute_sec
+        cfg = get_config()
+        _call_sec = max(cfg.sim_call_latency_ms, 0.0) / 1000.0
+        _compute_sec = max(cfg.sim_compute_latency_ms, 0.0) / 1000.0
+        self.Root = SimRoot()
+        self.Visible = False
+
+    def NewObjectRoot(self) -> SimRoot:
+        return self.Root
+
+    def Close(self) -> None:
+        self.Root.CurrentScenario = None
+
+
+def is_simulated(stk_root: Any) -> bool:
+    """True if `stk_root` belongs to the simulated backend."""
+    return getattr(stk_root, "simulated", False) is True
@@ -0,0 +1,178 @@
+"""
+Streaming readers for ground-site files (CSV and GeoJSON).
+
+Both readers yield one `(row_number, site_or_error)` tuple at a time and never
+hold the whole file in memory. A site is a dict with `name`, `latitude_deg`,
+`longitude_deg`, `altitude_km` and `kind`; an error is a string describing why
+the row could not be read.
+
+CSV columns (header names are case-insensitive):
+    name, latitude_deg|lat|latitude, longitude_deg|lon|lng|longitude,
+    altitude_km|alt_km|alt (optional, km), kind (optional)
+
+GeoJSON: a FeatureCollection of Point features. Coordinates are
+`[lon, lat, alt_m?]`; `properties.name` (or the feature `id`) names the site,
+and `properties.altitude_km` / `properties.kind` override the defaults.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from collections.abc import Iterator
+from typing import Any
+
+Site = dict[str, Any]
+
+_LAT_KEYS = ("latitude_deg", "lat", "latitude")
+_LON_KEYS = ("longitude_deg", "lon", "lng", "longitude")
+_ALT_KEYS = ("altitude_km", "alt_km", "alt")
+
+_CHUNK = 64 * 1024
+
+
+def detect_format(path: str) -> str:
+    """Guess "csv" or "geojson" from the file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".geojson", ".json"):
+        return "geojson"
+    if ext in (".csv", ".txt"):
+        return "csv"
+    raise ValueError(f"Cannot infer file format from '{ext}'. Pass format='csv' or 'geojson'.")
+
+
+def _first(row: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    for k in keys:
+        v = row.get(k)
+        if v not in (None, ""):
+            return v
+    return None
+
+
+def _site(name: Any, lat: Any, lon: Any, alt_km: Any, kind: Any, default_kind: str) -> Site | str:
+    if not name or not str(name).strip():
+        return "missing name"
+    if lat is None or lon is None:
+        return "missing latitude/longitude"
+    try:
+        return {
+            "name": str(name).strip(),
+            "latitude_deg": float(lat),
+            "longitude_deg": float(lon),
+            "altitude_km": float(alt_km) if alt_km is not None else 0.0,
+            "kind": (str(kind).strip().lower() if kind else default_kind),
+        }
+    except (TypeError, ValueError) as e:
+        return f"invalid number: {e}"
+
+
+def iter_csv_sites(path: str, default_kind: str = "facility") -> Iterator[tuple[int, Site | str]]:
+    """Yield sites from a CSV file with a header row; row numbers count data rows from 1."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None:
+            return
+        reader.fieldnames = [h.strip().lower() for h in reader.fieldnames]
+        for i, row in enumerate(reader, start=1):
+            yield i, _site(
+                row.get("name"),
+                _first(row, _LAT_KEYS),
+                _first(row, _LON_KEYS),
+                _first(row, _ALT_KEYS),
+                row.get("kind"),
+                default_kind,
+            )
+
+
+def _feature_site(feature: Any, default_kind: str) -> Site | str:
+    if not isinstance(feature, dict):
+        return "feature is not an object"
+    geom = feature.get("geometry") or {}
+    if geom.get("type") != "Point":
+        return f"unsupported geometry type: {geom.get('type')}"
+    coords = geom.get("coordinates") or []
+    if len(coords) < 2:
+        return "Point needs [lon, lat] coordinates"
+    props = feature.get("properties") or {}
+    alt_km = props.get("altitude_km")
+    if alt_km is None and len(coords) > 2 and coords[2] is not None:
+        try:
+            alt_km = float(coords[2]) / 1000.0
+        except (TypeError, ValueError) as e:
+            return f"invalid number: {e}"
+    return _site(
+        props.get("name") or feature.get("id"),
+        coords[1],
+        coords[0],
+        alt_km,
+        props.get("kind"),
+        default_kind,
+    )
+
+
+def _iter_features(f: Any) -> Iterator[Any]:
+    """Incrementally decode the elements of the top-level "features" array."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, eof
+        chunk = f.read(_CHUNK)
+        if not chunk:
+            eof = True
+            return False
+        buf += chunk
+        return True
+
+    # Locate the opening bracket of the features array
+    while True:
+        key = buf.find('"features"')
+        if key >= 0:
+            bracket = buf.find("[", key)
+            if bracket >= 0:
+                buf = buf[bracket + 1:]
+                break
+        if not fill():
+            raise ValueError("GeoJSON has no 'features' array.")
+
+    pos = 0
+    while True:
+        # Skip separators
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or not fill():
+                break
+        if pos >= len(buf):
+            raise ValueError("Unexpected end of GeoJSON features array.")
+        if buf[pos] == "]":
+            return
+        try:
+            feature, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof or not fill():
+                raise
+            continue
+        yield feature
+        # Drop consumed text so the buffer stays about one feature long
+        buf = buf[end:]
+        pos = 0
+
+
+def iter_geojson_sites(path: str, default_kind: str = "facility") -> Iterator[tuple[int, Site | str]]:
+    """Yield sites from a GeoJSON FeatureCollection; row numbers count features from 1."""
+    with open(path, encoding="utf-8-sig") as f:
+        for i, feature in enumerate(_iter_features(f), start=1):
+            yield i, _feature_site(feature, default_kind)
+
+
+def iter_sites(path: str, fmt: str | None = None, default_kind: str = "facility") -> Iterator[tuple[int, Site | str]]:
+    """Dispatch to the CSV or GeoJSON reader based on `fmt` or the file extension."""
+    fmt = (fmt or detect_format(path)).lower()
+    if fmt == "csv":
+        return iter_csv_sites(path, default_kind)
+    if fmt == "geojson":
+        return iter_geojson_sites(path, default_kind)
+    raise ValueError(f"Unknown format '{fmt}'. Use 'csv' or 'geojson'.")
@@ -0,0 +1,189 @@
+"""
+Saved scenarios: snapshots and templates on disk.
+
+A scenario is saved with the engine's own `SaveScenarioAs` and restored with
+`LoadScenario`, so a baseline (ground network, constellation, ...) built once
+comes back in a single load instead of hundreds of create calls.
+
+Layout under `STK_MCP_SCENARIO_DIR`:
+
+    snapshots/<name>/<Scenario>.sc  (+ object files, manifest.json)
+    templates/<name>/<Scenario>.sc  (+ object files, manifest.json)
+
+Snapshots are working saves of a client's scenario; templates are named
+baselines meant to be loaded many times. Each entry is written to a temporary
+directory first and swapped into place, so a failed save never leaves a
+half-written entry, and the manifest lets entries be listed without STK.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import Any, Literal
+
+from .accesses import ACCESSES
+from .config import get_config
+from .core import IAgStkObjectRoot
+from .dataproviders import DP_HANDLES
+from .orbits import ORBITS
+from .parked import PARKED
+from .registry import REGISTRY
+from .scenario import park_active
+from .utils import timed_operation
+
+logger = logging.getLogger(__name__)
+
+Kind = Literal["snapshot", "template"]
+_KIND_DIRS = {"snapshot": "snapshots", "template": "templates"}
+_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+_MANIFEST = "manifest.json"
+
+
+def store_root() -> str:
+    return os.path.abspath(os.path.expanduser(get_config().scenario_dir))
+
+
+def validate_name(name: str) -> str:
+    """Return `name` if it is safe as a directory name, else raise ValueError."""
+    name = (name or "").strip()
+    if not _NAME_RE.match(name) or ".." in name:
+        raise ValueError(
+            f"Invalid name '{name}': use letters, digits, '_', '-' or '.', starting with a letter or digit."
+        )
+    return name
+
+
+def entry_dir(kind: Kind, name: str) -> str:
+    if kind not in _KIND_DIRS:
+        raise ValueError("kind must be 'snapshot' or 'template'.")
+    return os.path.join(store_root(), _KIND_DIRS[kind], validate_name(name))
+
+
+def _scenario_file(directory: str) -> str | None:
+    try:
+        manifest = _read_manifest(directory)
+    except (OSError, ValueError):
+        return None
+    path = os.path.join(directory, manifest.get("file", ""))
+    return path if os.path.isfile(path) else None
+
+
+def _read_manifest(directory: str) -> dict[str, Any]:
+    with open(os.path.join(directory, _MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_saved(kind: Kind | None = None) -> list[dict[str, Any]]:
+    """Manifests of saved entries (no STK calls), newest first."""
+    root = store_root()
+    out: list[dict[str, Any]] = []
+    for k, sub in _KIND_DIRS.items():
+        if kind is not None and k != kind:
+            continue
+        base = os.path.join(root, sub)
+        if not os.path.isdir(base):
+            continue
+        for name in os.listdir(base):
+            try:
+                manifest = _read_manifest(os.path.join(base, name))
+            except (OSError, ValueError):
+                continue
+            out.append({"kind": k, "name": name, **manifest})
+    out.sort(key=lambda m: m.get("saved_at", 0), reverse=True)
+    return out
+
+
+@timed_operation
+def save_scenario_internal(stk_root: IAgStkObjectRoot, kind: Kind, name: str) -> dict[str, Any]:
+    """
+    Save the active scenario as the snapshot or template `name` (replacing it).
+
+    Returns:
+        dict: {kind, name, scenario, file, objects, counts, saved_at, elapsed_sec}
+    """
+    scenario = stk_root.CurrentScenario
+    if scenario is None:
+        raise RuntimeError("No active scenario found. Use 'setup_scenario' first.")
+    target = entry_dir(kind, name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    t0 = time.perf_counter()
+    REGISTRY.ensure(stk_root)
+    counts = REGISTRY.counts()
+    staging = tempfile.mkdtemp(prefix=".saving-", dir=os.path.dirname(target))
+    try:
+        file_name = f"{scenario.InstanceName}.sc"
+        stk_root.SaveScenarioAs(os.path.join(staging, file_name))
+        manifest = {
+            "scenario": scenario.InstanceName,
+            "file": file_name,
+            "objects": sum(counts.values()),
+            "counts": counts,
+            "saved_at": time.time(),
+        }
+        with open(os.path.join(staging, _MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        # Swap the finished save into place; the previous entry goes only after
+        old = None
+        if os.path.exists(target):
+            old = target + f".old-{os.getpid()}"
+            os.replace(target, old)
+        os.replace(staging, target)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    elapsed = time.perf_counter() - t0
+    logger.info("  Saved scenario '%s' as %s '%s' in %.2fs", scenario.InstanceName, kind, name, elapsed)
+    return {"kind": kind, "name": name, **manifest, "elapsed_sec": round(elapsed, 4)}
+
+
+@timed_operation
+def load_scenario_internal(stk_root: IAgStkObjectRoot, kind: Kind, name: str) -> dict[str, Any]:
+    """
+    Close the active scenario and load the snapshot or template `name`.
+
+    Returns:
+        dict: {kind, name, scenario, objects, counts, elapsed_sec}
+    """
+    directory = entry_dir(kind, name)
+    path = _scenario_file(directory)
+    if path is None:
+        raise ValueError(f"No saved {kind} named '{name}'.")
+    loaded_name = _read_manifest(directory).get("scenario")
+
+    t0 = time.perf_counter()
+    if stk_root.CurrentScenario is not None:
+        if stk_root.CurrentScenario.InstanceName != loaded_name:
+            park_active(stk_root)
+        logger.info("  Closing existing scenario: %s", stk_root.CurrentScenario.InstanceName)
+        stk_root.CloseScenario()
+        REGISTRY.reset(None)
+    # Loaded orbits are not known to be plain TwoBody; they are served by STK
+    ORBITS.clear()
+    ACCESSES.clear()
+    DP_HANDLES.clear()
+    stk_root.LoadScenario(path)
+    scenario = stk_root.CurrentScenario
+    if scenario is None:
+        raise RuntimeError(f"STK did not open a scenario from '{path}'.")
+    REGISTRY.rebuild(scenario)
+    PARKED.forget(scenario.InstanceName)
+    counts = REGISTRY.counts()
+    elapsed = time.perf_counter() - t0
+    logger.info("  Loaded %s '%s' (%d objects) in %.2fs", kind, name, sum(counts.values()), elapsed)
+    return {
+        "kind": kind,
+        "name": name,
+        "scenario": scenario.InstanceName,
+        "objects": sum(counts.values()),
+        "counts": counts,
+        "elapsed_sec": round(elapsed, 4),
+    }
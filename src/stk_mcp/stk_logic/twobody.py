@@ -0,0 +1,191 @@
+"""
+Vectorized two-body orbit math (NumPy).
+
+Positions are propagated from classical elements with Kepler's equation in
+the J2000 frame and rotated into the Earth-fixed frame with IAU-1976
+precession, the leading IAU-1980 nutation terms and Greenwich apparent
+sidereal time (UT1 taken as UTC; no polar motion). Geodetic coordinates use
+WGS84.
+
+Against STK's TwoBody propagator (same gravitational parameter) J2000
+positions agree to metres; Earth-fixed positions agree to well under 1 km,
+the residual being UT1-UTC (up to 0.9 s of Earth rotation) and the omitted
+nutation terms and polar motion.
+
+All functions accept NumPy arrays of times (seconds) and return arrays; no
+STK is involved.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+MU_KM3_S2 = 398600.4418
+WGS84_A_KM = 6378.137
+WGS84_F = 1.0 / 298.257223563
+_E2 = WGS84_F * (2.0 - WGS84_F)
+_J2000 = dt.datetime(2000, 1, 1, 12, 0, 0, tzinfo=dt.timezone.utc)
+_ARCSEC = np.pi / (180.0 * 3600.0)
+_UTCG_FMT = "%d %b %Y %H:%M:%S"
+
+
+class Elements(NamedTuple):
+    """Classical elements (km, degrees) with the mean anomaly at `epoch`."""
+
+    semi_major_axis_km: float
+    eccentricity: float
+    inclination_deg: float
+    argp_deg: float
+    raan_deg: float
+    mean_anomaly_deg: float
+    epoch: dt.datetime
+
+
+def parse_utcg(text: str) -> dt.datetime:
+    """Parse an STK UTCG string such as "20 Jan 2020 17:00:00.000" (UTC)."""
+    text = str(text).strip().strip('"')
+    base, _, frac = text.partition(".")
+    try:
+        t = dt.datetime.strptime(base, _UTCG_FMT).replace(tzinfo=dt.timezone.utc)
+    except ValueError:
+        raise ValueError(f"Invalid UTCG time: '{text}'") from None
+    return t + dt.timedelta(seconds=float(f"0.{frac}") if frac else 0.0)
+
+
+def format_utcg(t: dt.datetime) -> str:
+    """Format a UTC datetime the way STK reports UTCG (milliseconds)."""
+    ms = int(round(t.microsecond / 1000.0))
+    if ms == 1000:
+        t, ms = t.replace(microsecond=0) + dt.timedelta(seconds=1), 0
+    return f"{t.day} {t:%b %Y %H:%M:%S}.{ms:03d}"
+
+
+def _eccentric_anomaly(mean_anom: np.ndarray, e: np.ndarray) -> np.ndarray:
+    """Solve Kepler's equation M = E - e sin E by Newton iteration (elementwise)."""
+    ecc = np.where(e < 0.8, mean_anom, np.pi)
+    for _ in range(30):
+        delta = (ecc - e * np.sin(ecc) - mean_anom) / (1.0 - e * np.cos(ecc))
+        ecc = ecc - delta
+        if np.max(np.abs(delta), initial=0.0) < 1e-12:
+            break
+    return ecc
+
+
+def eci_positions(elements: Sequence[Elements], start: dt.datetime, seconds: np.ndarray) -> np.ndarray:
+    """J2000 positions (km, shape (S, N, 3)) of S orbits at `start + seconds`.
+
+    Vectorized over satellites and time steps; each orbit is propagated from
+    its own epoch.
+    """
+    t = np.asarray(seconds, dtype=np.float64)[None, :]
+    if not elements:
+        return np.empty((0, t.shape[1], 3))
+    cols = np.array([el[:6] for el in elements], dtype=np.float64)
+    a, e, inc, argp, raan, m0 = (cols[:, k:k + 1] for k in range(6))
+    offset = np.array([[(start - el.epoch).total_seconds()] for el in elements])
+
+    n = np.sqrt(MU_KM3_S2 / a**3)
+    mean_anom = np.mod(np.radians(m0) + n * (t + offset), 2.0 * np.pi)
+    ecc = _eccentric_anomaly(mean_anom, np.broadcast_to(e, mean_anom.shape))
+    # Position in the perifocal frame
+    xp = a * (np.cos(ecc) - e)
+    yp = a * np.sqrt(1.0 - e * e) * np.sin(ecc)
+
+    i, w, o = np.radians(inc), np.radians(argp), np.radians(raan)
+    cw, sw, co, so, ci, si = np.cos(w), np.sin(w), np.cos(o), np.sin(o), np.cos(i), np.sin(i)
+    return np.stack([
+        (co * cw - so * sw * ci) * xp + (-co * sw - so * cw * ci) * yp,
+        (so * cw + co * sw * ci) * xp + (-so * sw + co * cw * ci) * yp,
+        (sw * si) * xp + (cw * si) * yp,
+    ], axis=-1)
+
+
+def eci_position(el: Elements, times: np.ndarray) -> np.ndarray:
+    """J2000 positions (km, shape (N, 3)) at `times`, in seconds since `el.epoch`."""
+    return eci_positions([el], el.epoch, times)[0]
+
+
+def _centuries(start: dt.datetime, seconds: np.ndarray) -> np.ndarray:
+    return ((start - _J2000).total_seconds() + np.asarray(seconds, dtype=np.float64)) / (86400.0 * 36525.0)
+
+
+def gmst_rad(start: dt.datetime, seconds: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal angle (rad) at `start + seconds`."""
+    t = _centuries(start, seconds)
+    days = t * 36525.0
+    return np.radians(np.mod(280.46061837 + 360.98564736629 * days + 0.000387933 * t * t, 360.0))
+
+
+def _rotate(axis: int, angle: np.ndarray, r: np.ndarray) -> np.ndarray:
+    """Frame rotation of vectors `r` (..., N, 3) about `axis` by `angle` (N,)."""
+    c, s = np.cos(angle), np.sin(angle)
+    x, y, z = r[..., 0], r[..., 1], r[..., 2]
+    if axis == 1:
+        return np.stack([x, c * y + s * z, -s * y + c * z], axis=-1)
+    if axis == 2:
+        return np.stack([c * x - s * z, y, s * x + c * z], axis=-1)
+    return np.stack([c * x + s * y, -s * x + c * y, z], axis=-1)
+
+
+def _earth_angles(start: dt.datetime, seconds: np.ndarray) -> list[tuple[int, np.ndarray]]:
+    """J2000 -> Earth-fixed as a sequence of (axis, angle) frame rotations."""
+    t = _centuries(start, seconds)
+    # IAU-1976 precession
+    zeta = (2306.2181 * t + 0.30188 * t**2 + 0.017998 * t**3) * _ARCSEC
+    z = (2306.2181 * t + 1.09468 * t**2 + 0.018203 * t**3) * _ARCSEC
+    theta = (2004.3109 * t - 0.42665 * t**2 - 0.041833 * t**3) * _ARCSEC
+    # Leading IAU-1980 nutation terms (good to ~0.5")
+    omega = np.radians(125.04452 - 1934.136261 * t)
+    sun = np.radians(280.4665 + 36000.7698 * t)
+    moon = np.radians(218.3165 + 481267.8813 * t)
+    dpsi = (-17.20 * np.sin(omega) - 1.32 * np.sin(2 * sun) - 0.23 * np.sin(2 * moon)
+            + 0.21 * np.sin(2 * omega)) * _ARCSEC
+    deps = (9.20 * np.cos(omega) + 0.57 * np.cos(2 * sun) + 0.10 * np.cos(2 * moon)
+            - 0.09 * np.cos(2 * omega)) * _ARCSEC
+    eps = (84381.448 - 46.8150 * t - 0.00059 * t**2 + 0.001813 * t**3) * _ARCSEC
+    gast = gmst_rad(start, seconds) + dpsi * np.cos(eps)
+    return [(3, -zeta), (2, theta), (3, -z), (1, eps), (3, -dpsi), (1, -(eps + deps)), (3, gast)]
+
+
+def eci_to_ecf(r: np.ndarray, start: dt.datetime, seconds: np.ndarray) -> np.ndarray:
+    """Rotate J2000 positions (..., N, 3) at `start + seconds` into the Earth-fixed frame."""
+    for axis, angle in _earth_angles(start, seconds):
+        r = _rotate(axis, angle, r)
+    return r
+
+
+def ecf_to_eci(r: np.ndarray, start: dt.datetime, seconds: np.ndarray) -> np.ndarray:
+    """Rotate Earth-fixed positions (..., N, 3) at `start + seconds` into J2000."""
+    for axis, angle in reversed(_earth_angles(start, seconds)):
+        r = _rotate(axis, -angle, r)
+    return r
+
+
+def geodetic_to_ecf(lat_deg: float, lon_deg: float, alt_km: float) -> np.ndarray:
+    """WGS84 geodetic coordinates to an Earth-fixed position (km, shape (3,))."""
+    lat, lon = np.radians(lat_deg), np.radians(lon_deg)
+    n = WGS84_A_KM / np.sqrt(1.0 - _E2 * np.sin(lat) ** 2)
+    return np.array([
+        (n + alt_km) * np.cos(lat) * np.cos(lon),
+        (n + alt_km) * np.cos(lat) * np.sin(lon),
+        (n * (1.0 - _E2) + alt_km) * np.sin(lat),
+    ])
+
+
+def ecf_to_geodetic(r: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Earth-fixed positions (..., 3) to WGS84 latitude/longitude (deg) and altitude (km)."""
+    x, y, z = r[..., 0], r[..., 1], r[..., 2]
+    p = np.hypot(x, y)
+    lon = np.arctan2(y, x)
+    lat = np.arctan2(z, p * (1.0 - _E2))
+    for _ in range(6):
+        n = WGS84_A_KM / np.sqrt(1.0 - _E2 * np.sin(lat) ** 2)
+        alt = p / np.maximum(np.cos(lat), 1e-12) - n
+        lat = np.arctan2(z, p * (1.0 - _E2 * n / (n + alt)))
+    n = WGS84_A_KM / np.sqrt(1.0 - _E2 * np.sin(lat) ** 2)
+    alt = p * np.cos(lat) + z * np.sin(lat) - WGS84_A_KM**2 / n
+    return np.degrees(lat), np.degrees(lon), alt
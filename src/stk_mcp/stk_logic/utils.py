@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import logging
 import time
+from contextlib import contextmanager
 from functools import wraps
-from typing import Any, Callable, TypeVar, ParamSpec
+from typing import Any, Callable, Iterator, NamedTuple, TypeVar, ParamSpec
 
-from tenacity import retry, stop_after_attempt, wait_exponential
+from .core import stk_objects
+from .metrics import METRICS
+from .resilience import is_transient, retry_call
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +17,7 @@ T = TypeVar("T")
 
 
 def timed_operation(func: Callable[P, T]) -> Callable[P, T]:
-    """Decorator to log operation duration for diagnostics."""
+    """Decorator to log operation duration and record it in the metrics histogram."""
 
     @wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
@@ -23,19 +26,25 @@ def timed_operation(func: Callable[P, T]) -> Callable[P, T]:
             result = func(*args, **kwargs)
             duration = time.perf_counter() - start
             logger.info("%s completed in %.3fs", func.__name__, duration)
+            METRICS.observe("stk_mcp_operation_seconds", duration, operation=func.__name__)
             return result
         except Exception as e:  # pragma: no cover - diagnostic path
             duration = time.perf_counter() - start
             logger.error("%s failed after %.3fs: %s", func.__name__, duration, e)
+            METRICS.observe("stk_mcp_operation_seconds", duration, operation=func.__name__)
+            METRICS.inc(
+                "stk_mcp_operation_errors_total",
+                operation=func.__name__,
+                kind="transient" if is_transient(e) else "permanent",
+            )
             raise
 
     return wrapper
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10), reraise=True)
 def safe_stk_command(stk_root: Any, command: str):
-    """Execute an STK Connect command with basic retry logic."""
-    return stk_root.ExecuteCommand(command)
+    """Execute an STK Connect command, retrying only transient failures within the latency budget."""
+    return retry_call(stk_root.ExecuteCommand, command)
 
 
 def safe_exec_lines(stk_root: Any, command: str) -> list[str]:
@@ -47,3 +56,122 @@ def safe_exec_lines(stk_root: Any, command: str) -> list[str]:
         logger.debug("Connect command failed: %s", command)
         return []
 
+
+class CommandResult(NamedTuple):
+    """Outcome of one command in a `ConnectBatch`."""
+
+    command: str
+    ok: bool
+    lines: list[str]
+    error: str | None = None
+
+
+def _lines(res: Any) -> list[str]:
+    return [res.Item(i) for i in range(res.Count)]
+
+
+class ConnectBatch:
+    """
+    Queue Connect commands and send them to STK in a single call.
+
+    Uses `ExecuteMultipleCommands` with continue-on-error, so one failing
+    command does not stop the others, and maps each result back to the command
+    that produced it. If the multi-command API is unavailable, the commands are
+    sent one by one with the same per-command results.
+
+    Example:
+        batch = ConnectBatch(stk_root)
+        batch.add("AllInstanceNames */Satellite")
+        batch.add("AllInstanceNames */Facility")
+        sats, facs = batch.execute()
+    """
+
+    def __init__(self, stk_root: Any) -> None:
+        self._root = stk_root
+        self._commands: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def add(self, command: str) -> int:
+        """Queue a command; returns its index in the results of `execute()`."""
+        self._commands.append(command)
+        return len(self._commands) - 1
+
+    def execute(self) -> list[CommandResult]:
+        """Send all queued commands and clear the queue."""
+        commands, self._commands = self._commands, []
+        if not commands:
+            return []
+        stkobjects = stk_objects()
+        if stkobjects is not None:
+            try:
+                multi = self._root.ExecuteMultipleCommands(
+                    commands, stkobjects.AgEExecMultiCmdResultAction.eContinueOnError
+                )
+                return [self._result(cmd, multi.Item(i)) for i, cmd in enumerate(commands)]
+            except Exception as e:
+                logger.debug("ExecuteMultipleCommands failed (%s); sending commands one by one.", e)
+        return [self._single(cmd) for cmd in commands]
+
+    @staticmethod
+    def _result(command: str, res: Any) -> CommandResult:
+        lines = _lines(res)
+        if res.IsSucceeded:
+            return CommandResult(command, True, lines)
+        return CommandResult(command, False, lines, "; ".join(lines) or "Command failed")
+
+    def _single(self, command: str) -> CommandResult:
+        try:
+            return CommandResult(command, True, _lines(retry_call(self._root.ExecuteCommand, command)))
+        except Exception as e:
+            return CommandResult(command, False, [], str(e))
+
+
+def exec_batch(stk_root: Any, commands: list[str]) -> list[CommandResult]:
+    """Send `commands` in one `ConnectBatch` and return one result per command."""
+    batch = ConnectBatch(stk_root)
+    for cmd in commands:
+        batch.add(cmd)
+    return batch.execute()
+
+
+
+@contextmanager
+def date_unit(stk_root: Any, unit: str) -> Iterator[None]:
+    """Temporarily switch the root's DateFormat unit (e.g., to "EpSec")."""
+    prefs = stk_root.UnitPreferences
+    previous = prefs.GetCurrentUnitAbbrv("DateFormat")
+    prefs.SetCurrentUnit("DateFormat", unit)
+    try:
+        yield
+    finally:
+        prefs.SetCurrentUnit("DateFormat", previous)
+
+
+def call_internal(
+    stk_root: Any,
+    func: Callable[..., tuple[bool, str, Any]],
+    /,
+    *,
+    needs_scenario: bool = False,
+    **kwargs: Any,
+) -> tuple[bool, str]:
+    """Call an `*_internal` function and drop the STK object from its result.
+
+    The `*_internal` functions return `(success, message, stk_object)`; STK
+    objects are bound to the engine that created them and cannot be sent back
+    from an engine pool worker, so only `(success, message)` is returned.
+    With `needs_scenario`, the active scenario is resolved and passed as
+    `scenario=`.
+    """
+    if needs_scenario:
+        try:
+            scenario = stk_root.CurrentScenario
+        except Exception as e:
+            return False, f"Error: Could not access current scenario: {e}"
+        if scenario is None:
+            return False, "Error: No active scenario found. Use 'setup_scenario' first."
+        kwargs["scenario"] = scenario
+    ok, msg, _ = func(stk_root=stk_root, **kwargs)
+    return ok, msg
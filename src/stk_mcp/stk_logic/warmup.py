@@ -0,0 +1,77 @@
+"""
+Engine warm-up.
+
+The first access computation and the first data-provider call in a fresh STK
+process load the analysis plugins and take far longer than later calls. At
+startup each engine runs them once in a throwaway scenario, which is closed
+again, so the first client request does not pay that cost.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from .core import IAgStkObjectRoot, stk_objects
+from .registry import REGISTRY
+from .satellite import scenario_interval_utcg, twobody_state_command
+from .utils import safe_stk_command
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SCENARIO = "MCP_Warmup"
+
+
+def warm_up_engine(stk_root: IAgStkObjectRoot) -> dict[str, Any]:
+    """
+    Exercise object creation, access and the LLA data provider once.
+
+    Skipped if a scenario is already open, so user work is never touched.
+
+    Returns:
+        dict: {skipped, elapsed_sec, steps: {step: seconds}}
+    """
+    if stk_root.CurrentScenario is not None:
+        return {"skipped": True, "elapsed_sec": 0.0, "steps": {}}
+    stkobjects = stk_objects()
+    if stkobjects is None:
+        raise RuntimeError("STK enums not available; cannot warm up.")
+
+    steps: dict[str, float] = {}
+    t0 = last = time.perf_counter()
+
+    def step(name: str) -> None:
+        nonlocal last
+        now = time.perf_counter()
+        steps[name] = round(now - last, 4)
+        last = now
+
+    stk_root.NewScenario(WARMUP_SCENARIO)
+    try:
+        scenario = stk_root.CurrentScenario
+        children = scenario.Children
+        fac = children.New(stkobjects.AgESTKObjectType.eFacility, "Warmup_Fac")
+        fac.Position.AssignGeodetic(0.0, 0.0, 0.0)
+        sat = children.New(stkobjects.AgESTKObjectType.eSatellite, "Warmup_Sat")
+        start, stop = scenario_interval_utcg(stk_root, scenario)
+        safe_stk_command(stk_root, twobody_state_command(
+            "Warmup_Sat", start, stop, 60.0, 6878.137, 0.0, 45.0, 0.0, 0.0, 0.0,
+        ))
+        step("objects")
+
+        access = sat.GetAccessToObject(fac)
+        access.ComputeAccess()
+        access.ComputedAccessIntervalTimes.Count
+        step("access")
+
+        dp = sat.DataProviders.Item("LLA State").Group.Item("Fixed")
+        dp.ExecElements(start, stop, 600.0, ["Time", "Lat", "Lon", "Alt"]).DataSets.GetDataSetByName("Lat")
+        step("data_provider")
+    finally:
+        stk_root.CloseScenario()
+        REGISTRY.reset(None)
+
+    elapsed = round(time.perf_counter() - t0, 4)
+    logger.info("   STK engine warm-up finished in %.2fs %s", elapsed, steps)
+    return {"skipped": False, "elapsed_sec": elapsed, "steps": steps}
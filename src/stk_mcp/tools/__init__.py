@@ -10,6 +10,7 @@ from . import location  # noqa: F401
 from . import objects  # noqa: F401
 from . import health  # noqa: F401
 from . import analysis  # noqa: F401
+from . import metrics  # noqa: F401
 
 # You can optionally define an __all__ if needed, but importing is usually sufficient
 # for the decorators to register. 
@@ -1,14 +1,24 @@
+import asyncio
 import logging
 from mcp.server.fastmcp import Context
 from mcp.server.fastmcp.exceptions import ResourceError
 
 from ..app import mcp_server
-from ..stk_logic.core import StkState, STK_LOCK
-from ..stk_logic.decorators import require_stk_resource
+from ..stk_logic.core import StkState, run_stk, engine_scope
+from ..stk_logic.cache import RESULT_CACHE, object_tags
+from ..stk_logic.config import get_config
+from ..stk_logic.encoding import validate_format
+from ..stk_logic.scheduler import Priority
+from ..stk_logic.decorators import json_response, require_stk_resource, require_stk_tool, client_key
 from ..stk_logic.analysis import (
     compute_access_intervals_internal,
+    compute_access_matrix_internal,
+    data_provider_report_internal,
     get_lla_ephemeris_internal,
+    normalize_path,
+    stk_ephemeris_samples_internal,
 )
+from ..stk_logic.orbits import FRAMES, bulk_ephemeris, compare_with_stk, local_lla_page, local_satellite, orbits_for
 
 logger = logging.getLogger(__name__)
 
@@ -25,13 +35,83 @@ logger = logging.getLogger(__name__)
     mime_type="application/json",
 )
 @require_stk_resource
-def compute_access(ctx: Context, object1: str, object2: str):
+@json_response
+async def compute_access(ctx: Context, object1: str, object2: str):
     lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
-    if not lifespan_ctx or not lifespan_ctx.stk_root:
+    if not lifespan_ctx or not lifespan_ctx.ready:
         raise ResourceError("STK Root unavailable.")
 
-    with STK_LOCK:
-        return compute_access_intervals_internal(lifespan_ctx.stk_root, object1, object2)
+    client = client_key(ctx)
+    scope = engine_scope(lifespan_ctx, client)
+    try:
+        p1, p2 = normalize_path(object1), normalize_path(object2)
+    except ValueError as e:
+        raise ResourceError(str(e))
+
+    return await RESULT_CACHE.get_or_compute(
+        ("access", scope, p1, p2),
+        object_tags(scope, p1, p2),
+        lambda: run_stk(
+            lifespan_ctx, compute_access_intervals_internal, p1, p2,
+            client=client, priority=Priority.ANALYSIS,
+        ),
+    )
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def compute_access_intervals(
+    ctx: Context,
+    object1: str,
+    object2: str,
+    start_time: str | None = None,
+    stop_time: str | None = None,
+    timeout_sec: float | None = None,
+    allow_partial: bool = False,
+) -> dict | str:
+    """
+    Compute access intervals between two objects over the scenario or a window.
+
+    Access already computed for the pair is reused: only the parts of the
+    window not computed before (e.g. after `extend_scenario`) go to STK.
+
+    Args:
+        ctx: MCP request context (provides STK lifespan state).
+        object1: Path like "Satellite/SatA" (with or without leading "*/").
+        object2: Path like "Facility/FacB".
+        start_time: Window start (UTCG); defaults to the scenario start.
+        stop_time: Window stop (UTCG); defaults to the scenario stop.
+        timeout_sec: Stop after this many seconds (defaults to STK_MCP_OPERATION_TIMEOUT_SEC).
+        allow_partial: On timeout/cancellation return the intervals found so far
+            (`truncated` true) instead of an error.
+
+    Returns:
+        JSON {from, to, intervals: [{start, stop}], computed_sec, truncated,
+        computed_until?}, or an error string. `computed_sec` is the part of the
+        window that was passed to STK.
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+    if timeout_sec is not None and timeout_sec <= 0:
+        return "Error: timeout_sec must be positive."
+
+    client = client_key(ctx)
+    scope = engine_scope(lifespan_ctx, client)
+    try:
+        p1, p2 = normalize_path(object1), normalize_path(object2)
+        return await RESULT_CACHE.get_or_compute(
+            ("access", scope, p1, p2, start_time, stop_time),
+            object_tags(scope, p1, p2),
+            lambda: run_stk(
+                lifespan_ctx, compute_access_intervals_internal, p1, p2, allow_partial, start_time, stop_time,
+                client=client, priority=Priority.ANALYSIS, timeout_sec=timeout_sec,
+            ),
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+    except Exception as e:
+        logger.error("  Access computation failed: %s", e)
+        return f"Error computing access: {e}"
 
 
 @mcp_server.resource(
@@ -39,16 +119,390 @@ def compute_access(ctx: Context, object1: str, object2: str):
     name="STK LLA Ephemeris",
     title="Satellite LLA Ephemeris",
     description=(
-        "Return satellite LLA ephemeris over the scenario interval."
-        " Provide path like 'Satellite/SatA' (with or without leading '*/')."
+        "Return the first page of satellite LLA ephemeris over the scenario interval"
+        " (60 s step). Provide path like 'Satellite/SatA' (with or without leading '*/')."
+        " Use the 'get_lla_ephemeris' tool with 'next_cursor' for further pages."
     ),
     mime_type="application/json",
 )
 @require_stk_resource
-def get_satellite_lla(ctx: Context, satellite: str):
+@json_response
+async def get_satellite_lla(ctx: Context, satellite: str):
     lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
-    if not lifespan_ctx or not lifespan_ctx.stk_root:
+    if not lifespan_ctx or not lifespan_ctx.ready:
         raise ResourceError("STK Root unavailable.")
 
-    with STK_LOCK:
-        return get_lla_ephemeris_internal(lifespan_ctx.stk_root, satellite, 60.0)
+    client = client_key(ctx)
+    scope = engine_scope(lifespan_ctx, client)
+    try:
+        path = normalize_path(satellite)
+    except ValueError as e:
+        raise ResourceError(str(e))
+
+    step_sec = 60.0
+    orbits = orbits_for(lifespan_ctx, client)
+    if get_config().twobody_fast_path and local_satellite(orbits, path):
+        compute = lambda: asyncio.to_thread(local_lla_page, orbits, path, step_sec)  # noqa: E731
+    else:
+        compute = lambda: run_stk(  # noqa: E731
+            lifespan_ctx, get_lla_ephemeris_internal, path, step_sec,
+            client=client, priority=Priority.ANALYSIS,
+        )
+    return await RESULT_CACHE.get_or_compute(
+        ("lla", scope, path, None, None, step_sec, None, None, "records", "float64"),
+        object_tags(scope, path),
+        compute,
+    )
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def get_lla_ephemeris(
+    ctx: Context,
+    satellite: str,
+    start_time: str | None = None,
+    stop_time: str | None = None,
+    step_sec: float = 60.0,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    format: str = "records",
+    dtype: str = "float64",
+    timeout_sec: float | None = None,
+    allow_partial: bool = False,
+) -> dict | str:
+    """
+    Return one page of satellite LLA ephemeris over a time window.
+
+    Args:
+        ctx: MCP request context (provides STK lifespan state).
+        satellite: Satellite path like "Satellite/SatA".
+        start_time: Window start in STK UTCG format (defaults to scenario start).
+        stop_time: Window stop in STK UTCG format (defaults to scenario stop).
+        step_sec: Sample step in seconds.
+        cursor: `next_cursor` from the previous page; omit for the first page.
+        page_size: Maximum samples per page (defaults to STK_MCP_EPHEMERIS_PAGE_SIZE).
+        format: "records" (default), "columns" (parallel arrays, time as seconds
+            from the scenario epoch) or "binary" (base64 little-endian blobs per column).
+        dtype: Binary type of the value columns: "float64" (default) or "float32";
+            times stay float64 and index columns int32.
+        timeout_sec: Stop after this many seconds (defaults to STK_MCP_OPERATION_TIMEOUT_SEC).
+        allow_partial: On timeout/cancellation return the samples fetched so far
+            (`truncated` true, `next_cursor` at the first missing sample) instead of an error.
+
+    Satellites created by `create_satellite` / `create_constellation` are
+    computed locally from their TwoBody elements (`source` "twobody") without
+    STK time; others are read from STK's "LLA State" data provider.
+
+    Returns:
+        JSON with `records` [{time, lat_deg, lon_deg, alt_km}] (or `columns` for the
+        columnar/binary formats), the page `start`/`stop`, `next_cursor`
+        (null on the last page) and `truncated`, or an error string.
+
+    Examples:
+        >>> get_lla_ephemeris(ctx, "Satellite/ISS", step_sec=10, page_size=5000)
+        >>> get_lla_ephemeris(ctx, "Satellite/ISS", format="binary", dtype="float32")
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+
+    cfg = get_config()
+    if step_sec <= 0:
+        return "Error: step_sec must be positive."
+    if timeout_sec is not None and timeout_sec <= 0:
+        return "Error: timeout_sec must be positive."
+    if page_size is not None and not (1 <= page_size <= cfg.ephemeris_max_page_size):
+        return f"Error: page_size must be within [1, {cfg.ephemeris_max_page_size}]."
+    try:
+        validate_format(format, dtype)
+        path = normalize_path(satellite)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    client = client_key(ctx)
+    scope = engine_scope(lifespan_ctx, client)
+    args = (path, step_sec, start_time, stop_time, cursor, page_size, format, dtype)
+    orbits = orbits_for(lifespan_ctx, client)
+    if cfg.twobody_fast_path and local_satellite(orbits, path):
+        compute = lambda: asyncio.to_thread(local_lla_page, orbits, *args)  # noqa: E731
+    else:
+        compute = lambda: run_stk(  # noqa: E731
+            lifespan_ctx, get_lla_ephemeris_internal, *args, allow_partial,
+            client=client, priority=Priority.BULK, timeout_sec=timeout_sec,
+        )
+    try:
+        return await RESULT_CACHE.get_or_compute(
+            ("lla", scope, *args),
+            object_tags(scope, path),
+            compute,
+        )
+    except Exception as e:
+        logger.error("  LLA ephemeris failed for %s: %s", path, e)
+        return f"Error fetching LLA ephemeris for '{path}': {e}"
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def get_twobody_ephemeris(
+    ctx: Context,
+    satellites: list[str],
+    frame: str = "lla",
+    start_time: str | None = None,
+    stop_time: str | None = None,
+    step_sec: float = 60.0,
+    cursor: str | None = None,
+    page_size: int | None = None,
+    format: str = "columns",
+    dtype: str = "float64",
+) -> dict | str:
+    """
+    Bulk ephemeris for TwoBody satellites, computed locally without STK.
+
+    Covers satellites created by `create_satellite` / `create_constellation`
+    (their elements are recorded at creation). All satellites and time steps
+    are propagated in one vectorized pass; no STK time is used.
+
+    Args:
+        ctx: MCP request context (provides STK lifespan state).
+        satellites: Satellite paths like "Satellite/SatA", or "Satellite/*" for all recorded ones.
+        frame: "lla" (lat_deg, lon_deg, alt_km; WGS84), "eci" (J2000 x/y/z km)
+            or "ecf" (Earth-fixed x/y/z km).
+        start_time: Window start in STK UTCG format (defaults to scenario start).
+        stop_time: Window stop in STK UTCG format (defaults to scenario stop).
+        step_sec: Sample step in seconds.
+        cursor: `next_cursor` from the previous page; omit for the first page.
+        page_size: Samples per satellite per page (defaults to STK_MCP_EPHEMERIS_PAGE_SIZE;
+            reduced so a page has at most STK_MCP_EPHEMERIS_MAX_PAGE_SIZE rows).
+        format: "columns" (default), "binary" or "records".
+        dtype: Binary type of the value columns: "float64" (default) or "float32";
+            times stay float64 and index columns int32.
+
+    Returns:
+        JSON with `satellites`, satellite-major `columns` {sat, time, ...} (`sat`
+        indexes `satellites`, `time` is seconds from `epoch`), `missing` (paths
+        without recorded TwoBody elements; use `get_lla_ephemeris` for those),
+        the page `start`/`stop` and `next_cursor`, or an error string.
+
+    Examples:
+        >>> get_twobody_ephemeris(ctx, ["Satellite/*"], frame="eci", step_sec=30, format="binary")
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+
+    if not satellites:
+        return "Error: satellites must be a non-empty list."
+    if frame not in FRAMES:
+        return f"Error: frame must be one of: {', '.join(FRAMES)}."
+    try:
+        validate_format(format, dtype)
+        paths = [normalize_path(s) for s in satellites]
+    except ValueError as e:
+        return f"Error: {e}"
+
+    orbits = orbits_for(lifespan_ctx, client_key(ctx))
+    if orbits.get("start") is None:
+        return "Error: No TwoBody satellites recorded for the active scenario."
+    names: list[str] = []
+    missing: list[str] = []
+    for p in paths:
+        if p == "*/Satellite/*":
+            names.extend(orbits["satellites"])
+        elif name := local_satellite(orbits, p):
+            names.append(name)
+        else:
+            missing.append(p)
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {"satellites": [], "missing": missing}
+    try:
+        page = await asyncio.to_thread(
+            bulk_ephemeris, orbits, names, frame, step_sec, start_time, stop_time, cursor, page_size, format, dtype,
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+    page["missing"] = missing
+    return page
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def verify_twobody_ephemeris(
+    ctx: Context,
+    satellite: str,
+    samples: int = 24,
+) -> dict | str:
+    """
+    Check the local TwoBody ephemeris of a satellite against STK's data providers.
+
+    Samples the scenario interval in STK ("LLA State" and "Cartesian Position"
+    J2000/Fixed) and compares with the local computation used by
+    `get_lla_ephemeris` / `get_twobody_ephemeris`.
+
+    Args:
+        ctx: MCP request context (provides STK lifespan state).
+        satellite: Satellite path like "Satellite/SatA" (created by this server).
+        samples: Number of sample times (>= 2).
+
+    Returns:
+        JSON {satellite, samples, max_eci_km, max_ecf_km, max_lat_deg, max_lon_deg,
+        max_alt_km, tolerance_km, within_tolerance}, or an error string.
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+    if not (2 <= samples <= 10000):
+        return "Error: samples must be within [2, 10000]."
+    try:
+        path = normalize_path(satellite)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    client = client_key(ctx)
+    orbits = orbits_for(lifespan_ctx, client)
+    name = local_satellite(orbits, path)
+    if name is None:
+        return f"Error: No TwoBody elements recorded for '{path}'."
+    try:
+        stk = await run_stk(
+            lifespan_ctx, stk_ephemeris_samples_internal, path, samples,
+            client=client, priority=Priority.ANALYSIS,
+        )
+        return {"satellite": path, **await asyncio.to_thread(compare_with_stk, orbits, name, stk)}
+    except Exception as e:
+        logger.error("  TwoBody verification failed for %s: %s", path, e)
+        return f"Error verifying ephemeris for '{path}': {e}"
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def compute_access_matrix(
+    ctx: Context,
+    sources: list[str],
+    targets: list[str],
+    timeout_sec: float | None = None,
+    allow_partial: bool = False,
+    prefilter: bool | None = None,
+    min_elevation_deg: float | None = None,
+) -> dict | str:
+    """
+    Compute access for every source x target pair in one call.
+
+    Pairs are first screened for line of sight on a coarse grid with NumPy;
+    STK computes exact intervals only for the pairs and windows that pass.
+
+    Args:
+        ctx: MCP request context (provides STK lifespan state).
+        sources: Object paths like "Satellite/SatA", or class wildcards like "Satellite/*".
+        targets: Object paths like "Facility/FacB", or class wildcards like "Facility/*".
+        timeout_sec: Stop after this many seconds (defaults to STK_MCP_OPERATION_TIMEOUT_SEC).
+        allow_partial: On timeout/cancellation return the pairs computed so far
+            (`truncated` true) instead of an error.
+        prefilter: Screen pairs before calling STK (defaults to STK_MCP_ACCESS_PREFILTER).
+        min_elevation_deg: Elevation mask applied at ground sites while screening
+            (defaults to STK_MCP_ACCESS_PREFILTER_MIN_ELEVATION_DEG); set it no
+            higher than the sites' own elevation constraint.
+
+    Returns:
+        Columnar JSON: `sources`, `targets`, `pairs` {source, target} index lists,
+        `intervals` {pair, start, stop} with times in seconds from the scenario
+        `epoch`, per-pair `summary` {count, total_sec, min_sec, max_sec}, and
+        per-pair `errors`, plus `pairs_total`, `truncated` and `computed_until`.
+        `prefilter` reports `pairs_pruned`, `pairs_unscreened`, `window_fraction`
+        (share of pair-time sent to STK), `screen_sec`, `stk_sec` and
+        `estimated_saved_sec`. Returns an error string on invalid input.
+
+    Examples:
+        >>> compute_access_matrix(ctx, sources=["Satellite/*"], targets=["Facility/Boulder", "Facility/Perth"])
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+
+    if not sources or not targets:
+        return "Error: sources and targets must be non-empty lists."
+    if timeout_sec is not None and timeout_sec <= 0:
+        return "Error: timeout_sec must be positive."
+    if min_elevation_deg is not None and not (-90.0 <= min_elevation_deg <= 90.0):
+        return "Error: min_elevation_deg must be between -90 and 90."
+
+    try:
+        return await run_stk(
+            lifespan_ctx, compute_access_matrix_internal, sources, targets, allow_partial,
+            prefilter, min_elevation_deg,
+            client=client_key(ctx), priority=Priority.BULK, timeout_sec=timeout_sec,
+        )
+    except Exception as e:
+        logger.error("  Access matrix failed: %s", e)
+        return f"Error computing access matrix: {e}"
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def get_data_provider_report(
+    ctx: Context,
+    objects: list[str],
+    provider: str,
+    elements: list[str],
+    step_sec: float = 60.0,
+    start_time: str | None = None,
+    stop_time: str | None = None,
+    kind: str = "time",
+    format: str = "columns",
+    dtype: str = "float64",
+    timeout_sec: float | None = None,
+    allow_partial: bool = False,
+) -> dict | str:
+    """
+    Run any STK data provider for many objects in one call and return columns.
+
+    The provider handle of each object is resolved once per engine and
+    reused; each object's elements come from one grouped `ExecElements` call
+    per sub-window.
+
+    Args:
+        ctx: MCP request context (provides STK lifespan state).
+        objects: Object paths like "Satellite/SatA", or class wildcards like "Satellite/*".
+        provider: Data provider path: "<provider>/<group>" (e.g. "LLA State/Fixed",
+            "Cartesian Position/J2000", "Lighting Times/Sunlight") or "<provider>"
+            for providers without groups (e.g. "Beta Angle").
+        elements: Element names as STK lists them, e.g. ["Time", "Lat", "Lon", "Alt"].
+        step_sec: Sample step in seconds (time-varying providers).
+        start_time: Window start in STK UTCG format (defaults to scenario start).
+        stop_time: Window stop in STK UTCG format (defaults to scenario stop).
+        kind: "time" (time-varying, default), "interval" (interval lists such as
+            lighting times) or "fixed" (no time argument).
+        format: "columns" (default) or "binary" (base64 little-endian blobs per column).
+        dtype: Binary type of the value columns: "float64" (default) or "float32";
+            times stay float64 and index columns int32.
+        timeout_sec: Stop after this many seconds (defaults to STK_MCP_OPERATION_TIMEOUT_SEC).
+        allow_partial: On timeout/cancellation return the objects finished so far
+            (`truncated` true) instead of an error.
+
+    Returns:
+        Columnar JSON: `objects`, object-major `columns` {obj, <element>...} (`obj`
+        indexes `objects`; times are seconds from `epoch`), `text_columns` for
+        non-numeric elements, per-object `errors`, the window `start`/`stop` and
+        `truncated`, or an error string.
+
+    Examples:
+        >>> get_data_provider_report(ctx, ["Satellite/*"], "Cartesian Position/J2000", ["Time", "x", "y", "z"], step_sec=30)
+        >>> get_data_provider_report(ctx, ["Satellite/ISS"], "Lighting Times/Sunlight", ["Start Time", "Stop Time"], kind="interval")
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+
+    if not objects:
+        return "Error: objects must be a non-empty list."
+    if not elements:
+        return "Error: elements must be a non-empty list."
+    if timeout_sec is not None and timeout_sec <= 0:
+        return "Error: timeout_sec must be positive."
+
+    try:
+        return await run_stk(
+            lifespan_ctx, data_provider_report_internal, objects, provider, elements, step_sec,
+            start_time, stop_time, kind, format, dtype, allow_partial,
+            client=client_key(ctx), priority=Priority.BULK, timeout_sec=timeout_sec,
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+    except Exception as e:
+        logger.error("  Data provider report failed: %s", e)
+        return f"Error running data provider report: {e}"
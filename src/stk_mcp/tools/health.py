@@ -1,52 +1,94 @@
 import logging
-from collections import Counter
 from mcp.server.fastmcp import Context
 from mcp.server.fastmcp.exceptions import ResourceError
 
 from ..app import mcp_server
-from ..stk_logic.core import StkState, STK_LOCK
-from ..stk_logic.decorators import require_stk_resource
-from ..stk_logic.objects import list_objects_internal
+from ..stk_logic.core import StkState
+from ..stk_logic.cache import RESULT_CACHE
+from ..stk_logic.registry import REGISTRY
+from ..stk_logic.resilience import RETRY_STATS
 
 logger = logging.getLogger(__name__)
 
 
+def _max_or_none(values):
+    present = [v for v in values if v is not None]
+    return max(present) if present else None
+
+
+def _common_or_list(values):
+    """The value shared by every worker, else the per-worker list (by worker index)."""
+    values = list(values)
+    return values[0] if all(v == values[0] for v in values) else values
+
+
 @mcp_server.resource(
     "resource://stk/health",
     name="STK Health",
     title="STK Server Health",
     description=(
-        "Report basic STK state: mode, current scenario, and object counts."
+        "Report STK state without waiting on STK work: mode, engine liveness,"
+        " queue depth, lock hold time, age of the current operation, cached"
+        " scenario/object counts, retry and circuit-breaker counters, and"
+        " result cache statistics."
     ),
     mime_type="application/json",
 )
-@require_stk_resource
-def health(ctx: Context):
+async def health(ctx: Context):
+    """
+    MCP Resource: constant-time health probe.
+
+    Reads only in-process bookkeeping (executor/pool stats and the object
+    registry); it never takes the STK lock or queues behind STK work.
+    """
     lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
 
     if not lifespan_ctx:
         raise ResourceError("No lifespan context set.")
 
     mode = lifespan_ctx.mode.value if lifespan_ctx.mode else None
-    scenario_name = None
-    try:
-        if lifespan_ctx.stk_root and lifespan_ctx.stk_root.CurrentScenario:
-            scenario_name = lifespan_ctx.stk_root.CurrentScenario.InstanceName
-    except Exception:
-        scenario_name = None
-
-    objects = []
-    try:
-        if lifespan_ctx.stk_root:
-            with STK_LOCK:
-                objects = list_objects_internal(lifespan_ctx.stk_root)
-    except Exception:
-        objects = []
-
-    counts = Counter([o.get("type", "") for o in objects if o.get("type")])
+
+    if lifespan_ctx.pool is not None:
+        workers = lifespan_ctx.pool.stats()
+        counts: dict[str, int] = {}
+        for w in workers:
+            for typ, n in w["counts"].items():
+                counts[typ] = counts.get(typ, 0) + n
+        return {
+            "mode": mode,
+            "alive": all(w["alive"] for w in workers),
+            "scenario": _common_or_list(w["scenario"] for w in workers),
+            "counts": counts,
+            "queue_depth": sum(w["queue_depth"] for w in workers),
+            "lock_held_sec": _max_or_none(w["lock_held_sec"] for w in workers),
+            "current_operation_age_sec": _max_or_none(w["current_operation_age_sec"] for w in workers),
+            "breaker_open": [w["index"] for w in workers if w["breaker"]["state"] != "closed"],
+            "starting": lifespan_ctx.starting,
+            "warmup": lifespan_ctx.warmup,
+            "supervisor": lifespan_ctx.pool.supervisor_stats(),
+            "workers": workers,
+            "cache": RESULT_CACHE.stats(),
+        }
+
+    if lifespan_ctx.executor is not None:
+        engine = lifespan_ctx.executor.stats()
+    else:
+        engine = {
+            "alive": False,
+            "starting": False,
+            "queue_depth": 0,
+            "lock_held_sec": None,
+            "current_operation_age_sec": None,
+        }
+    snapshot = REGISTRY.snapshot()
 
     return {
         "mode": mode,
-        "scenario": scenario_name,
-        "counts": dict(counts),
+        **engine,
+        "starting": engine["starting"] or lifespan_ctx.starting,
+        "scenario": snapshot["scenario"],
+        "counts": snapshot["counts"],
+        "retries": RETRY_STATS.snapshot(),
+        "warmup": lifespan_ctx.warmup,
+        "cache": RESULT_CACHE.stats(),
     }
@@ -1,17 +1,29 @@
+import asyncio
+import itertools
 import logging
+import os
 from mcp.server.fastmcp import Context
 
 from ..app import mcp_server
-from ..stk_logic.core import StkState, STK_LOCK
-from ..stk_logic.decorators import require_stk_tool
-from ..stk_logic.location import create_location_internal
+from ..stk_logic.core import StkState, run_stk, engine_scope
+from ..stk_logic.cache import RESULT_CACHE
+from ..stk_logic.scheduler import Priority
+from ..stk_logic.decorators import json_response, require_stk_tool, client_key
+from ..stk_logic.config import get_config
+from ..stk_logic.location import (
+    create_location_internal,
+    create_locations_batch_internal,
+    validate_location,
+)
+from ..stk_logic.sites import iter_sites
+from ..stk_logic.utils import call_internal
 
 logger = logging.getLogger(__name__)
 
 
 @mcp_server.tool()
 @require_stk_tool
-def create_location(
+async def create_location(
     ctx: Context,
     name: str,
     latitude_deg: float,
@@ -39,31 +51,137 @@ def create_location(
     """
     lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
 
-    try:
-        scenario = lifespan_ctx.stk_root.CurrentScenario
-        if scenario is None:
-            return "Error: No active scenario found. Use 'setup_scenario' first."
-    except Exception as e:
-        return f"Error: Could not access current scenario: {e}"
-
     # Input validation
-    if not (-90.0 <= latitude_deg <= 90.0):
-        return "Error: latitude_deg must be within [-90, 90] degrees."
-    if not (-180.0 <= longitude_deg <= 180.0):
-        return "Error: longitude_deg must be within [-180, 180] degrees."
-    if altitude_km < -0.5:
-        return "Error: altitude_km must be >= -0.5 km."
-    if kind.lower() not in ("facility", "place"):
-        return "Error: kind must be 'facility' or 'place'."
+    problem = validate_location(latitude_deg, longitude_deg, altitude_km, kind)
+    if problem:
+        return f"Error: {problem}"
 
-    with STK_LOCK:
-        ok, msg, _ = create_location_internal(
-            stk_root=lifespan_ctx.stk_root,
-            scenario=scenario,
+    client = client_key(ctx)
+    try:
+        ok, msg = await run_stk(
+            lifespan_ctx,
+            call_internal,
+            create_location_internal,
+            client=client,
+            priority=Priority.INTERACTIVE,
+            needs_scenario=True,
             name=name,
             latitude_deg=latitude_deg,
             longitude_deg=longitude_deg,
             altitude_km=altitude_km,
             kind=kind,
         )
+    except Exception as e:
+        logger.error("  Error creating %s '%s': %s", kind.lower(), name, e)
+        return f"Error creating {kind.lower()} '{name}': {e}"
+    if ok:
+        class_name = "Facility" if kind.lower() == "facility" else "Place"
+        RESULT_CACHE.invalidate([(engine_scope(lifespan_ctx, client), f"*/{class_name}/{name}")])
     return msg
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def import_locations(
+    ctx: Context,
+    path: str,
+    format: str | None = None,
+    kind: str = "facility",
+    batch_size: int | None = None,
+) -> dict | str:
+    """
+    Bulk-create or update ground locations from a CSV or GeoJSON file on the server.
+
+    The file is read as a stream and every row is validated with the same rules
+    as `create_location`. Valid rows are created in batches, each batch in a
+    single STK operation. Bad rows are reported and do not stop the import.
+
+    Args:
+        ctx: MCP request context (provides STK lifespan state).
+        path: Path to a .csv or .geojson file readable by the server.
+        format: "csv" or "geojson"; inferred from the extension when omitted.
+        kind: Default kind for rows without one: "facility" (default) or "place".
+        batch_size: Rows per STK batch (defaults to STK_MCP_IMPORT_BATCH_SIZE).
+
+    Returns:
+        JSON summary {rows, created, updated, failed, errors:[{row, name?, error}]},
+        or an error string if the file cannot be read.
+
+    Examples:
+        >>> import_locations(ctx, path="/data/ground_network.csv")
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+
+    kind = kind.lower()
+    if kind not in ("facility", "place"):
+        return "Error: kind must be 'facility' or 'place'."
+    batch_size = batch_size or get_config().import_batch_size
+    if batch_size < 1:
+        return "Error: batch_size must be at least 1."
+    if not os.path.isfile(path):
+        return f"Error: file not found: {path}"
+    try:
+        rows = iter_sites(path, format, default_kind=kind)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    client = client_key(ctx)
+    scope = engine_scope(lifespan_ctx, client)
+    summary = {"rows": 0, "created": 0, "updated": 0, "failed": 0, "errors": []}
+
+    def fail(row: int, error: str, name: str | None = None) -> None:
+        summary["failed"] += 1
+        summary["errors"].append({"row": row, **({"name": name} if name else {}), "error": error})
+
+    while True:
+        # File reading happens off the event loop, one batch at a time
+        try:
+            chunk = await asyncio.to_thread(lambda: list(itertools.islice(rows, batch_size)))
+        except (OSError, ValueError) as e:
+            fail(summary["rows"] + 1, f"Could not read file: {e}")
+            break
+        if not chunk:
+            break
+        summary["rows"] += len(chunk)
+
+        batch = []
+        for row, site in chunk:
+            if isinstance(site, str):
+                fail(row, site)
+                continue
+            problem = validate_location(
+                site["latitude_deg"], site["longitude_deg"], site["altitude_km"], site["kind"]
+            )
+            if problem:
+                fail(row, problem, site["name"])
+                continue
+            batch.append({"row": row, **site})
+        if not batch:
+            continue
+
+        try:
+            results = await run_stk(
+                lifespan_ctx, create_locations_batch_internal, batch,
+                client=client, priority=Priority.BULK,
+            )
+        except Exception as e:
+            for r in batch:
+                fail(r["row"], str(e), r["name"])
+            continue
+
+        tags = []
+        for r, site in zip(results, batch):
+            if r["ok"]:
+                summary[r["action"]] += 1
+                class_name = "Facility" if site["kind"] == "facility" else "Place"
+                tags.append((scope, f"*/{class_name}/{site['name']}"))
+            else:
+                fail(r["row"], r["error"], r["name"])
+        RESULT_CACHE.invalidate(tags)
+
+    logger.info(
+        "MCP Tool: import_locations '%s': %d rows, %d created, %d updated, %d failed",
+        path, summary["rows"], summary["created"], summary["updated"], summary["failed"],
+    )
+    return summary
@@ -0,0 +1,53 @@
+import logging
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from ..app import mcp_server
+from ..stk_logic.cache import RESULT_CACHE
+from ..stk_logic.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _cache_samples():
+    stats = RESULT_CACHE.stats()
+    return [
+        ("stk_mcp_cache_entries", "gauge", "Entries in the result cache.", {}, stats["entries"]),
+        ("stk_mcp_cache_bytes", "gauge", "Approximate bytes held by the result cache.", {}, stats["bytes"]),
+        ("stk_mcp_cache_hits_total", "counter", "Result cache hits.", {}, stats["hits"]),
+        ("stk_mcp_cache_misses_total", "counter", "Result cache misses.", {}, stats["misses"]),
+        ("stk_mcp_cache_evictions_total", "counter", "Result cache LRU evictions.", {}, stats["evictions"]),
+        ("stk_mcp_cache_invalidations_total", "counter", "Result cache entries invalidated.", {}, stats["invalidations"]),
+    ]
+
+
+METRICS.add_collector(_cache_samples)
+
+
+@mcp_server.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """HTTP endpoint for Prometheus scrapers, served next to the MCP app."""
+    return PlainTextResponse(METRICS.render(), media_type=CONTENT_TYPE)
+
+
+@mcp_server.resource(
+    "resource://stk/metrics",
+    name="STK Metrics",
+    title="STK Server Metrics",
+    description=(
+        "Prometheus text-format metrics: operation latency histograms, error"
+        " counters, STK lock wait/hold times, in-flight requests, engine and"
+        " cache statistics. Also served over HTTP at /metrics."
+    ),
+    mime_type="text/plain",
+)
+async def metrics() -> str:
+    """
+    MCP Resource: the same metrics text served at `/metrics`.
+
+    Never waits on STK work.
+    """
+    return METRICS.render()
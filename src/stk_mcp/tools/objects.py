@@ -3,8 +3,9 @@ from mcp.server.fastmcp import Context
 from mcp.server.fastmcp.exceptions import ResourceError
 
 from ..app import mcp_server
-from ..stk_logic.core import StkState, STK_LOCK
-from ..stk_logic.decorators import require_stk_resource
+from ..stk_logic.core import StkState, run_stk
+from ..stk_logic.scheduler import Priority
+from ..stk_logic.decorators import json_response, require_stk_resource, client_key
 from ..stk_logic.objects import list_objects_internal
 
 logger = logging.getLogger(__name__)
@@ -21,15 +22,17 @@ logger = logging.getLogger(__name__)
     mime_type="application/json",
 )
 @require_stk_resource
-def list_objects(ctx: Context):
+@json_response
+async def list_objects(ctx: Context):
     """
     MCP Resource: List all scenario objects as JSON records.
     """
     lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
 
     try:
-        with STK_LOCK:
-            return list_objects_internal(lifespan_ctx.stk_root)
+        return await run_stk(
+            lifespan_ctx, list_objects_internal, client=client_key(ctx), priority=Priority.INTERACTIVE
+        )
     except Exception as e:
         raise ResourceError(str(e))
 
@@ -45,15 +48,18 @@ def list_objects(ctx: Context):
     mime_type="application/json",
 )
 @require_stk_resource
-def list_objects_by_type(ctx: Context, object_type: str):
+@json_response
+async def list_objects_by_type(ctx: Context, object_type: str):
     """
     MCP Resource: List scenario objects filtered by the provided type.
     """
     lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
 
     try:
-        with STK_LOCK:
-            objects = list_objects_internal(lifespan_ctx.stk_root, filter_type=object_type)
+        objects = await run_stk(
+            lifespan_ctx, list_objects_internal,
+            client=client_key(ctx), priority=Priority.INTERACTIVE, filter_type=object_type,
+        )
         # If the filter was unrecognized, return empty with a hint instead of throwing
         if not objects:
             # We still return JSON for consistency
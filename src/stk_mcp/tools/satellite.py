@@ -3,15 +3,24 @@ from mcp.server.fastmcp import Context
 
 # Use relative imports within the package
 from ..app import mcp_server  # Import the server instance
-from ..stk_logic.core import StkState, STK_LOCK
-from ..stk_logic.decorators import require_stk_tool
+from ..stk_logic.core import StkState, run_stk, engine_scope
+from ..stk_logic.cache import RESULT_CACHE
+from ..stk_logic.scheduler import Priority
+from ..stk_logic.decorators import json_response, require_stk_tool, client_key
+from ..stk_logic.config import get_config
+from ..stk_logic.constellation import (
+    create_constellation_internal,
+    elements_from_table,
+    walker_elements,
+)
 from ..stk_logic.satellite import create_satellite_internal
+from ..stk_logic.utils import call_internal
 
 logger = logging.getLogger(__name__)
 
 @mcp_server.tool() # Decorate with the server instance
 @require_stk_tool
-def create_satellite(
+async def create_satellite(
     ctx: Context,
     name: str,
     apogee_alt_km: float,
@@ -41,15 +50,6 @@ def create_satellite(
     logger.info("MCP Tool: create_satellite '%s'", name)
     lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
 
-    # Get the current scenario from the STK root object
-    try:
-         scenario = lifespan_ctx.stk_root.CurrentScenario
-         if scenario is None:
-             return "Error: No active scenario found in STK. Use 'setup_scenario' tool first."
-         logger.info("  Operating within scenario: %s", scenario.InstanceName)
-    except Exception as e:
-         return f"Error accessing current scenario: {e}. Use 'setup_scenario' tool first."
-
     # Input validation
     if apogee_alt_km < perigee_alt_km:
         return "Error: apogee_alt_km cannot be less than perigee_alt_km."
@@ -62,17 +62,23 @@ def create_satellite(
         return "Error: perigee/apogee altitudes must be >= -0.5 km."
 
     # Call the internal logic function
+    client = client_key(ctx)
     try:
-        with STK_LOCK:
-            success, message, _ = create_satellite_internal(
-                stk_root=lifespan_ctx.stk_root,
-                scenario=scenario,
-                name=name,
-                apogee_alt_km=apogee_alt_km,
-                perigee_alt_km=perigee_alt_km,
-                raan_deg=raan_deg,
-                inclination_deg=inclination_deg,
-            )
+        success, message = await run_stk(
+            lifespan_ctx,
+            call_internal,
+            create_satellite_internal,
+            client=client,
+            priority=Priority.INTERACTIVE,
+            needs_scenario=True,
+            name=name,
+            apogee_alt_km=apogee_alt_km,
+            perigee_alt_km=perigee_alt_km,
+            raan_deg=raan_deg,
+            inclination_deg=inclination_deg,
+        )
+        # Orbit may have changed: drop cached access/ephemeris involving it
+        RESULT_CACHE.invalidate([(engine_scope(lifespan_ctx, client), f"*/Satellite/{name}")])
         return message # Return the message from the internal function
 
     except ValueError as ve:
@@ -85,4 +91,90 @@ def create_satellite(
         logger.error("  %s", error_msg)
         # import traceback
         # traceback.print_exc()
-        return error_msg 
+        return error_msg
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def create_constellation(
+    ctx: Context,
+    name_prefix: str = "Walker",
+    total_satellites: int | None = None,
+    planes: int | None = None,
+    phasing: int = 0,
+    altitude_km: float | None = None,
+    inclination_deg: float | None = None,
+    raan_spread_deg: float = 360.0,
+    satellites: list[dict] | None = None,
+    step_sec: float = 60.0,
+) -> dict | str:
+    """
+    MCP Tool: Create a whole constellation of TwoBody satellites in one batched operation.
+
+    Give either Walker parameters (total_satellites T, planes P, phasing F,
+    altitude_km, inclination_deg) or an explicit `satellites` element table.
+    Works on Desktop and Engine (Windows and Linux); existing satellites with
+    the same names are reconfigured.
+
+    Args:
+        ctx: The MCP context.
+        name_prefix: Prefix for generated names (Walker: "{prefix}_P{plane}_S{slot}").
+        total_satellites: Walker T.
+        planes: Walker P (must divide T).
+        phasing: Walker F in [0, P-1].
+        altitude_km: Circular orbit altitude (km) for Walker.
+        inclination_deg: Inclination (degrees) for Walker.
+        raan_spread_deg: RAAN spread of the planes: 360 (delta) or 180 (star).
+        satellites: Element rows {name?, semi_major_axis_km | altitude_km, eccentricity?,
+            inclination_deg, raan_deg?, argp_deg?, true_anom_deg?} (J2000, km/deg).
+        step_sec: Ephemeris step size (s).
+
+    Returns:
+        Summary {satellites, created, updated, failed, errors, elapsed_sec, satellites_per_sec},
+        or an error string.
+
+    Examples:
+        >>> create_constellation(ctx, "Shell1", total_satellites=24, planes=3, phasing=1,
+        ...                      altitude_km=550, inclination_deg=53)
+    """
+    logger.info("MCP Tool: create_constellation '%s'", name_prefix)
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+
+    if step_sec <= 0:
+        return "Error: step_sec must be positive."
+    try:
+        if satellites is not None:
+            elements = elements_from_table(name_prefix, satellites)
+        elif None in (total_satellites, planes, altitude_km, inclination_deg):
+            return (
+                "Error: give total_satellites, planes, altitude_km and inclination_deg "
+                "(Walker) or a satellites element table."
+            )
+        else:
+            elements = walker_elements(
+                name_prefix, total_satellites, planes, phasing,
+                altitude_km, inclination_deg, raan_spread_deg,
+            )
+    except ValueError as ve:
+        return f"Error: {ve}"
+    if not elements:
+        return "Error: no satellites to create."
+    limit = get_config().constellation_max_satellites
+    if len(elements) > limit:
+        return f"Error: {len(elements)} satellites exceeds the limit of {limit} (STK_MCP_CONSTELLATION_MAX_SATELLITES)."
+
+    client = client_key(ctx)
+    try:
+        summary = await run_stk(
+            lifespan_ctx, create_constellation_internal, elements, step_sec,
+            client=client, priority=Priority.BULK,
+        )
+    except Exception as e:
+        error_msg = f"Error creating constellation '{name_prefix}': {e}"
+        logger.error("  %s", error_msg)
+        return error_msg
+
+    scope = engine_scope(lifespan_ctx, client)
+    RESULT_CACHE.invalidate([(scope, f"*/Satellite/{el['name']}") for el in elements])
+    return summary
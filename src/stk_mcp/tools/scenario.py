@@ -1,25 +1,39 @@
+import asyncio
 import logging
 from mcp.server.fastmcp import Context
 
 # Use relative imports within the package
 from ..app import mcp_server  # Import the server instance created in server.py
-from ..stk_logic.core import StkState, STK_LOCK
-from ..stk_logic.decorators import require_stk_tool
+from ..stk_logic.core import StkState, run_stk, engine_scope
+from ..stk_logic.cache import RESULT_CACHE, SCENARIO_TAG
+from ..stk_logic.scheduler import Priority
+from ..stk_logic.decorators import json_response, require_stk_tool, client_key
 from ..stk_logic.config import get_config
-from ..stk_logic.scenario import setup_scenario_internal
+from ..stk_logic.scenario import (
+    current_scenario_name,
+    extend_scenario_internal,
+    parked_scenarios,
+    setup_scenario_internal,
+    switch_scenario_internal,
+)
+from ..stk_logic.snapshots import list_saved, load_scenario_internal, save_scenario_internal, validate_name
+from ..stk_logic.utils import call_internal
 
 logger = logging.getLogger(__name__)
 
 @mcp_server.tool() # Decorate with the server instance
 @require_stk_tool
-def setup_scenario(
+async def setup_scenario(
     ctx: Context,
     scenario_name: str | None = None,
     start_time: str | None = None, # Default UTCG start
     duration_hours: float | None = None # Default duration
 ) -> str:
     """
-    MCP Tool: Creates/Configures an STK Scenario. Closes any existing scenario first.
+    MCP Tool: Creates/Configures an STK Scenario. Any existing scenario is parked
+    (restorable with `switch_scenario`) and closed first. Parking saves it to
+    disk, which costs about as much as `save_scenario`; set
+    STK_MCP_PARKED_MAX_SAVED=0 to skip it.
 
     Args:
         ctx: The MCP context (provides access to stk_root via lifespan).
@@ -48,12 +62,232 @@ def setup_scenario(
         return "Error: duration_hours must be positive."
 
     # Call the internal logic function
-    with STK_LOCK:
-        success, message, _ = setup_scenario_internal(
-            stk_root=lifespan_ctx.stk_root,
+    client = client_key(ctx)
+    try:
+        success, message = await run_stk(
+            lifespan_ctx,
+            call_internal,
+            setup_scenario_internal,
+            client=client,
+            priority=Priority.INTERACTIVE,
             scenario_name=scenario_name,
             start_time=start_time,
             duration_hours=duration_hours,
         )
+        return message # Return the status message from the internal function
+    except Exception as e:
+        logger.error("Error setting up scenario '%s': %s", scenario_name, e)
+        return f"Error setting up scenario '{scenario_name}': {e}"
+    finally:
+        # The previous scenario is closed even if setup fails; drop all its results
+        RESULT_CACHE.invalidate([(engine_scope(lifespan_ctx, client), SCENARIO_TAG)])
 
-    return message # Return the status message from the internal function 
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def extend_scenario(
+    ctx: Context,
+    stop_time: str | None = None,
+    start_time: str | None = None,
+    extend_hours: float | None = None,
+) -> dict | str:
+    """
+    MCP Tool: Extend the active scenario's time period, keeping its objects.
+
+    TwoBody satellites created by this server are re-propagated over the new
+    period. Access already computed is kept, so later access requests only
+    compute the added time.
+
+    Args:
+        ctx: The MCP context.
+        stop_time: New scenario stop time (UTCG); must not be earlier than the current stop.
+        start_time: New scenario start time (UTCG); must not be later than the current start.
+        extend_hours: Alternatively, move the stop time this many hours later.
+
+    Returns:
+        JSON {scenario, start, stop, previous_start, previous_stop, repropagated,
+        not_repropagated, errors}, or an error string.
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+    if extend_hours is not None and stop_time is not None:
+        return "Error: Give either stop_time or extend_hours, not both."
+    if extend_hours is not None and extend_hours <= 0:
+        return "Error: extend_hours must be positive."
+    if stop_time is None and start_time is None and extend_hours is None:
+        return "Error: Give stop_time, start_time or extend_hours."
+
+    client = client_key(ctx)
+    try:
+        return await run_stk(
+            lifespan_ctx, extend_scenario_internal, start_time, stop_time, extend_hours,
+            client=client, priority=Priority.ANALYSIS,
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+    except Exception as e:
+        logger.error("Error extending scenario: %s", e)
+        return f"Error extending scenario: {e}"
+    finally:
+        # Results over the old period are stale; the engine keeps its stored accesses
+        RESULT_CACHE.invalidate([(engine_scope(lifespan_ctx, client), SCENARIO_TAG)])
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def save_scenario(
+    ctx: Context,
+    name: str | None = None,
+    template: bool = False,
+) -> dict | str:
+    """
+    MCP Tool: Save the active scenario to disk so it can be restored in one call.
+
+    Args:
+        ctx: The MCP context.
+        name: Entry name (letters, digits, '_', '-', '.'); defaults to the scenario name.
+            An existing entry of the same name is replaced.
+        template: Save as a reusable template instead of a snapshot.
+
+    Returns:
+        JSON {kind, name, scenario, file, objects, counts, saved_at, elapsed_sec},
+        or an error string.
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+    kind = "template" if template else "snapshot"
+    client = client_key(ctx)
+    try:
+        if name is None:
+            name = await run_stk(lifespan_ctx, current_scenario_name, client=client, priority=Priority.INTERACTIVE)
+            if not name:
+                return "Error: No active scenario found. Use 'setup_scenario' first."
+        validate_name(name)
+        return await run_stk(
+            lifespan_ctx, save_scenario_internal, kind, name,
+            client=client, priority=Priority.ANALYSIS,
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+    except Exception as e:
+        logger.error("Error saving scenario: %s", e)
+        return f"Error saving scenario: {e}"
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def load_scenario(
+    ctx: Context,
+    name: str,
+    template: bool = False,
+) -> dict | str:
+    """
+    MCP Tool: Replace the active scenario with a saved snapshot or template.
+
+    Restores the whole scenario (objects, orbits, time period) in one engine
+    load, instead of re-creating every object. The active scenario is parked
+    (restorable with `switch_scenario`).
+
+    Args:
+        ctx: The MCP context.
+        name: Entry name given to `save_scenario`.
+        template: Load from the templates instead of the snapshots.
+
+    Returns:
+        JSON {kind, name, scenario, objects, counts, elapsed_sec}, or an error string.
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+    kind = "template" if template else "snapshot"
+    client = client_key(ctx)
+    try:
+        validate_name(name)
+        return await run_stk(
+            lifespan_ctx, load_scenario_internal, kind, name,
+            client=client, priority=Priority.ANALYSIS,
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+    except Exception as e:
+        logger.error("Error loading %s '%s': %s", kind, name, e)
+        return f"Error loading {kind} '{name}': {e}"
+    finally:
+        # The previous scenario is closed even if loading fails
+        RESULT_CACHE.invalidate([(engine_scope(lifespan_ctx, client), SCENARIO_TAG)])
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def switch_scenario(ctx: Context, name: str) -> dict | str:
+    """
+    MCP Tool: Make a parked scenario active again, parking the active one.
+
+    `setup_scenario`, `load_scenario` and `switch_scenario` park the scenario
+    they replace instead of discarding it. Switching back costs one engine
+    load, and the TwoBody elements and computed access recorded for that
+    scenario are restored with it. Parked scenarios belong to the engine that
+    serves this client.
+
+    Args:
+        ctx: The MCP context.
+        name: Scenario name (as given to `setup_scenario`).
+
+    Returns:
+        JSON {scenario, switched, parked, objects, counts, state, elapsed_sec,
+        parked_scenarios}, or an error string.
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+    client = client_key(ctx)
+    try:
+        return await run_stk(
+            lifespan_ctx, switch_scenario_internal, name,
+            client=client, priority=Priority.INTERACTIVE,
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+    except Exception as e:
+        logger.error("Error switching to scenario '%s': %s", name, e)
+        return f"Error switching to scenario '{name}': {e}"
+    finally:
+        # Cached results belong to the scenario that was active before
+        RESULT_CACHE.invalidate([(engine_scope(lifespan_ctx, client), SCENARIO_TAG)])
+
+
+@mcp_server.tool(structured_output=False)
+@require_stk_tool
+@json_response
+async def list_parked_scenarios(ctx: Context) -> dict | str:
+    """
+    MCP Tool: List the active scenario and the scenarios parked for `switch_scenario`.
+
+    Args:
+        ctx: The MCP context.
+
+    Returns:
+        JSON {active, parked: [{name, objects, parked_at, state, state_bytes}, ...]},
+        most recently parked first; `state` is "memory" or "disk" (evicted).
+    """
+    lifespan_ctx: StkState | None = ctx.request_context.lifespan_context
+    try:
+        return await run_stk(lifespan_ctx, parked_scenarios, client=client_key(ctx), priority=Priority.INTERACTIVE)
+    except Exception as e:
+        logger.error("Error listing parked scenarios: %s", e)
+        return f"Error listing parked scenarios: {e}"
+
+
+@mcp_server.resource(
+    "resource://stk/scenarios",
+    name="Saved STK Scenarios",
+    title="List Saved Scenarios",
+    description=(
+        "List saved scenario snapshots and templates (read from disk, no STK call). "
+        "Returns JSON: [{kind, name, scenario, objects, counts, saved_at}, ...]."
+    ),
+    mime_type="application/json",
+)
+async def list_saved_scenarios(ctx: Context):
+    """
+    MCP Resource: saved snapshots and templates, newest first.
+    """
+    return await asyncio.to_thread(list_saved)
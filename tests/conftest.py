@@ -0,0 +1,76 @@
+"""
+Shared fixtures: an MCP client session against the server in simulated mode.
+
+Each test gets a fresh server lifespan with one in-process simulated engine
+(`--mode simulated`), so no STK installation or license is needed.
+"""
+
+from typing import Any
+
+import pytest
+from mcp import ClientSession
+from mcp.server.fastmcp.server import lifespan_wrapper
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from stk_mcp.app import mcp_server
+from stk_mcp.stk_logic.core import StkMode, create_stk_lifespan
+from stk_mcp.stk_logic.serialization import decode_response
+
+
+class StkClient:
+    """Calls tools and returns their decoded JSON result, or the error string."""
+
+    def __init__(self, session: ClientSession) -> None:
+        self.session = session
+
+    async def call(self, tool: str, **arguments: Any) -> Any:
+        result = await self.session.call_tool(tool, arguments)
+        assert not result.isError, result.content
+        text = result.content[0].text
+        try:
+            return decode_response(text)
+        except ValueError:
+            return text
+
+    async def read(self, uri: str) -> Any:
+        result = await self.session.read_resource(uri)
+        return decode_response(result.contents[0].text)
+
+    async def json(self, tool: str, **arguments: Any) -> Any:
+        """Like `call`, but fail the test on an error string."""
+        value = await self.call(tool, **arguments)
+        assert not isinstance(value, str), value
+        return value
+
+    async def scenario(self, name: str = "Test", duration_hours: float = 24.0) -> None:
+        message = await self.call("setup_scenario", scenario_name=name, duration_hours=duration_hours)
+        assert message.startswith("Successfully"), message
+
+    async def satellite(self, name: str, alt_km: float = 550.0, raan_deg: float = 0.0, inc_deg: float = 53.0) -> None:
+        message = await self.call(
+            "create_satellite", name=name, apogee_alt_km=alt_km, perigee_alt_km=alt_km,
+            raan_deg=raan_deg, inclination_deg=inc_deg,
+        )
+        assert message.startswith("Successfully"), message
+
+    async def facility(self, name: str, lat_deg: float, lon_deg: float) -> None:
+        message = await self.call("create_location", name=name, latitude_deg=lat_deg, longitude_deg=lon_deg)
+        assert message.startswith("Successfully"), message
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def stk(tmp_path, monkeypatch):
+    monkeypatch.setenv("STK_MCP_SCENARIO_DIR", str(tmp_path / "scenarios"))
+    server = mcp_server._mcp_server
+    previous = server.lifespan
+    server.lifespan = lifespan_wrapper(mcp_server, create_stk_lifespan(StkMode.SIMULATED, workers=1))
+    try:
+        async with create_connected_server_and_client_session(server) as session:
+            yield StkClient(session)
+    finally:
+        server.lifespan = previous
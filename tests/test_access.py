@@ -0,0 +1,99 @@
+"""Access intervals and the access matrix in simulated mode."""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+SATELLITES = [("Sat1", 0.0, 53.0), ("Sat2", 120.0, 53.0), ("Polar", 60.0, 97.6)]
+FACILITIES = [("Boulder", 40.0, -105.0), ("Perth", -31.9, 115.9), ("Quito", -0.2, -78.5)]
+
+
+async def _constellation(stk, name: str) -> None:
+    await stk.scenario(name)
+    for sat, raan, inc in SATELLITES:
+        await stk.satellite(sat, raan_deg=raan, inc_deg=inc)
+    for fac, lat, lon in FACILITIES:
+        await stk.facility(fac, lat, lon)
+
+
+async def _matrix(stk, prefilter: bool) -> dict:
+    return await stk.json(
+        "compute_access_matrix", sources=["Satellite/*"], targets=["Facility/*"],
+        prefilter=prefilter, min_elevation_deg=0.0,
+    )
+
+
+def _by_pair(matrix: dict) -> dict[tuple[str, str], list[tuple[float, float]]]:
+    pairs = {}
+    for p, start, stop in zip(matrix["intervals"]["pair"], matrix["intervals"]["start"], matrix["intervals"]["stop"]):
+        key = (matrix["sources"][matrix["pairs"]["source"][p]], matrix["targets"][matrix["pairs"]["target"][p]])
+        pairs.setdefault(key, []).append((start, stop))
+    return pairs
+
+
+async def test_access_intervals(stk):
+    await _constellation(stk, "Intervals")
+    result = await stk.json("compute_access_intervals", object1="Satellite/Sat1", object2="Facility/Boulder")
+
+    assert result["truncated"] is False
+    assert result["computed_sec"] == pytest.approx(24 * 3600.0)
+    assert len(result["intervals"]) > 0
+    assert all(set(i) == {"start", "stop"} for i in result["intervals"])
+
+    # A sub-window is served from the stored coverage without calling STK again
+    first = result["intervals"][0]
+    again = await stk.json(
+        "compute_access_intervals", object1="Satellite/Sat1", object2="Facility/Boulder",
+        start_time=first["start"], stop_time=first["stop"],
+    )
+    assert again["computed_sec"] == 0
+    assert len(again["intervals"]) == 1
+
+
+async def test_access_intervals_rejects_unknown_object(stk):
+    await _constellation(stk, "Unknown")
+    message = await stk.call("compute_access_intervals", object1="Satellite/Nope", object2="Facility/Boulder")
+    assert message.startswith("Error")
+
+
+async def test_matrix_prefilter_matches_unscreened(stk):
+    await _constellation(stk, "Unscreened")
+    exact = await _matrix(stk, prefilter=False)
+    assert exact["prefilter"] is None
+    assert exact["truncated"] is False
+
+    # A fresh scenario so the screened run computes from scratch instead of reusing stored coverage
+    await _constellation(stk, "Screened")
+    screened = await _matrix(stk, prefilter=True)
+    assert screened["prefilter"]["window_fraction"] < 1.0
+    assert screened["truncated"] is False
+
+    assert exact["pairs_total"] == screened["pairs_total"] == len(SATELLITES) * len(FACILITIES)
+    expected, actual = _by_pair(exact), _by_pair(screened)
+    assert actual.keys() == expected.keys()
+    for pair, windows in expected.items():
+        assert len(actual[pair]) == len(windows), pair
+        for (start, stop), (s_start, s_stop) in zip(windows, actual[pair]):
+            assert s_start == pytest.approx(start, abs=1.0)
+            assert s_stop == pytest.approx(stop, abs=1.0)
+
+
+async def test_masked_matrix_does_not_limit_later_exact_access(stk):
+    pair = {"object1": "Satellite/Sat1", "object2": "Facility/Boulder"}
+    await stk.scenario("Exact")
+    await stk.satellite("Sat1")
+    await stk.facility("Boulder", 40.0, -105.0)
+    exact = await stk.json("compute_access_intervals", **pair)
+
+    await stk.scenario("Masked")
+    await stk.satellite("Sat1")
+    await stk.facility("Boulder", 40.0, -105.0)
+    masked = await stk.json(
+        "compute_access_matrix", sources=["Satellite/Sat1"], targets=["Facility/Boulder"],
+        prefilter=True, min_elevation_deg=45.0,
+    )
+    assert 0 < len(masked["intervals"]["pair"]) < len(exact["intervals"])
+
+    after = await stk.json("compute_access_intervals", **pair)
+    assert after["computed_sec"] > 0
+    assert after["intervals"] == exact["intervals"]
@@ -0,0 +1,38 @@
+"""LLA ephemeris paging in simulated mode."""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _pages(stk, **arguments) -> list[dict]:
+    pages, cursor = [], None
+    while True:
+        page = await stk.json("get_lla_ephemeris", satellite="Satellite/Sat1", cursor=cursor, **arguments)
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("fast_path", ["true", "false"], ids=["twobody", "stk"])
+async def test_lla_cursor_pages_through_the_window(stk, monkeypatch, fast_path):
+    monkeypatch.setenv("STK_MCP_TWOBODY_FAST_PATH", fast_path)
+    await stk.scenario("Ephemeris", duration_hours=1.0)
+    await stk.satellite("Sat1")
+
+    whole = await stk.json("get_lla_ephemeris", satellite="Satellite/Sat1", page_size=1000)
+    assert whole["next_cursor"] is None
+    assert len(whole["records"]) == 61
+
+    pages = await _pages(stk, page_size=25)
+    assert [len(p["records"]) for p in pages] == [25, 25, 11]
+    assert not any(p["truncated"] for p in pages)
+    assert [r for p in pages for r in p["records"]] == whole["records"]
+
+
+async def test_lla_rejects_invalid_cursor(stk):
+    await stk.scenario("Cursor", duration_hours=1.0)
+    await stk.satellite("Sat1")
+    message = await stk.call("get_lla_ephemeris", satellite="Satellite/Sat1", cursor="page-2")
+    assert message.startswith("Error")
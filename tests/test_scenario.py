@@ -0,0 +1,52 @@
+"""Scenario setup, object creation, extension, and parking in simulated mode."""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+PAIR = {"object1": "Satellite/Sat1", "object2": "Facility/F1"}
+
+
+async def test_setup_and_create_objects(stk):
+    await stk.scenario("Setup")
+    await stk.satellite("Sat1")
+    await stk.facility("F1", 40.0, -105.0)
+
+    assert await stk.read("resource://stk/objects/satellite") == [{"name": "Sat1", "type": "Satellite"}]
+    assert await stk.read("resource://stk/objects/facility") == [{"name": "F1", "type": "Facility"}]
+
+
+async def test_extend_computes_only_the_added_time(stk):
+    await stk.scenario("Extend", duration_hours=12.0)
+    await stk.satellite("Sat1")
+    await stk.facility("F1", 40.0, -105.0)
+
+    first = await stk.json("compute_access_intervals", **PAIR)
+    assert first["computed_sec"] == pytest.approx(12 * 3600.0)
+
+    extended = await stk.json("extend_scenario", extend_hours=12.0)
+    assert extended["repropagated"] == 1
+    assert extended["errors"] == []
+
+    second = await stk.json("compute_access_intervals", **PAIR)
+    assert second["computed_sec"] == pytest.approx(12 * 3600.0)
+    assert second["intervals"][: len(first["intervals"]) - 1] == first["intervals"][:-1]
+    assert len(second["intervals"]) > len(first["intervals"])
+
+
+async def test_park_and_switch(stk):
+    await stk.scenario("Alpha")
+    await stk.satellite("SatA")
+
+    await stk.scenario("Beta")
+    await stk.facility("FB", 0.0, 0.0)
+    parked = await stk.json("list_parked_scenarios")
+    assert parked["active"] == "Beta"
+    assert [p["name"] for p in parked["parked"]] == ["Alpha"]
+
+    switched = await stk.json("switch_scenario", name="Alpha")
+    assert switched["scenario"] == "Alpha"
+    assert switched["parked"] == "Beta"
+    assert await stk.read("resource://stk/objects/satellite") == [{"name": "SatA", "type": "Satellite"}]
+    assert await stk.read("resource://stk/objects/facility") == []
+    assert [p["name"] for p in (await stk.json("list_parked_scenarios"))["parked"]] == ["Beta"]